@@ -1,8 +1,13 @@
 import dash
-from dash import html, dcc
+from dash import html, dcc, clientside_callback, ClientsideFunction, Input, Output, State, ALL
 
-# Inicializamos la app con soporte para múltiples páginas
-app = dash.Dash(__name__, use_pages=True)
+from modelos import sustituto
+from servidor import activos, api, exportacion, memoria, metricas, perfilado, trabajos
+
+# Inicializamos la app con soporte para múltiples páginas; si se compilaron
+# los activos (python -m servidor.activos) se sirven los minificados con huella
+app = dash.Dash(__name__, use_pages=True, assets_folder=activos.carpeta())
+server = app.server
 
 # Lista exacta del orden solicitado (nombres tal cual aparecen en register_page)
 orden_paginas = [
@@ -12,11 +17,14 @@ orden_paginas = [
     "Crecimiento poblacion logístico",
     "Crecimiento Logistico",
     "Campo Vectorial",
+    "Depredador-Presa",
+    "Explorador 3D",
     "Modelo SIR",
     "Proyecto Modelo SIR",
     "Modelo SIR Rumor",
     "Ciclo de Vida Moda Crocs",
-    "Comparacion Escenarios"
+    "Comparacion Escenarios",
+    "Ajuste de Parámetros"
 ]
 
 # --- ESTILOS CSS MEJORADOS (DISEÑO CON COLOR) ---
@@ -71,6 +79,9 @@ rutas_por_nombre = {
 # --- LAYOUT PRINCIPAL ---
 app.layout = html.Div([
 
+    # Ruta actual: marca el enlace activo del menú una vez por navegación
+    dcc.Location(id="ubicacion-menu"),
+
     # 1. Menú Lateral (Sidebar)
     html.Div([
         html.H2("Navegación", style={'textAlign': 'center', 'color': '#ffffff', 'marginBottom': '30px', 'borderBottom': '1px solid rgba(255,255,255,0.2)', 'paddingBottom': '15px'}),
@@ -79,7 +90,9 @@ app.layout = html.Div([
             # Generación de enlaces con el nuevo estilo
             dcc.Link(
                 nombre,
+                id={"type": "enlace-menu", "index": nombre},
                 href=rutas_por_nombre[nombre],
+                className="enlace-menu",
                 style=ESTILO_LINK
             )
             for nombre in orden_paginas
@@ -98,5 +111,30 @@ app.layout = html.Div([
 
 ])
 
+# --- ENLACE ACTIVO DEL MENÚ (assets/js/scripts.js) ---
+clientside_callback(
+    ClientsideFunction(namespace='menu', function_name='marcar_activo'),
+    Output({"type": "enlace-menu", "index": ALL}, "className"),
+    Input("ubicacion-menu", "pathname"),
+    State({"type": "enlace-menu", "index": ALL}, "href")
+)
+
+# --- INSTRUMENTACIÓN (métricas en /metrics y encabezado Server-Timing) ---
+metricas.instrumentar(app)
+# --- PERFILADO BAJO DEMANDA (solo con PERFILAR_CALLBACKS=1) ---
+perfilado.instalar(app)
+# --- MEMORIA POR CALLBACK (RSS siempre; picos con MEMORIA_CALLBACKS=1) ---
+memoria.instalar(app)
+# --- CACHE INMUTABLE DE LOS ACTIVOS COMPILADOS CON HUELLA ---
+activos.instalar(app)
+# --- DESCARGAS CSV/PARQUET EN STREAMING (/exportar/<nombre>.<formato>) ---
+exportacion.instalar(app)
+# --- API POR LOTES SIN INTERFAZ (/api/sir, /api/rumor, /api/logistic, /api/field) ---
+api.instalar(app)
+# --- TRABAJOS LARGOS EN SEGUNDO PLANO (/trabajos/...) ---
+trabajos.instalar(app)
+# --- TABLA SUSTITUTA DEL SIR (se construye en segundo plano si falta) ---
+sustituto.cargar()
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,36 @@
+// Modo en vivo: limita los envíos de los deslizadores a uno cada INTERVALO_MS.
+// Un valor que llega antes de tiempo se guarda y se envía al cumplirse el
+// intervalo (siempre se envía la última posición). Cada envío lleva un id de
+// cliente (pestaña) y una secuencia creciente para que el servidor descarte
+// lo superado (servidor/en_vivo.py).
+(() => {
+    const INTERVALO_MS = 150;
+    const estados = {};
+    const cliente = Math.random().toString(36).slice(2) + Date.now().toString(36);
+
+    const limitar = (...valores) => {
+        const destino = window.dash_clientside.callback_context.outputs_list.id;
+        const estado = estados[destino] || (estados[destino] = { ultimo: 0, pendiente: null, secuencia: 0 });
+
+        const datos = () => {
+            estado.ultimo = Date.now();
+            estado.pendiente = null;
+            estado.secuencia += 1;
+            return { cliente: cliente, secuencia: estado.secuencia, valores: valores };
+        };
+
+        clearTimeout(estado.pendiente);
+        const espera = INTERVALO_MS - (Date.now() - estado.ultimo);
+        if (espera <= 0) {
+            return datos();
+        }
+        estado.pendiente = setTimeout(() => {
+            window.dash_clientside.set_props(destino, { data: datos() });
+        }, espera);
+        return window.dash_clientside.no_update;
+    };
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        en_vivo: { limitar: limitar }
+    });
+})();
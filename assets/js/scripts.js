@@ -1,49 +1,19 @@
-document.addEventListener('DOMContentLoaded', () => {
-
-    const updateActiveState = () => {
-        const currentPath = decodeURIComponent(window.location.pathname);
-
-        const links = document.querySelectorAll('.nav-link, .dropdown-item');
-        const triggers = document.querySelectorAll('.dropdown-trigger');
-        const dropdowns = document.querySelectorAll('.dropdown');
-
-        links.forEach(el => el.classList.remove('active'));
-        triggers.forEach(el => el.classList.remove('active'));
-        dropdowns.forEach(el => el.classList.remove('dropdown-open'));
-
-        links.forEach(link => {
-            if (link.tagName === 'A' && link.getAttribute('href')) {
-                const linkHref = link.getAttribute('href');
-
-                if (linkHref === currentPath) {
-                    link.classList.add('active');
-
-                    const parentDropdown = link.closest('.dropdown');
-                    if (parentDropdown) {
-                        const parentTrigger = parentDropdown.querySelector('.dropdown-trigger');
-                        if (parentTrigger) parentTrigger.classList.add('active');
-
-                        parentDropdown.classList.add('dropdown-open');
-                    }
-                }
-            }
+// Enlace activo del menú lateral. Lo llama un callback de cliente de app.py
+// cuando cambia la ruta (dcc.Location), una sola vez por navegación: recibe
+// la ruta y los href de los enlaces y devuelve la clase de cada uno.
+// Las rutas que empiezan con /proyecto marcan también el enlace del proyecto.
+(() => {
+    const marcarActivo = (ruta, enlaces) => {
+        const actual = decodeURIComponent(ruta || '');
+        const proyecto = actual.toLowerCase().startsWith('/proyecto');
+
+        return enlaces.map(href => {
+            const activo = href === actual || (proyecto && href.toLowerCase().startsWith('/proyecto'));
+            return activo ? 'enlace-menu active' : 'enlace-menu';
         });
-
-        if (currentPath.toLowerCase().startsWith('/proyecto')) {
-            dropdowns.forEach(dropdown => dropdown.classList.add('dropdown-open'));
-            triggers.forEach(trigger => {
-                if (trigger.textContent.includes('Proyecto')) {
-                    trigger.classList.add('active');
-                }
-            });
-        }
     };
 
-    updateActiveState();
-
-    const observer = new MutationObserver(() => {
-        updateActiveState();
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        menu: { marcar_activo: marcarActivo }
     });
-
-    observer.observe(document.body, { childList: true, subtree: true });
-});
+})();
@@ -0,0 +1,286 @@
+# ==========================================
+# MICROBENCHMARKS DE SOLVERS Y FIGURAS
+# ==========================================
+# Mide cada solver y cada constructor de figuras del portafolio en tres
+# tamaños de parámetros (pequeño, defecto y grande) y compara contra una
+# línea base guardada en JSON.
+#
+# Uso (desde la raíz del repositorio):
+#   python -m benchmarks.bench_modelos --guardar      # crea/actualiza la línea base
+#   python -m benchmarks.bench_modelos                # compara contra la línea base
+#   python -m benchmarks.bench_modelos --umbral 1.5 --filtro rumor
+#
+# El proceso termina con código 1 si algún caso es más lento que
+# (línea base * umbral), para poder usarlo como compuerta antes de desplegar,
+# y también si no hay línea base (la compuerta no pasa sin comparar nada).
+# La línea base de referencia está versionada en benchmarks/linea_base.json.
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from modelos import SIR, ajuste, horizonte, incertidumbre, logistico, redes, sensibilidad
+
+RUTA_LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linea_base.json')
+UMBRAL_POR_DEFECTO = float(os.environ.get('BENCH_UMBRAL', '1.25'))
+REPETICIONES = 5
+# Casos renombrados (nombre actual -> nombre en líneas base anteriores), para
+# seguir comparando contra archivos guardados antes del cambio
+NOMBRES_ANTERIORES = {
+    'SIR.resolver': 'Asignacion.modelo_sir',
+    'clase7.resolver_sir': 'clase7.modelo_sir',
+}
+
+
+# ==========================================
+# 1. CARGA DE LAS PÁGINAS
+# ==========================================
+def cargar_paginas():
+    # Las páginas llaman a dash.register_page() al importarse, así que
+    # primero hay que instanciar la app (que además importa todas las páginas)
+    import app  # noqa: F401
+    return {nombre.split('.', 1)[1]: modulo for nombre, modulo in sys.modules.items()
+            if nombre.startswith('pages.')}
+
+
+# ==========================================
+# 2. DEFINICIÓN DE CASOS
+# ==========================================
+# Cada tamaño define los parámetros con los que se llama a cada función:
+# 'defecto' replica los valores iniciales de las páginas.
+#   nodos:     nodos de la red de contactos
+#   muestras:  muestras de la proyección por hipercubo latino
+#   n_sobol:   filas base del diseño de Saltelli
+#   curvas:    curvas de la familia logística
+TAMANOS = {
+    'pequeno': dict(puntos=50, dias=30, N=100, n_campo=5, nodos=500, muestras=200, n_sobol=64, curvas=20),
+    'defecto': dict(puntos=200, dias=100, N=1000, n_campo=20, nodos=5000, muestras=2000, n_sobol=256, curvas=200),
+    'grande': dict(puntos=5000, dias=1000, N=100000, n_campo=50, nodos=20000, muestras=5000, n_sobol=1024,
+                   curvas=2000),
+}
+
+
+def construir_casos(paginas):
+    clase7 = paginas['clase7']
+    moda = paginas['Modelo propuesto']
+    rumor = paginas['modelo_sir_rumor']
+    escenarios = paginas['comparacion_escenariospy']
+    poblacion = paginas['Crecimiento_poblacion']
+    campo = paginas['campo_vectorial']
+
+    casos = []
+    for tamano, p in TAMANOS.items():
+        puntos, dias, N, n_campo = p['puntos'], p['dias'], p['N'], p['n_campo']
+        t = np.linspace(0, dias, puntos)
+        y0_sir, parametros_sir = [N - 1.0, 1.0, 0.0], dict(b=2.5 / N, k=0.4)
+
+        # --- Solvers ---
+        casos.append(('SIR.resolver', tamano, lambda t=t, N=N:
+                      SIR.resolver([N - 1.0, 1.0, 0.0], t, b=2.5 / N, k=0.4)))
+        # Cache de horizonte: respuesta desde la malla interna guardada
+        # (comparar con SIR.resolver) y el caso de las páginas al subir "Días
+        # a simular" de dias a 2*dias con np.linspace (las dos solicitudes,
+        # con la trayectoria guardada y vaciándola entre una y otra)
+        horizonte.resolver_incremental(SIR, y0_sir, t, **parametros_sir)
+        casos.append(('horizonte.resolver_incremental(acierto)', tamano, lambda t=t, y0=y0_sir, p=parametros_sir:
+                      horizonte.resolver_incremental(SIR, y0, t, **p)))
+        mallas = (t, np.linspace(0, 2 * dias, puntos))
+        casos.append(('horizonte.resolver_normalizado(dias_x2)', tamano, lambda m=mallas, y0=y0_sir, p=parametros_sir:
+                      _subir_dias(m, y0, p, vaciar=False)))
+        casos.append(('horizonte.resolver_normalizado(dias_x2_sin_cache)', tamano, lambda m=mallas, y0=y0_sir, p=parametros_sir:
+                      _subir_dias(m, y0, p, vaciar=True)))
+        # Forma adimensional: el mismo escenario a otra escala (2N, 2 I0) es
+        # un acierto de la trayectoria ya guardada
+        horizonte.resolver_normalizado(SIR, y0_sir, t, **parametros_sir)
+        casos.append(('horizonte.resolver_normalizado(otra_escala)', tamano, lambda t=t, N=N:
+                      horizonte.resolver_normalizado(SIR, [2 * N - 2.0, 2.0, 0.0], t, b=1.25 / N, k=0.4)))
+        # Los solvers de las páginas pasan por el cache de horizonte: se vacía
+        # en cada llamada para medir la integración y no un acierto
+        casos.append(('clase7.resolver_sir', tamano, _sin_cache(lambda t=t, N=N:
+                      clase7.resolver_sir(N, 0.3, 0.1, [N - 1.0, 1.0, 0.0], t))))
+        casos.append(('calcular_moda_sir', tamano, _sin_cache(lambda N=N, dias=dias, puntos=puntos:
+                      moda.calcular_moda_sir(N, 0.5 / N, 0.1, 5, dias, puntos))))
+        casos.append(('modelo_sir_rumor.resolver_sir_rumor', tamano, _sin_cache(lambda N=N, dias=dias, puntos=puntos:
+                      rumor.resolver_sir_rumor(N, 1.1 / N, 0.01, N - 9, 1, 8, dias, puntos))))
+        casos.append(('comparacion_escenariospy.resolver_sir_rumor', tamano, lambda N=N, dias=dias, puntos=puntos:
+                      escenarios.resolver_sir_rumor(N, 1.0 / N, 0.2, N - 10, 10, 0, dias, puntos)))
+        casos.append(('simular_rumor_estocastico', tamano, lambda N=N, dias=dias:
+                      rumor.simular_rumor_estocastico(N, 1.1 / N, 0.01, N - 9, 1, 8, dias, 200)))
+        casos.append(('sensibilidad_moda', tamano, lambda N=N, dias=dias:
+                      moda.sensibilidad_moda(N, 0.5 / N, 0.1, 5, dias, 20, 256)))
+        casos.append(('calcular_crecimiento_logistico', tamano, lambda dias=dias, puntos=puntos:
+                      poblacion.calcular_crecimiento_logistico(20, 0.1, 1000, dias, puntos)))
+        casos.append(('evaluar_campo', tamano, lambda n=n_campo:
+                      campo.evaluar_campo("y", "-x - 0.1*y", 5, 5, n)))
+
+        # --- Motor: redes, ajuste, incertidumbre, Sobol, familia logística ---
+        nodos = p['nodos']
+        casos.append(('redes.red_configuracion', tamano, lambda nodos=nodos:
+                      redes.red_configuracion(nodos, 20, semilla=0)))
+        red = redes.red_configuracion(nodos, 20, semilla=0)
+        tau = redes.tasa_por_contacto(0.5, red)
+        t_red = np.linspace(0, 40, 161)
+        casos.append(('redes.sir_campo_medio', tamano, lambda red=red, tau=tau, t=t_red:
+                      redes.sir_campo_medio(red, tau, 1 / 3, redes.elegir_infectados(red, 5, 0), t)))
+        casos.append(('redes.sir_estocastico', tamano, lambda red=red, tau=tau, t=t_red:
+                      redes.sir_estocastico(red, tau, 1 / 3, 5, t, realizaciones=4, semilla=0)))
+
+        # Conteos de infectados con ruido multiplicativo; se ajustan b, k e I0
+        observados = {'I': SIR.resolver(y0_sir, t, **parametros_sir)[:, 1]
+                      * np.random.default_rng(0).lognormal(0, 0.05, puntos)}
+        casos.append(('ajuste.ajustar', tamano, lambda t=t, N=N, obs=observados:
+                      ajuste.ajustar(SIR, t, obs, [N - 2.0, 2.0, 0.0], {'b': 2.0 / N, 'k': 0.3}, inicial='I')))
+
+        distribuciones = {'b': ('uniforme', 2.0 / N, 3.0 / N), 'k': ('uniforme', 0.33, 0.5)}
+        casos.append(('incertidumbre.proyectar', tamano, lambda t=t, y0=y0_sir, d=distribuciones, m=p['muestras']:
+                      incertidumbre.proyectar(SIR, y0, t, d, m, semilla=0)))
+        distribuciones_sobol = dict(distribuciones, I0=('uniforme', 1.0, 5.0), N=('uniforme', 0.8 * N, 1.2 * N))
+        casos.append(('sensibilidad.sobol_sir', tamano, lambda d=distribuciones_sobol, dias=dias, n=p['n_sobol']:
+                      sensibilidad.sobol_sir(d, {}, dias, n=n, semilla=0, trabajadores=1)))
+
+        rng = np.random.default_rng(0)
+        familia = (rng.uniform(10, 50, p['curvas']), rng.uniform(0.05, 0.2, p['curvas']),
+                   rng.uniform(800, 1200, p['curvas']))
+        casos.append(('logistico.familia_logistica', tamano, lambda t=t, f=familia:
+                      logistico.familia_logistica(t, *f)))
+
+        # --- Constructores de figuras (con datos ya calculados) ---
+        t_log, P = poblacion.calcular_crecimiento_logistico(20, 0.1, 1000, dias, puntos)
+        casos.append(('crear_figura_logistica', tamano, lambda t_log=t_log, P=P, dias=dias:
+                      poblacion.crear_figura_logistica(t_log, P, 1000, dias)))
+
+        t_m, S, I, R = moda.calcular_moda_sir(N, 0.5 / N, 0.1, 5, dias, puntos)
+        casos.append(('crear_figura_moda', tamano, lambda t_m=t_m, S=S, I=I, R=R, dias=dias:
+                      moda.crear_figura_moda(t_m, S, I, R, dias)))
+
+        t_r, *res_a = rumor.resolver_sir_rumor(N, 1.1 / N, 0.01, N - 9, 1, 8, dias, puntos)
+        _, *res_b = rumor.resolver_sir_rumor(N, 1.1 / N, 0.02, N - 9, 1, 8, dias, puntos)
+        casos.append(('crear_figura_comparativa', tamano, lambda t_r=t_r, a=res_a, b=res_b:
+                      rumor.crear_figura_comparativa(t_r, a, b, 0.01, 0.02)))
+        casos.append(('crear_figura_replica', tamano, lambda t_r=t_r, a=res_a, b=res_b:
+                      escenarios.crear_figura_replica(t_r, a, b, 0.2, 1.5)))
+
+        S7, I7, R7 = clase7.resolver_sir(N, 0.3, 0.1, [N - 1.0, 1.0, 0.0], t).T
+        casos.append(('clase7.crear_figura_sir', tamano, lambda t=t, S=S7, I=I7, R=R7:
+                      clase7.crear_figura_sir(t, S, I, R, 0.3, 0.1)))
+
+        campo_eval = campo.evaluar_campo("y", "-x - 0.1*y", 5, 5, n_campo)
+        casos.append(('crear_figura_campo', tamano, lambda c=campo_eval:
+                      campo.crear_figura_campo(*c, "y", "-x - 0.1*y", 5, 5)))
+    return casos
+
+
+def _sin_cache(funcion):
+    def llamar():
+        horizonte.limpiar()
+        return funcion()
+    return llamar
+
+
+def _subir_dias(mallas, y0, parametros, vaciar):
+    # Una solicitud por malla, desde una cache vacía
+    for t in mallas:
+        if vaciar or t is mallas[0]:
+            horizonte.limpiar()
+        solucion = horizonte.resolver_normalizado(SIR, y0, t, **parametros)
+    return solucion
+
+
+# ==========================================
+# 3. MEDICIÓN
+# ==========================================
+def medir(funcion):
+    # autorange elige cuántas llamadas caben en ~0.2 s; luego se repite la
+    # medición y se reporta el tiempo por llamada (mínimo y mediana)
+    temporizador = timeit.Timer(funcion)
+    llamadas, _ = temporizador.autorange()
+    tiempos = [total / llamadas for total in temporizador.repeat(REPETICIONES, llamadas)]
+    return {'min_s': min(tiempos), 'mediana_s': statistics.median(tiempos), 'llamadas': llamadas}
+
+
+def ejecutar(casos, filtro=None):
+    resultados = {}
+    for nombre, tamano, funcion in casos:
+        clave = f"{nombre}[{tamano}]"
+        if filtro and filtro not in clave:
+            continue
+        resultados[clave] = medir(funcion)
+        print(f"  {clave:<55} {resultados[clave]['mediana_s'] * 1e3:10.3f} ms")
+    return resultados
+
+
+def metadatos():
+    import scipy
+    return {
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+    }
+
+
+# ==========================================
+# 4. COMPARACIÓN CONTRA LÍNEA BASE
+# ==========================================
+def comparar(resultados, linea_base, umbral):
+    regresiones = []
+    print(f"\nComparación contra la línea base (umbral x{umbral:.2f}):")
+    for clave, actual in resultados.items():
+        nombre, tamano = clave.split('[', 1)
+        base = linea_base['resultados'].get(clave)
+        if base is None and nombre in NOMBRES_ANTERIORES:
+            base = linea_base['resultados'].get(f"{NOMBRES_ANTERIORES[nombre]}[{tamano}")
+        if base is None:
+            print(f"  {clave:<55} (sin línea base)")
+            continue
+        # Se compara el mínimo: es el estimador menos sensible al ruido del sistema
+        razon = actual['min_s'] / base['min_s']
+        marca = 'REGRESIÓN' if razon > umbral else 'ok'
+        print(f"  {clave:<55} x{razon:6.2f}  {marca}")
+        if razon > umbral:
+            regresiones.append((clave, razon))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks de solvers y figuras")
+    parser.add_argument('--guardar', action='store_true', help="guardar los resultados como nueva línea base")
+    parser.add_argument('--linea-base', default=RUTA_LINEA_BASE, help="ruta del JSON de línea base")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_POR_DEFECTO,
+                        help="factor de enlentecimiento tolerado (por defecto BENCH_UMBRAL o 1.25)")
+    parser.add_argument('--filtro', default=None, help="solo casos cuyo nombre contenga este texto")
+    args = parser.parse_args(argv)
+
+    print("Ejecutando microbenchmarks...")
+    resultados = ejecutar(construir_casos(cargar_paginas()), args.filtro)
+
+    if args.guardar:
+        with open(args.linea_base, 'w', encoding='utf-8') as archivo:
+            json.dump({'meta': metadatos(), 'resultados': resultados}, archivo, indent=2, sort_keys=True)
+        print(f"\nLínea base guardada en {args.linea_base}")
+        return 0
+
+    if not os.path.exists(args.linea_base):
+        print(f"\nNo existe línea base en {args.linea_base}; ejecute con --guardar primero.")
+        return 1
+
+    with open(args.linea_base, encoding='utf-8') as archivo:
+        linea_base = json.load(archivo)
+    regresiones = comparar(resultados, linea_base, args.umbral)
+    if regresiones:
+        print(f"\n{len(regresiones)} caso(s) superan el umbral de enlentecimiento.")
+        return 1
+    print("\nSin regresiones.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
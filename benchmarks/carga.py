@@ -0,0 +1,289 @@
+# ==========================================
+# PRUEBA DE CARGA DE CALLBACKS DE DASH
+# ==========================================
+# Levanta la app localmente (o usa una ya en marcha con --url), descubre los
+# callbacks desde /_dash-dependencies y reproduce POSTs realistas a
+# /_dash-update-component con varios usuarios concurrentes.
+#
+# Uso (desde la raíz del repositorio):
+#   python -m benchmarks.carga --usuarios 20 --duracion 30
+#   python -m benchmarks.carga --url http://127.0.0.1:8050 --usuarios 50 --filtro rumor
+#   python -m benchmarks.carga --usuarios 10 --duracion 15 --json reporte.json
+#
+# El reporte incluye, por callback, solicitudes, throughput, latencias
+# p50/p95/p99 y tasa de error.
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTA_CALLBACK = '/_dash-update-component'
+
+
+# ==========================================
+# 1. SERVIDOR LOCAL
+# ==========================================
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def iniciar_servidor(puerto, espera=60):
+    codigo = ("from app import app; "
+              f"app.run(host='127.0.0.1', port={puerto}, debug=False, threaded=True)")
+    proceso = subprocess.Popen([sys.executable, '-c', codigo], cwd=RAIZ,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{puerto}'
+    limite = time.time() + espera
+    while time.time() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError("La app terminó antes de aceptar conexiones")
+        try:
+            urllib.request.urlopen(url + '/', timeout=2).read()
+            return proceso, url
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.3)
+    proceso.terminate()
+    raise RuntimeError(f"La app no respondió en {espera} s")
+
+
+# ==========================================
+# 2. DESCUBRIMIENTO DE CALLBACKS
+# ==========================================
+def separar_salidas(salida):
+    # "grafica.figure" -> [("grafica", "figure")]
+    # "..a.figure...b.children.." -> [("a", "figure"), ("b", "children")]
+    multiple = salida.startswith('..')
+    partes = salida[2:-2].split('...') if multiple else [salida]
+    return [tuple(p.rsplit('.', 1)) for p in partes], multiple
+
+
+def valores_por_pagina():
+    # Recorre el layout de cada página para obtener los valores iniciales de
+    # sus componentes: son la base de las mezclas aleatorias de parámetros.
+    sys.path.insert(0, RAIZ)
+    import dash
+    import app  # noqa: F401
+
+    paginas = {}
+    for pagina in dash.page_registry.values():
+        valores = {}
+        pendientes = [pagina['layout']() if callable(pagina['layout']) else pagina['layout']]
+        while pendientes:
+            nodo = pendientes.pop()
+            if isinstance(nodo, (list, tuple)):
+                pendientes.extend(nodo)
+                continue
+            if not hasattr(nodo, 'to_plotly_json'):
+                continue
+            id_componente = getattr(nodo, 'id', None)
+            if isinstance(id_componente, str):
+                valores[id_componente] = {prop: getattr(nodo, prop, None)
+                                          for prop in ('value', 'n_clicks', 'children', 'figure')}
+            pendientes.append(getattr(nodo, 'children', None))
+        paginas[pagina['name']] = valores
+    return paginas
+
+
+def descubrir_callbacks(url, paginas):
+    with urllib.request.urlopen(url + '/_dash-dependencies', timeout=30) as respuesta:
+        dependencias = json.load(respuesta)
+
+    callbacks = []
+    for dep in dependencias:
+        # Los callbacks de cliente no llegan al servidor; los de patrones
+        # (ids tipo diccionario) no se reproducen
+        if dep.get('clientside_function'):
+            continue
+        salidas, multiple = separar_salidas(dep['output'])
+        ids = [s[0] for s in salidas] + [i['id'] for i in dep['inputs'] + dep['state']]
+        if any(i.startswith('{') for i in ids):
+            continue
+        # La página es la que contiene la primera salida del callback
+        pagina = next((nombre for nombre, valores in paginas.items() if salidas[0][0] in valores), 'app')
+        callbacks.append({
+            # La clave es la salida completa (única en /_dash-dependencies,
+            # incluido el @hash de allow_duplicate); el nombre solo se muestra
+            'clave': dep['output'],
+            'nombre': dep['output'] if multiple else salidas[0][0],
+            'pagina': pagina,
+            'output': dep['output'],
+            'outputs': [{'id': i, 'property': p} for i, p in salidas],
+            'multiple': multiple,
+            'inputs': dep['inputs'],
+            'state': dep['state'],
+            'valores': paginas.get(pagina, {}),
+        })
+    # Varios callbacks pueden escribir la misma salida (allow_duplicate): se
+    # numeran para distinguir sus filas en el reporte
+    repetidos = {}
+    for cb in callbacks:
+        repetidos[cb['nombre']] = repetidos.get(cb['nombre'], 0) + 1
+        if repetidos[cb['nombre']] > 1:
+            cb['nombre'] = f"{cb['nombre']} ({repetidos[cb['nombre']]})"
+    return callbacks
+
+
+# ==========================================
+# 3. GENERACIÓN DE SOLICITUDES
+# ==========================================
+def variar(valor, variacion, rng):
+    # Perturba los números alrededor del valor inicial de la página
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        return valor
+    nuevo = valor * rng.uniform(1 - variacion, 1 + variacion)
+    return int(round(nuevo)) if isinstance(valor, int) else nuevo
+
+
+def construir_cuerpo(callback, variacion, rng):
+    def valor(dep):
+        if dep['property'] == 'n_clicks':
+            return rng.randint(1, 1000)
+        return variar(callback['valores'].get(dep['id'], {}).get(dep['property']), variacion, rng)
+
+    entradas = [{**dep, 'value': valor(dep)} for dep in callback['inputs']]
+    estados = [{**dep, 'value': valor(dep)} for dep in callback['state']]
+    return {
+        'output': callback['output'],
+        'outputs': callback['outputs'] if callback['multiple'] else callback['outputs'][0],
+        'inputs': entradas,
+        'state': estados,
+        'changedPropIds': [f"{e['id']}.{e['property']}" for e in entradas[:1]],
+    }
+
+
+def enviar(url, cuerpo, timeout):
+    datos = json.dumps(cuerpo).encode('utf-8')
+    solicitud = urllib.request.Request(url + RUTA_CALLBACK, data=datos,
+                                       headers={'Content-Type': 'application/json'})
+    inicio = time.perf_counter()
+    try:
+        with urllib.request.urlopen(solicitud, timeout=timeout) as respuesta:
+            respuesta.read()
+            ok = respuesta.status in (200, 204)
+    except urllib.error.HTTPError as error:
+        # 204 (PreventUpdate) no es error; cualquier 4xx/5xx sí
+        ok = error.code == 204
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        ok = False
+    return time.perf_counter() - inicio, ok
+
+
+# ==========================================
+# 4. EJECUCIÓN CONCURRENTE
+# ==========================================
+def ejecutar_carga(url, callbacks, usuarios, duracion, solicitudes, variacion, semilla, timeout):
+    registros = {cb['clave']: [] for cb in callbacks}
+    candado = threading.Lock()
+    contador = iter(range(solicitudes)) if solicitudes else None
+    fin = time.time() + duracion
+
+    def usuario(indice):
+        # Cada usuario tiene su propio generador para que la mezcla sea reproducible
+        rng = random.Random(semilla * 1000 + indice)
+        while time.time() < fin:
+            if contador is not None:
+                with candado:
+                    if next(contador, None) is None:
+                        return
+            callback = rng.choice(callbacks)
+            latencia, ok = enviar(url, construir_cuerpo(callback, variacion, rng), timeout)
+            with candado:
+                registros[callback['clave']].append((latencia, ok))
+
+    hilos = [threading.Thread(target=usuario, args=(i,), daemon=True) for i in range(usuarios)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return registros, time.perf_counter() - inicio
+
+
+def resumir(callbacks, registros, transcurrido):
+    filas = []
+    todos = []
+    for cb in callbacks:
+        datos = registros[cb['clave']]
+        todos.extend(datos)
+        filas.append(_fila(cb['nombre'], cb['pagina'], datos, transcurrido))
+    filas.append(_fila('TOTAL', '', todos, transcurrido))
+    return filas
+
+
+def _fila(nombre, pagina, datos, transcurrido):
+    latencias = np.array([d[0] for d in datos]) * 1e3
+    errores = sum(1 for d in datos if not d[1])
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if len(latencias) else (np.nan,) * 3
+    return {
+        'callback': nombre, 'pagina': pagina, 'solicitudes': len(datos),
+        'throughput_rps': len(datos) / transcurrido if transcurrido else 0.0,
+        'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99),
+        'tasa_error': errores / len(datos) if datos else 0.0,
+    }
+
+
+def imprimir(filas, usuarios, transcurrido):
+    print(f"\n{usuarios} usuarios concurrentes durante {transcurrido:.1f} s\n")
+    print(f"{'callback':<45} {'página':<28} {'n':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'error':>7}")
+    for f in filas:
+        print(f"{f['callback'][:45]:<45} {f['pagina'][:28]:<28} {f['solicitudes']:>6} "
+              f"{f['throughput_rps']:>8.1f} {f['p50_ms']:>8.1f} {f['p95_ms']:>8.1f} "
+              f"{f['p99_ms']:>8.1f} {f['tasa_error']:>6.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de los callbacks de la app")
+    parser.add_argument('--url', default=None, help="app ya en marcha; si se omite se levanta una local")
+    parser.add_argument('--usuarios', type=int, default=10, help="usuarios concurrentes")
+    parser.add_argument('--duracion', type=float, default=20.0, help="segundos de prueba")
+    parser.add_argument('--solicitudes', type=int, default=0, help="tope de solicitudes (0 = sin tope)")
+    parser.add_argument('--variacion', type=float, default=0.3,
+                        help="variación relativa aleatoria de los parámetros numéricos")
+    parser.add_argument('--filtro', default=None, help="solo callbacks cuyo nombre o página contenga este texto")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--json', default=None, help="guardar el reporte en este archivo")
+    args = parser.parse_args(argv)
+
+    proceso = None
+    url = args.url
+    if url is None:
+        proceso, url = iniciar_servidor(puerto_libre())
+    try:
+        callbacks = descubrir_callbacks(url.rstrip('/'), valores_por_pagina())
+        if args.filtro:
+            callbacks = [cb for cb in callbacks if args.filtro in cb['nombre'] or args.filtro in cb['pagina']]
+        if not callbacks:
+            print("No se encontraron callbacks que reproducir.")
+            return 1
+        print(f"Reproduciendo {len(callbacks)} callbacks contra {url} ...")
+        registros, transcurrido = ejecutar_carga(url.rstrip('/'), callbacks, args.usuarios, args.duracion,
+                                                 args.solicitudes, args.variacion, args.semilla, args.timeout)
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+    filas = resumir(callbacks, registros, transcurrido)
+    imprimir(filas, args.usuarios, transcurrido)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump({'usuarios': args.usuarios, 'duracion_s': transcurrido, 'callbacks': filas},
+                      archivo, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
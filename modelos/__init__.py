@@ -0,0 +1,6 @@
+# ==========================================
+# MODELOS MATEMÁTICOS COMPARTIDOS POR LAS PÁGINAS
+# ==========================================
+from modelos.compartimental import (
+    Flujo, LOTKA_VOLTERRA, Modelo, RUMOR, RUMOR_MAKI_THOMPSON, SEIR, SIR, SIRD, SIRS,
+)
@@ -0,0 +1,209 @@
+# ==========================================
+# AJUSTE DE PARÁMETROS A DATOS OBSERVADOS
+# ==========================================
+# Estima por mínimos cuadrados los parámetros de un modelo del motor
+# (p. ej. b y k del SIR) a partir de conteos diarios.
+#
+# El gradiente no se aproxima con diferencias finitas: junto al modelo se
+# integran las ecuaciones de sensibilidad hacia adelante
+#
+#     dY/dt = f(Y, p)
+#     dS/dt = J(Y, p) S + df/dp,     S = dY/dp,  S(0) = 0
+#
+# usando el jacobiano y el jacobiano de parámetros que genera el motor. Una
+# sola integración da los residuos y su jacobiano exacto.
+#
+# Opcionalmente también se ajusta la condición inicial de un compartimento
+# (p. ej. I0, que rara vez se conoce con exactitud); su sensibilidad sale de
+# la misma integración con S(0) = dY0/dI0 y sin término forzante.
+#
+# Los parámetros se ajustan en escala logarítmica (siempre positivos) y los
+# intervalos de confianza salen de la matriz de covarianza asintótica
+# s^2 (J^T J)^-1, transformados de vuelta a la escala original.
+import csv
+import io
+
+import numpy as np
+from scipy.integrate import odeint
+from scipy.optimize import least_squares
+from scipy.stats import t as t_student
+
+# Nombres de columna aceptados para cada compartimento del CSV
+ALIAS_COLUMNAS = {
+    'S': ('s', 'susceptibles', 'ignoran'),
+    'E': ('e', 'expuestos'),
+    'I': ('i', 'infectados', 'casos', 'propagadores', 'activos'),
+    'R': ('r', 'recuperados', 'racionales', 'removidos'),
+    'D': ('d', 'fallecidos', 'muertes'),
+}
+ALIAS_TIEMPO = ('t', 'dia', 'día', 'dias', 'días', 'tiempo', 'day')
+RANGO_BUSQUEDA = 1e6
+
+
+# ==========================================
+# 1. LECTURA DE DATOS
+# ==========================================
+def leer_csv(texto, compartimentos=('S', 'I', 'R')):
+    # Devuelve (t, {compartimento: valores}). La columna de tiempo es la
+    # que se llame dia/t/tiempo o, si no hay ninguna, la primera.
+    dialecto = csv.Sniffer().sniff(texto.splitlines()[0], delimiters=',;\t')
+    filas = [f for f in csv.reader(io.StringIO(texto), dialecto) if any(c.strip() for c in f)]
+    encabezado = [c.strip().lower() for c in filas[0]]
+    datos = np.array([[float(c.replace(',', '.')) if c.strip() else np.nan for c in f] for f in filas[1:]])
+
+    columna_t = next((i for i, c in enumerate(encabezado) if c in ALIAS_TIEMPO), 0)
+    observaciones = {}
+    for compartimento in compartimentos:
+        alias = ALIAS_COLUMNAS.get(compartimento, (compartimento.lower(),))
+        columna = next((i for i, c in enumerate(encabezado) if c in alias and i != columna_t), None)
+        if columna is not None:
+            observaciones[compartimento] = datos[:, columna]
+    if not observaciones:
+        raise ValueError(f"El CSV no tiene columnas de {', '.join(compartimentos)}")
+
+    orden = np.argsort(datos[:, columna_t])
+    return datos[orden, columna_t], {c: v[orden] for c, v in observaciones.items()}
+
+
+# ==========================================
+# 2. SENSIBILIDADES HACIA ADELANTE
+# ==========================================
+def resolver_sensibilidades(modelo, y0, t, condiciones=(), **parametros):
+    # Devuelve (Y, dY) con Y de forma (len(t), compartimentos) como
+    # modelo.resolver y dY = dY/dp de forma (len(t), compartimentos, parámetros),
+    # seguida de una columna por cada (valor, dY0/dvalor) de `condiciones`
+    # Sin validar: durante el ajuste del valor inicial least_squares puede
+    # probar puntos con S0 < 0 (el y0 del usuario se valida en ajustar)
+    estados0, total = modelo.reducir(y0, validar=False)
+    valores = modelo.valores_parametros(parametros)
+    n, p = len(estados0), len(valores) + len(condiciones)
+    argumentos = modelo.argumentos(valores, total)
+    escala = np.array([*valores, *(valor for valor, _ in condiciones)], dtype=float)
+    buffer_p = np.zeros((n, p))
+    S0 = np.zeros((n, p))
+    for j, (valor, direccion) in enumerate(condiciones, start=len(valores)):
+        S0[:, j] = valor * modelo.reducir(direccion, validar=False)[0]
+
+    # Se integra p * dY/dp (sensibilidad relativa): todas sus columnas
+    # tienen la escala de Y aunque los parámetros difieran en órdenes de
+    # magnitud (b ~ 1/N frente a k ~ 0.1), lo que facilita al integrador
+    def aumentado(z, t_):
+        y = z[:n]
+        S = z[n:].reshape(n, p)
+        f = modelo.rhs(y, t_, *argumentos)
+        J = modelo.jac(y, t_, *argumentos)
+        # Las columnas de las condiciones iniciales quedan en cero
+        dfdp = modelo.jac_parametros(y, t_, *valores, argumentos[len(valores)], buffer_p)
+        return np.concatenate([f, (J @ S + dfdp * escala).ravel()])
+
+    z0 = np.concatenate([estados0, S0.ravel()])
+    solucion = odeint(aumentado, z0, t)
+    Y = modelo.completar(solucion[:, :n], total)
+    # El compartimento eliminado tiene sensibilidad -suma de las demás
+    dY = modelo.completar(solucion[:, n:].reshape(len(t), n, p), 0.0, eje=1) / escala
+    return Y, dY
+
+
+# ==========================================
+# 3. MÍNIMOS CUADRADOS
+# ==========================================
+class Ajuste:
+    def __init__(self, modelo, parametros, errores, intervalos, t, curva, rms, evaluaciones, exito, mensaje):
+        self.modelo = modelo
+        self.parametros = parametros      # {nombre: valor} (ajustados y fijos)
+        self.errores = errores            # {nombre: error estándar} de los ajustados
+        self.intervalos = intervalos      # {nombre: (bajo, alto)} de los ajustados
+        self.t = t
+        self.curva = curva                # (len(t), compartimentos) con los parámetros ajustados
+        self.rms = rms
+        self.evaluaciones = evaluaciones
+        self.exito = exito
+        self.mensaje = mensaje
+
+
+def ajustar(modelo, t_obs, observaciones, y0, iniciales, fijos=None, inicial=None, nivel=0.95):
+    # observaciones: {compartimento: conteos en t_obs} (NaN = dato faltante)
+    # iniciales: {parámetro: valor inicial} de los que se ajustan
+    # fijos: {parámetro: valor} del resto
+    # inicial: compartimento cuyo valor en t_obs[0] también se ajusta (se
+    #          compensa con el primero, S, para conservar el total); aparece
+    #          en los resultados como '<compartimento>0'
+    fijos = dict(fijos or {})
+    modelo.reducir(y0)
+    y0 = np.asarray(y0, dtype=float)
+    nombres = [p for p in modelo.parametros if p in iniciales]
+    columnas = [modelo.parametros.index(p) for p in nombres]
+    direccion = None
+    if inicial is not None:
+        direccion = np.zeros(len(modelo.compartimentos))
+        direccion[modelo.compartimentos.index(inicial)] = 1.0
+        direccion[0] -= 1.0
+        nombres.append(f"{inicial}0")
+        columnas.append(len(modelo.parametros))
+        iniciales = dict(iniciales, **{nombres[-1]: y0[modelo.compartimentos.index(inicial)]})
+    observados = [(modelo.compartimentos.index(c), np.asarray(v, dtype=float)) for c, v in observaciones.items()]
+    t_obs = np.asarray(t_obs, dtype=float)
+    validos = np.concatenate([np.isfinite(v) for _, v in observados])
+    datos = np.concatenate([v for _, v in observados])[validos]
+
+    # Las dos funciones de least_squares se piden con el mismo x: se guarda
+    # la última integración para no repetirla
+    ultimo = {}
+
+    def condiciones(valores):
+        # y0 y la dirección de su sensibilidad para el valor inicial ajustado
+        if direccion is None:
+            return y0, ()
+        valor = valores.pop(nombres[-1])
+        actual = y0[modelo.compartimentos.index(inicial)]
+        return y0 + (valor - actual) * direccion, ((valor, direccion),)
+
+    def integrar(theta):
+        clave = theta.tobytes()
+        if ultimo.get('clave') != clave:
+            valores = dict(fijos, **dict(zip(nombres, np.exp(theta))))
+            y0_actual, extra = condiciones(valores)
+            Y, dY = resolver_sensibilidades(modelo, y0_actual, t_obs, condiciones=extra, **valores)
+            ultimo.update(clave=clave, Y=Y, dY=dY)
+        return ultimo['Y'], ultimo['dY']
+
+    def residuos(theta):
+        Y, _ = integrar(theta)
+        return np.concatenate([Y[:, i] for i, _ in observados])[validos] - datos
+
+    def jacobiano(theta):
+        _, dY = integrar(theta)
+        # d/dlog(p) = p * d/dp
+        J = np.concatenate([dY[:, i][:, columnas] for i, _ in observados])[validos]
+        return J * np.exp(theta)
+
+    # Región de confianza acotada a seis órdenes de magnitud alrededor del
+    # valor inicial: evita pasos extremos que vuelven rígido el sistema
+    theta0 = np.log([float(iniciales[p]) for p in nombres])
+    limite = np.log(RANGO_BUSQUEDA)
+    resultado = least_squares(residuos, theta0, jac=jacobiano, method='trf',
+                              bounds=(theta0 - limite, theta0 + limite))
+
+    # Covarianza asintótica en escala logarítmica
+    grados_libertad = max(datos.size - len(nombres), 1)
+    s2 = 2 * resultado.cost / grados_libertad
+    try:
+        covarianza = s2 * np.linalg.inv(resultado.jac.T @ resultado.jac)
+        errores_log = np.sqrt(np.clip(np.diag(covarianza), 0, None))
+    except np.linalg.LinAlgError:
+        errores_log = np.full(len(nombres), np.inf)
+    cuantil = t_student.ppf(0.5 + nivel / 2, grados_libertad)
+
+    estimados = np.exp(resultado.x)
+    parametros = dict(fijos, **dict(zip(nombres, estimados)))
+    modelo_parametros = dict(parametros)
+    y0_final, _ = condiciones(modelo_parametros)
+    t_curva = np.linspace(t_obs[0], t_obs[-1], 200)
+    return Ajuste(
+        modelo, parametros,
+        errores={p: v * e for p, v, e in zip(nombres, estimados, errores_log)},
+        intervalos={p: (v * np.exp(-cuantil * e), v * np.exp(cuantil * e))
+                    for p, v, e in zip(nombres, estimados, errores_log)},
+        t=t_curva, curva=modelo.resolver(y0_final, t_curva, **modelo_parametros),
+        rms=float(np.sqrt(2 * resultado.cost / datos.size)),
+        evaluaciones=resultado.nfev, exito=resultado.success, mensaje=resultado.message)
@@ -0,0 +1,301 @@
+# ==========================================
+# MOTOR DE MODELOS COMPARTIMENTALES
+# ==========================================
+# Un modelo se declara como compartimentos más flujos entre ellos. Cada flujo
+# sigue la ley de acción de masas:
+#
+#     tasa = parametro * producto(factores)
+#
+# p. ej. el contagio del SIR es Flujo('S', 'I', 'b', ('S', 'I')) -> b*S*I.
+# Un origen o destino None representa el exterior del sistema (nacimientos,
+# muertes, inmigración...).
+#
+# A partir de la declaración se genera código Python/NumPy para:
+#   - el lado derecho (lee los estados con y.item(i), sin convertir y en
+#     lista, y escribe en un arreglo preasignado en lugar de crear listas o
+#     tuplas en cada llamada),
+#   - el jacobiano analítico respecto a los estados,
+#   - el jacobiano respecto a los parámetros (para sensibilidades),
+#   - una versión por lotes que evalúa muchos escenarios a la vez.
+#
+# Si todos los flujos son internos la población total se conserva y el
+# último compartimento se elimina del sistema (se reconstruye como
+# total - suma de los demás), así el integrador trabaja con un estado menos.
+import numpy as np
+from scipy.integrate import odeint, solve_ivp
+
+NOMBRES_RESERVADOS = {'t', 'y', 'np'}
+
+
+class Flujo:
+    def __init__(self, origen, destino, parametro, factores=()):
+        self.origen = origen
+        self.destino = destino
+        self.parametro = parametro
+        self.factores = tuple(factores)
+
+    def __repr__(self):
+        return f"Flujo({self.origen!r}, {self.destino!r}, {self.parametro!r}, {self.factores!r})"
+
+
+# ==========================================
+# 1. GENERACIÓN DE CÓDIGO
+# ==========================================
+def _monomio(parametro, factores):
+    return '*'.join([parametro, *factores]) if parametro else ('*'.join(factores) or '1.0')
+
+
+def _suma(terminos):
+    # terminos: [(coeficiente, expresion), ...] -> "a - 2.0*b + c"
+    texto = ''
+    for coeficiente, expresion in terminos:
+        if coeficiente == 0:
+            continue
+        magnitud = abs(coeficiente)
+        parte = expresion if magnitud == 1 else f"{float(magnitud)!r}*{expresion}"
+        if not texto:
+            texto = f"-{parte}" if coeficiente < 0 else parte
+        else:
+            texto += f" {'-' if coeficiente < 0 else '+'} {parte}"
+    return texto or '0.0'
+
+
+def _quitar_uno(factores, nombre):
+    restantes = list(factores)
+    restantes.remove(nombre)
+    return restantes
+
+
+class Modelo:
+    def __init__(self, nombre, compartimentos, flujos):
+        self.nombre = nombre
+        self.compartimentos = tuple(compartimentos)
+        self.flujos = tuple(flujos)
+        self._validar()
+
+        self.parametros = tuple(dict.fromkeys(f.parametro for f in self.flujos))
+        self.conservativo = all(f.origen is not None and f.destino is not None for f in self.flujos)
+        self.eliminado = self.compartimentos[-1] if self.conservativo else None
+        self.estados = tuple(c for c in self.compartimentos if c != self.eliminado)
+        self._indices_estados = [self.compartimentos.index(c) for c in self.estados]
+
+        self.codigo = self._generar_codigo()
+        espacio = {'np': np}
+        exec(compile(self.codigo, f"<modelo {nombre}>", 'exec'), espacio)
+        self.rhs = espacio['rhs']
+        self.jac = espacio['jac']
+        self.jac_parametros = espacio['jac_parametros']
+        self.rhs_lote = espacio['rhs_lote']
+
+    def __repr__(self):
+        return f"Modelo({self.nombre!r}, {list(self.compartimentos)!r})"
+
+    def __reduce__(self):
+        # Las funciones generadas no se pueden serializar: otro proceso
+        # recibe la declaración y vuelve a generar el código
+        return (Modelo, (self.nombre, self.compartimentos, self.flujos))
+
+    def _validar(self):
+        nombres = set(self.compartimentos)
+        if len(nombres) != len(self.compartimentos):
+            raise ValueError(f"{self.nombre}: compartimentos repetidos")
+        for flujo in self.flujos:
+            for nombre in (flujo.origen, flujo.destino, *flujo.factores):
+                if nombre is not None and nombre not in nombres:
+                    raise ValueError(f"{self.nombre}: compartimento desconocido {nombre!r} en {flujo!r}")
+        parametros = {f.parametro for f in self.flujos}
+        for nombre in nombres | parametros:
+            if not nombre.isidentifier() or nombre.startswith('_') or nombre in NOMBRES_RESERVADOS:
+                raise ValueError(f"{self.nombre}: nombre inválido {nombre!r}")
+        if nombres & parametros:
+            raise ValueError(f"{self.nombre}: parámetros y compartimentos comparten nombres")
+
+    # --- Expresiones simbólicas ---
+    def _derivadas_estados(self):
+        # dy_i/dt como lista de (signo, índice de flujo)
+        derivadas = {c: [] for c in self.estados}
+        for k, flujo in enumerate(self.flujos):
+            if flujo.origen in derivadas:
+                derivadas[flujo.origen].append((-1, k))
+            if flujo.destino in derivadas:
+                derivadas[flujo.destino].append((1, k))
+        return derivadas
+
+    def _derivada_tasa(self, flujo, variable):
+        # d(tasa)/d(variable) considerando que el compartimento eliminado
+        # depende de los estados: eliminado = total - suma(estados)
+        terminos = []
+        veces = flujo.factores.count(variable)
+        if veces:
+            terminos.append((veces, _monomio(flujo.parametro, _quitar_uno(flujo.factores, variable))))
+        veces = flujo.factores.count(self.eliminado) if self.eliminado else 0
+        if veces:
+            terminos.append((-veces, _monomio(flujo.parametro, _quitar_uno(flujo.factores, self.eliminado))))
+        return terminos
+
+    def _encabezado(self, firma, desempaque):
+        # El compartimento eliminado solo se calcula si aparece en alguna tasa
+        usados = {c for f in self.flujos for c in f.factores}
+        lineas = [f"def {firma}:", f"    {', '.join(self.estados)}, = {desempaque}"]
+        if self.eliminado in usados:
+            lineas.append(f"    {self.eliminado} = _total - {' - '.join(self.estados)}")
+        return lineas
+
+    def _generar_codigo(self):
+        params = ', '.join(self.parametros)
+        derivadas = self._derivadas_estados()
+        tasas = [f"    _f{k} = {_monomio(f.parametro, f.factores)}" for k, f in enumerate(self.flujos)]
+        ecuaciones = [_suma([(signo, f"_f{k}") for signo, k in derivadas[c]]) for c in self.estados]
+
+        # Lado derecho (un escenario; odeint pasa y como arreglo 1-D). Los
+        # estados se leen como float de Python: operar con escalares de
+        # NumPy (S, I = y) es unas dos veces más lento
+        desempaque = ' '.join(f"y.item({i})," for i in range(len(self.estados)))
+        codigo = self._encabezado(f"rhs(y, t, {params}, _total, _out, _out_jac)", desempaque)
+        codigo += tasas
+        codigo += [f"    _out[{i}] = {e}" for i, e in enumerate(ecuaciones)]
+        codigo += ["    return _out", ""]
+
+        # Lado derecho por lotes (solve_ivp; estados de forma (n, m) aplanados).
+        # Devuelve una copia: RK45 guarda la última derivada y la reutiliza
+        # si rechaza el paso siguiente, así que no puede ser el buffer.
+        codigo += self._encabezado(f"rhs_lote(t, y, {params}, _total, _out)",
+                                   f"y.reshape({len(self.estados)}, -1)")
+        codigo += tasas
+        codigo += [f"    _out[{i}] = {e}" for i, e in enumerate(ecuaciones)]
+        codigo += ["    return _out.reshape(-1).copy()", ""]
+
+        # Jacobiano respecto a los estados
+        codigo += self._encabezado(f"jac(y, t, {params}, _total, _out, _out_jac)", desempaque)
+        for i, c in enumerate(self.estados):
+            for j, v in enumerate(self.estados):
+                terminos = [(signo * coef, expr)
+                            for signo, k in derivadas[c]
+                            for coef, expr in self._derivada_tasa(self.flujos[k], v)]
+                codigo.append(f"    _out_jac[{i}, {j}] = {_suma(terminos)}")
+        codigo += ["    return _out_jac", ""]
+
+        # Jacobiano respecto a los parámetros
+        codigo += self._encabezado(f"jac_parametros(y, t, {params}, _total, _out)", desempaque)
+        for i, c in enumerate(self.estados):
+            for j, p in enumerate(self.parametros):
+                terminos = [(signo, _monomio(None, self.flujos[k].factores))
+                            for signo, k in derivadas[c] if self.flujos[k].parametro == p]
+                codigo.append(f"    _out[{i}, {j}] = {_suma(terminos)}")
+        codigo += ["    return _out", ""]
+        return '\n'.join(codigo)
+
+    # ==========================================
+    # 2. CONVERSIÓN DE ESTADOS Y PARÁMETROS
+    # ==========================================
+    def valores_parametros(self, parametros):
+        faltantes = [p for p in self.parametros if p not in parametros]
+        if faltantes:
+            raise TypeError(f"{self.nombre}: faltan parámetros {faltantes}")
+        return tuple(parametros[p] for p in self.parametros)
+
+    def reducir(self, y0, validar=True):
+        # Los lados derechos generados no recortan estados negativos: un
+        # estado inicial imposible (p. ej. I0 > N, que deja S0 < 0) se
+        # rechaza aquí. validar=False para direcciones (ajuste.py)
+        y0 = np.asarray(y0, dtype=float)
+        if validar and not (np.isfinite(y0).all() and (y0 >= 0).all()):
+            raise ValueError(f"{self.nombre}: el estado inicial debe ser finito y no negativo")
+        return y0[self._indices_estados], y0.sum(axis=0)
+
+    def completar(self, estados, total, eje=-1):
+        # Inserta el compartimento eliminado (total - suma) en su posición
+        if not self.eliminado:
+            return estados
+        estados = np.moveaxis(estados, eje, 0)
+        eliminado = total - estados.sum(axis=0)
+        completo = np.concatenate([estados, eliminado[None]], axis=0)
+        orden = np.argsort(self._indices_estados + [self.compartimentos.index(self.eliminado)])
+        return np.moveaxis(completo[orden], 0, eje)
+
+    def argumentos(self, valores, total):
+        # Argumentos extra de rhs/jac: parámetros, total y buffers de salida
+        n = len(self.estados)
+        return (*valores, float(total), np.empty(n), np.empty((n, n)))
+
+    # ==========================================
+    # 3. INTEGRACIÓN
+    # ==========================================
+    def resolver(self, y0, t, **parametros):
+        # Un escenario: devuelve un arreglo (len(t), compartimentos) como odeint
+        estados0, total = self.reducir(y0)
+        argumentos = self.argumentos(self.valores_parametros(parametros), total)
+        solucion = odeint(self.rhs, estados0, t, args=argumentos, Dfun=self.jac)
+        return self.completar(solucion, total)
+
+    def resolver_lote(self, y0, t, rtol=1e-6, atol=1e-6, **parametros):
+        # Muchos escenarios en una sola integración.
+        # y0: (m, compartimentos); cada parámetro: escalar o arreglo (m,).
+        # Devuelve un arreglo (compartimentos, m, len(t)).
+        y0 = np.atleast_2d(np.asarray(y0, dtype=float))
+        m = y0.shape[0]
+        estados0, total = self.reducir(y0.T)
+        valores = tuple(np.broadcast_to(np.asarray(v, dtype=float), (m,))
+                        for v in self.valores_parametros(parametros))
+        salida = np.empty((len(self.estados), m))
+        t = np.asarray(t, dtype=float)
+        solucion = solve_ivp(self.rhs_lote, (t[0], t[-1]), estados0.reshape(-1), t_eval=t,
+                             args=(*valores, total, salida), rtol=rtol, atol=atol)
+        if not solucion.success:
+            raise RuntimeError(f"{self.nombre}: {solucion.message}")
+        estados = solucion.y.reshape(len(self.estados), m, len(t))
+        return self.completar(estados, total[:, None], eje=0)
+
+
+# ==========================================
+# 4. MODELOS PREDEFINIDOS
+# ==========================================
+# En todos los modelos de contagio la tasa es b*S*I: si se trabaja con
+# proporciones o con beta/N, el parámetro b ya debe incluir ese factor.
+SIR = Modelo('SIR', ['S', 'I', 'R'], [
+    Flujo('S', 'I', 'b', ('S', 'I')),
+    Flujo('I', 'R', 'k', ('I',)),
+])
+
+SEIR = Modelo('SEIR', ['S', 'E', 'I', 'R'], [
+    Flujo('S', 'E', 'b', ('S', 'I')),
+    Flujo('E', 'I', 'sigma', ('E',)),
+    Flujo('I', 'R', 'k', ('I',)),
+])
+
+# Inmunidad temporal: los recuperados vuelven a ser susceptibles
+SIRS = Modelo('SIRS', ['S', 'I', 'R'], [
+    Flujo('S', 'I', 'b', ('S', 'I')),
+    Flujo('I', 'R', 'k', ('I',)),
+    Flujo('R', 'S', 'xi', ('R',)),
+])
+
+# Con fallecidos (D) separados de los recuperados
+SIRD = Modelo('SIRD', ['S', 'I', 'R', 'D'], [
+    Flujo('S', 'I', 'b', ('S', 'I')),
+    Flujo('I', 'R', 'k', ('I',)),
+    Flujo('I', 'D', 'mu', ('I',)),
+])
+
+# Rumor tal como lo usan las páginas: S ignoran, I propagan, R racionales
+RUMOR = Modelo('Rumor', ['S', 'I', 'R'], [
+    Flujo('S', 'I', 'b', ('S', 'I')),
+    Flujo('I', 'R', 'k', ('I',)),
+])
+
+# Variante de Maki-Thompson: un propagador se vuelve racional al contactar a
+# alguien que ya conoce el rumor (otro propagador o un racional)
+RUMOR_MAKI_THOMPSON = Modelo('Rumor Maki-Thompson', ['S', 'I', 'R'], [
+    Flujo('S', 'I', 'b', ('S', 'I')),
+    Flujo('I', 'R', 'k', ('I', 'I')),
+    Flujo('I', 'R', 'k', ('I', 'R')),
+])
+
+# Depredador-presa de Lotka-Volterra: P presas, D depredadores
+#   dP/dt = alfa*P - beta*P*D,   dD/dt = delta*P*D - gamma*D
+LOTKA_VOLTERRA = Modelo('Lotka-Volterra', ['P', 'D'], [
+    Flujo(None, 'P', 'alfa', ('P',)),
+    Flujo('P', None, 'beta', ('P', 'D')),
+    Flujo(None, 'D', 'delta', ('P', 'D')),
+    Flujo('D', None, 'gamma', ('D',)),
+])
@@ -0,0 +1,92 @@
+# ==========================================
+# LOTKA-VOLTERRA: INTEGRAL PRIMERA Y PERÍODOS
+# ==========================================
+# El sistema dP/dt = alfa P - beta P D, dD/dt = delta P D - gamma D conserva
+#
+#     V(P, D) = delta P - gamma ln P + beta D - alfa ln D
+#
+# y sus órbitas son curvas cerradas V = constante alrededor del equilibrio
+# (gamma/delta, alfa/beta), donde V es mínima. El retrato de fases no
+# necesita integrar nada: V se evalúa una vez sobre una malla y cada nivel
+# es una órbita (un solo contorno con muchos niveles).
+#
+# El período también sale de la geometría. En coordenadas polares
+# alrededor del equilibrio, V crece a lo largo de cada rayo, así que el
+# radio rho(theta) de la órbita V = v se obtiene por bisección (vectorizada
+# sobre ángulos y niveles) y
+#
+#     T = integral de 0 a 2 pi de rho^2 / (X dD/dt - Y dP/dt) dtheta
+#
+# con (X, Y) = (P, D) - equilibrio. Los períodos de todas las órbitas
+# dibujadas salen de una sola evaluación.
+import numpy as np
+
+ANGULOS = 512
+ITERACIONES_BISECCION = 60
+
+
+def integral_primera(P, D, alfa, beta, delta, gamma):
+    return delta * P - gamma * np.log(P) + beta * D - alfa * np.log(D)
+
+
+def equilibrio(alfa, beta, delta, gamma):
+    return gamma / delta, alfa / beta
+
+
+def malla_integral(p_max, d_max, n, alfa, beta, delta, gamma):
+    # V en una malla (n x n) del cuadrante positivo (sin los ejes, donde V
+    # diverge); devuelve (p, d, V) con V[i, j] = V(p[j], d[i])
+    p = np.linspace(p_max / n, p_max, n)
+    d = np.linspace(d_max / n, d_max, n)
+    V = (delta * p - gamma * np.log(p))[None, :] + (beta * d - alfa * np.log(d))[:, None]
+    return p, d, V
+
+
+def radios_orbita(niveles, angulos, alfa, beta, delta, gamma):
+    # rho(theta) de cada órbita: arreglo (niveles, angulos)
+    P_eq, D_eq = equilibrio(alfa, beta, delta, gamma)
+    niveles = np.asarray(niveles, dtype=float)[:, None]
+    c, s = np.cos(angulos), np.sin(angulos)
+    # El rayo sale del cuadrante positivo en un radio finito (V -> infinito
+    # en los ejes); si no sale, se duplica el radio hasta superar el nivel
+    with np.errstate(divide='ignore'):
+        limite = np.minimum(np.where(c < 0, -P_eq / c, np.inf), np.where(s < 0, -D_eq / s, np.inf))
+    abierto = ~np.isfinite(limite)
+    limite = np.where(abierto, max(P_eq, D_eq), limite)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        while True:
+            V = integral_primera(P_eq + limite * c, D_eq + limite * s, alfa, beta, delta, gamma)
+            crecer = abierto & (V < niveles.max())
+            if not crecer.any():
+                break
+            limite = np.where(crecer, 2 * limite, limite)
+
+        bajo = np.zeros((len(niveles), len(c)))
+        alto = np.broadcast_to(limite, bajo.shape)
+        for _ in range(ITERACIONES_BISECCION):
+            medio = 0.5 * (bajo + alto)
+            dentro = integral_primera(P_eq + medio * c, D_eq + medio * s, alfa, beta, delta, gamma) < niveles
+            bajo = np.where(dentro, medio, bajo)
+            alto = np.where(dentro, alto, medio)
+    return 0.5 * (bajo + alto)
+
+
+def periodos(niveles, alfa, beta, delta, gamma, angulos=ANGULOS):
+    # Período de cada órbita V = nivel
+    P_eq, D_eq = equilibrio(alfa, beta, delta, gamma)
+    theta = np.linspace(0, 2 * np.pi, angulos, endpoint=False)
+    rho = radios_orbita(niveles, theta, alfa, beta, delta, gamma)
+    X, Y = rho * np.cos(theta), rho * np.sin(theta)
+    P, D = P_eq + X, D_eq + Y
+    dP = P * (alfa - beta * D)
+    dD = D * (delta * P - gamma)
+    # Regla del trapecio periódica (exponencialmente precisa en theta); la
+    # órbita de radio cero es el equilibrio, con el período lineal
+    with np.errstate(divide='ignore', invalid='ignore'):
+        T = (rho ** 2 / (X * dD - Y * dP)).mean(axis=1) * 2 * np.pi
+    return np.where(np.isfinite(T), T, periodo_lineal(alfa, gamma))
+
+
+def periodo_lineal(alfa, gamma):
+    # Límite de órbitas pequeñas (linealización en el equilibrio)
+    return 2 * np.pi / np.sqrt(alfa * gamma)
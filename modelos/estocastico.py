@@ -0,0 +1,204 @@
+# ==========================================
+# SIMULACIÓN ESTOCÁSTICA DE MODELOS COMPARTIMENTALES
+# ==========================================
+# Usa la misma declaración de flujos que modelos.compartimental: cada flujo
+# es una reacción que mueve una persona de `origen` a `destino` con
+# propensión parametro * producto(factores), con los estados en conteos
+# enteros.
+#
+# Dos métodos, ambos vectorizados sobre miles de realizaciones a la vez
+# (cada paso opera sobre arreglos (realizaciones, ...)):
+#   - 'gillespie': algoritmo directo exacto, un evento por paso. Adecuado
+#                  para poblaciones pequeñas (p. ej. el rumor con N=275).
+#   - 'tau':       tau-leaping con cadenas binomiales: en cada paso de
+#                  tamaño tau las salidas de un compartimento se sortean
+#                  con una binomial, así nunca aparecen conteos negativos.
+#                  Adecuado para poblaciones grandes.
+# 'auto' elige Gillespie hasta UMBRAL_GILLESPIE personas.
+#
+# Las realizaciones se reparten en bloques de tamaño fijo, cada uno con su
+# propia semilla derivada de `semilla` (SeedSequence.spawn). Los bloques se
+# pueden repartir entre procesos (modelos.paralelo) y el resultado no
+# depende de cuántos se usen.
+import numpy as np
+
+from modelos.paralelo import mapear
+
+UMBRAL_GILLESPIE = 2000
+TAMANO_BLOQUE = 250
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# ==========================================
+# 1. REACCIONES
+# ==========================================
+class Reacciones:
+    # Versión numérica (y serializable para otros procesos) de los flujos
+    def __init__(self, modelo):
+        indice = {c: i for i, c in enumerate(modelo.compartimentos)}
+        self.nombre = modelo.nombre
+        self.compartimentos = modelo.compartimentos
+        self.parametros = modelo.parametros
+        self.parametro = np.array([modelo.parametros.index(f.parametro) for f in modelo.flujos])
+        self.factores = [tuple(indice[c] for c in f.factores) for f in modelo.flujos]
+
+        self.cambios = np.zeros((len(modelo.flujos), len(modelo.compartimentos)), dtype=np.int64)
+        for k, flujo in enumerate(modelo.flujos):
+            if flujo.origen is not None:
+                self.cambios[k, indice[flujo.origen]] -= 1
+            if flujo.destino is not None:
+                self.cambios[k, indice[flujo.destino]] += 1
+
+        # Flujos agrupados por compartimento de origen (-1 = exterior) para
+        # el tau-leaping: las salidas de un compartimento compiten entre sí
+        grupos = {}
+        for k, flujo in enumerate(modelo.flujos):
+            grupos.setdefault(indice.get(flujo.origen, -1), []).append(k)
+        self.grupos = [(origen, np.array(flujos)) for origen, flujos in grupos.items()]
+
+    def propensidades(self, X, valores):
+        # X: (m, compartimentos) -> (m, flujos)
+        a = np.empty((X.shape[0], len(self.factores)))
+        for k, factores in enumerate(self.factores):
+            columna = np.broadcast_to(valores[self.parametro[k]], (X.shape[0],)).astype(float)
+            for i in factores:
+                columna = columna * X[:, i]
+            a[:, k] = columna
+        return a
+
+
+# ==========================================
+# 2. MÉTODOS DE SIMULACIÓN
+# ==========================================
+def _gillespie(reacciones, x0, t, valores, m, rng):
+    X = np.tile(x0, (m, 1))
+    salida = np.empty((m, len(t), X.shape[1]), dtype=np.int64)
+    tiempo = np.full(m, t[0], dtype=float)
+    siguiente = np.zeros(m, dtype=np.int64)  # próximo punto de t por registrar
+    activos = np.arange(m)
+
+    while activos.size:
+        Xa = X[activos]
+        a = reacciones.propensidades(Xa, [v[activos] for v in valores])
+        a0 = a.sum(axis=1)
+        with np.errstate(divide='ignore'):
+            t_nuevo = tiempo[activos] + rng.exponential(size=activos.size) / a0
+
+        # Los puntos de t anteriores al próximo evento conservan el estado actual
+        hasta = np.searchsorted(t, t_nuevo)
+        cuentas = hasta - siguiente[activos]
+        if cuentas.any():
+            filas = np.repeat(activos, cuentas)
+            columnas = (np.arange(cuentas.sum()) - np.repeat(np.cumsum(cuentas) - cuentas, cuentas)
+                        + np.repeat(siguiente[activos], cuentas))
+            salida[filas, columnas] = np.repeat(Xa, cuentas, axis=0)
+
+        # Elegir qué reacción ocurre (solo donde queda alguna posible)
+        vivos = (a0 > 0) & (hasta < len(t))
+        u = rng.random(activos.size) * a0
+        k = np.minimum((np.cumsum(a, axis=1) < u[:, None]).sum(axis=1), a.shape[1] - 1)
+        X[activos[vivos]] += reacciones.cambios[k[vivos]]
+
+        tiempo[activos] = t_nuevo
+        siguiente[activos] = hasta
+        activos = activos[vivos]
+    return salida
+
+
+def _tau_leaping(reacciones, x0, t, valores, m, rng, tau):
+    X = np.tile(x0, (m, 1))
+    salida = np.empty((m, len(t), X.shape[1]), dtype=np.int64)
+    salida[:, 0] = X
+    eventos = np.empty((m, len(reacciones.factores)), dtype=np.int64)
+
+    for i in range(1, len(t)):
+        pasos = max(int(np.ceil((t[i] - t[i - 1]) / tau)), 1)
+        h = (t[i] - t[i - 1]) / pasos
+        for _ in range(pasos):
+            a = reacciones.propensidades(X, valores)
+            for origen, flujos in reacciones.grupos:
+                if origen < 0:
+                    eventos[:, flujos] = rng.poisson(a[:, flujos] * h)
+                    continue
+                # Tasa por persona de cada salida; el total que sale es
+                # binomial y se reparte entre las salidas en cadena
+                n = X[:, origen]
+                por_persona = a[:, flujos] / np.maximum(n, 1)[:, None]
+                restante_tasa = por_persona.sum(axis=1)
+                restante = rng.binomial(n, -np.expm1(-restante_tasa * h))
+                for j, k in enumerate(flujos[:-1]):
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        p = np.where(restante_tasa > 0, por_persona[:, j] / restante_tasa, 0.0)
+                    eventos[:, k] = rng.binomial(restante, np.clip(p, 0.0, 1.0))
+                    restante = restante - eventos[:, k]
+                    restante_tasa = restante_tasa - por_persona[:, j]
+                eventos[:, flujos[-1]] = restante
+            X += eventos @ reacciones.cambios
+        salida[:, i] = X
+    return salida
+
+
+def _simular_bloque(reacciones, x0, t, valores, m, metodo, tau, semilla):
+    rng = np.random.default_rng(semilla)
+    valores = [np.broadcast_to(np.asarray(v, dtype=float), (m,)) for v in valores]
+    if metodo == 'gillespie':
+        return _gillespie(reacciones, x0, t, valores, m, rng)
+    return _tau_leaping(reacciones, x0, t, valores, m, rng, tau)
+
+
+def simular(modelo, y0, t, realizaciones=1000, metodo='auto', semilla=None, trabajadores=None,
+            tau=None, **parametros):
+    # y0 en conteos enteros; t: puntos donde se registra el estado.
+    # Devuelve un Ensamble con trayectorias (realizaciones, len(t), compartimentos).
+    reacciones = Reacciones(modelo)
+    x0 = np.rint(np.asarray(y0, dtype=float)).astype(np.int64)
+    t = np.asarray(t, dtype=float)
+    valores = modelo.valores_parametros(parametros)
+    if metodo == 'auto':
+        metodo = 'gillespie' if x0.sum() <= UMBRAL_GILLESPIE else 'tau'
+    if metodo not in ('gillespie', 'tau'):
+        raise ValueError(f"Método estocástico desconocido: {metodo!r}")
+    if tau is None:
+        # Por defecto 4 subpasos por intervalo de salida
+        tau = float(np.min(np.diff(t))) / 4 if len(t) > 1 else 1.0
+
+    tamanos = [min(TAMANO_BLOQUE, realizaciones - inicio) for inicio in range(0, realizaciones, TAMANO_BLOQUE)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tareas = [(reacciones, x0, t, valores, m, metodo, tau, s) for m, s in zip(tamanos, semillas)]
+    bloques = mapear(_simular_bloque, tareas, trabajadores)
+    return Ensamble(modelo.compartimentos, t, np.concatenate(bloques), metodo)
+
+
+# ==========================================
+# 3. RESUMEN DEL ENSAMBLE
+# ==========================================
+class Ensamble:
+    def __init__(self, compartimentos, t, trayectorias, metodo):
+        self.compartimentos = tuple(compartimentos)
+        self.t = t
+        self.trayectorias = trayectorias
+        self.metodo = metodo
+
+    @property
+    def realizaciones(self):
+        return self.trayectorias.shape[0]
+
+    def serie(self, compartimento):
+        # (realizaciones, len(t))
+        return self.trayectorias[:, :, self.compartimentos.index(compartimento)]
+
+    def percentiles(self, compartimento, percentiles=PERCENTILES):
+        # {percentil: curva} sobre las realizaciones en cada instante
+        valores = np.percentile(self.serie(compartimento), percentiles, axis=0)
+        return dict(zip(percentiles, valores))
+
+    def probabilidad_extincion(self, infeccioso='I', susceptible='S', umbral=0.1):
+        # Fracción de realizaciones en que el brote se apaga solo: el
+        # compartimento infeccioso llega a cero habiendo alcanzado a menos de
+        # `umbral` de la población (brote menor)
+        I = self.serie(infeccioso)
+        S = self.serie(susceptible)
+        total = self.trayectorias[:, 0].sum(axis=1)
+        apagado = (I == 0).any(axis=1)
+        alcanzados = (S[:, 0] - S.min(axis=1)) / np.maximum(total, 1)
+        return float(np.mean(apagado & (alcanzados < umbral)))
@@ -0,0 +1,107 @@
+# ==========================================
+# EXPRESIONES MATEMÁTICAS SEGURAS
+# ==========================================
+# Las páginas reciben fórmulas escritas por el usuario (p. ej. "sin(x)*y").
+# En lugar de pasarlas a eval, se analizan con ast y solo se aceptan:
+#   - números, las variables indicadas y las constantes pi y e,
+#   - operadores aritméticos (+ - * / // % **) y signo,
+#   - llamadas a las funciones de FUNCIONES (también como np.<función>).
+# Cualquier otra cosa (atributos, índices, lambdas, nombres de Python...)
+# se rechaza con ValueError antes de ejecutar nada. El árbol validado se
+# compila una vez y se evalúa vectorizado sobre arreglos de NumPy.
+#
+# ^ se acepta como potencia y los enteros se evalúan como float, para que
+# algo como 9**9**9 falle al instante en lugar de calcular un entero
+# enorme. Los errores aritméticos de Python con escalares (desborde,
+# división por cero) se informan como ValueError, igual que una expresión
+# inválida.
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+FUNCIONES = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan, 'arctan2': np.arctan2,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'log10': np.log10, 'sqrt': np.sqrt,
+    'abs': np.abs, 'sign': np.sign, 'floor': np.floor, 'ceil': np.ceil,
+    'minimum': np.minimum, 'maximum': np.maximum, 'hypot': np.hypot,
+}
+CONSTANTES = {'pi': np.pi, 'e': np.e}
+OPERADORES = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+LONGITUD_MAXIMA = 500
+
+
+def _validar(nodo, variables):
+    if isinstance(nodo, ast.Expression):
+        return _validar(nodo.body, variables)
+    if isinstance(nodo, ast.Constant):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            raise ValueError(f"Valor no permitido: {nodo.value!r}")
+        return
+    if isinstance(nodo, ast.Name):
+        if nodo.id not in variables and nodo.id not in CONSTANTES:
+            raise ValueError(f"Nombre desconocido: {nodo.id}")
+        return
+    if isinstance(nodo, ast.BinOp) and isinstance(nodo.op, OPERADORES):
+        _validar(nodo.left, variables)
+        _validar(nodo.right, variables)
+        return
+    if isinstance(nodo, ast.UnaryOp) and isinstance(nodo.op, OPERADORES):
+        _validar(nodo.operand, variables)
+        return
+    if isinstance(nodo, ast.Call) and not nodo.keywords:
+        funcion = nodo.func
+        # np.sin(x) se acepta igual que sin(x)
+        if isinstance(funcion, ast.Attribute) and isinstance(funcion.value, ast.Name) and funcion.value.id == 'np':
+            nombre = funcion.attr
+        elif isinstance(funcion, ast.Name):
+            nombre = funcion.id
+        else:
+            raise ValueError("Llamada no permitida")
+        if nombre not in FUNCIONES:
+            raise ValueError(f"Función desconocida: {nombre}")
+        for argumento in nodo.args:
+            _validar(argumento, variables)
+        return
+    raise ValueError(f"Expresión no permitida: {type(nodo).__name__}")
+
+
+class _Normalizar(ast.NodeTransformer):
+    # np.sin -> sin (el espacio de evaluación no tiene np) y enteros -> float
+    def visit_Attribute(self, nodo):
+        return ast.copy_location(ast.Name(id=nodo.attr, ctx=ast.Load()), nodo)
+
+    def visit_Constant(self, nodo):
+        return ast.copy_location(ast.Constant(value=float(nodo.value)), nodo)
+
+
+@lru_cache(maxsize=256)
+def compilar(texto, variables=('x', 'y')):
+    # Devuelve f(*valores) que evalúa la expresión con los valores de
+    # `variables` en ese orden (escalares o arreglos)
+    texto = str(texto).strip()
+    if not texto:
+        raise ValueError("La expresión está vacía")
+    if len(texto) > LONGITUD_MAXIMA:
+        raise ValueError("La expresión es demasiado larga")
+    try:
+        arbol = ast.parse(texto.replace('^', '**'), mode='eval')
+    except SyntaxError as error:
+        raise ValueError(f"Error de sintaxis: {error.msg}") from None
+    _validar(arbol, variables)
+    arbol = ast.fix_missing_locations(_Normalizar().visit(arbol))
+    codigo = compile(arbol, '<expresión>', 'eval')
+    espacio = {'__builtins__': {}, **FUNCIONES, **CONSTANTES}
+
+    def evaluar(*valores):
+        try:
+            with np.errstate(all='ignore'):
+                resultado = eval(codigo, espacio, dict(zip(variables, valores)))
+        except ArithmeticError as error:
+            raise ValueError(f"Error aritmético: {error}") from None
+        # Una expresión constante se extiende a la forma de las variables
+        return np.broadcast_to(resultado, np.broadcast(*valores).shape).astype(float) if valores else resultado
+
+    return evaluar
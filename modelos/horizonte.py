@@ -0,0 +1,202 @@
+# ==========================================
+# EXTENSIÓN INCREMENTAL DEL HORIZONTE
+# ==========================================
+# Cada escenario (modelo, estado inicial, parámetros) guarda su solución en
+# una malla interna de paso fijo que solo crece: los estados en t0, t0 + h,
+# t0 + 2h, ... La malla pedida (p. ej. np.linspace(0, t_max,
+# 200), cuyos puntos se mueven todos al cambiar t_max) se evalúa con
+# interpolación cúbica de Hermite sobre la interna (las derivadas en los
+# nodos vecinos se evalúan al interpolar, con el lado derecho por lotes):
+#   - si la interna ya cubre t_max no se integra nada;
+#   - si no, odeint continúa desde el último estado guardado y agrega solo
+#     los pasos nuevos, hasta HOLGURA veces el horizonte pedido: pasado el
+#     pico la dinámica es lenta y odeint cubre ese tramo con pocos pasos,
+#     así que subir después "Días a simular" (p. ej. de 100 a 200) ya no
+#     integra nada.
+#
+# El paso es PASO_RELATIVO / escala, con la escala de tiempo más rápida del
+# escenario (norma del jacobiano en el estado inicial): el error de la
+# interpolación queda por debajo de ~1e-7 del tamaño de la solución, menor
+# que la tolerancia de odeint. Si el horizonte pidiera más de
+# PUNTOS_INTERNOS_MAXIMOS pasos, esa malla se integra directamente sin cache.
+#
+# Se usa odeint y no una solución densa de solve_ivp: con el lado derecho
+# generado, odeint resuelve la malla completa de una página en ~0.3 ms,
+# menos que lo que cuesta evaluar un interpolante denso de solve_ivp.
+#
+# Los modelos de contagio S -> I -> R (SIR, RUMOR) además se resuelven en
+# forma adimensional (resolver_normalizado): con N' = S0 + I0, s = S/N',
+# i = I/N' y tau = k t la trayectoria solo depende de R0 = b N' / k y de
+# i0 = I0 / N'. Todos los escenarios con el mismo (R0, i0), sea cual sea
+# la población o los recuperados iniciales, y de cualquier modelo con esos
+# mismos flujos (la clave es la estructura, no el nombre: SIR y RUMOR
+# comparten), usan una sola trayectoria en la cache y se reescalan al
+# evaluarla. Un acierto (200 puntos) cuesta ~0.1-0.2 ms frente a ~0.3-0.7 ms
+# de resolver con odeint, y subir "Días a simular" de 100 a 200 cuesta la
+# mitad que resolver las dos mallas por separado (benchmarks:
+# horizonte.resolver_normalizado). Con ATOL_NORMALIZADO el error frente a
+# una referencia de alta precisión es del orden del de odeint sobre el
+# escenario sin normalizar, incluso con N = 10^6.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy.integrate import odeint
+
+ESCENARIOS_EN_CACHE = 64
+FILAS_POR_BLOQUE = 65536
+# Paso interno en unidades de la escala de tiempo más rápida del escenario
+PASO_RELATIVO = 0.1
+# 40000 pasos de dos estados ocupan 640 KB por escenario
+PUNTOS_INTERNOS_MAXIMOS = 40_000
+HOLGURA = 2.0
+# En fracciones de la población: equivale a la tolerancia por defecto de
+# odeint (~1.5e-8 personas) con N' hasta 10^6
+ATOL_NORMALIZADO = 1e-14
+# R0 e i0 se redondean a estas cifras significativas para que el mismo
+# escenario calculado por caminos distintos (0.3/1000 o 0.6/2000) coincida
+CIFRAS_CLAVE = 12
+
+
+class Trayectoria:
+    def __init__(self, modelo, y0, parametros, **tolerancias):
+        self.modelo = modelo
+        self.estados0, self.total = modelo.reducir(y0)
+        self.valores = modelo.valores_parametros(parametros)
+        self.argumentos = modelo.argumentos(self.valores, self.total)
+        self.tolerancias = tolerancias
+        self.paso = self._paso()
+        self.estados = self.estados0[None].copy()
+        self.candado = threading.Lock()
+
+    def _paso(self):
+        # Escala de tiempo más rápida: norma (máxima suma por fila) del
+        # jacobiano en el estado inicial
+        jacobiano = self.modelo.jac(self.estados0, 0.0, *self.argumentos)
+        escala = np.abs(jacobiano).sum(axis=1).max()
+        return PASO_RELATIVO / escala if np.isfinite(escala) and escala > 0 else np.inf
+
+    def _derivadas(self, estados):
+        salida = np.empty((estados.shape[1], len(estados)))
+        return self.modelo.rhs_lote(0.0, estados.T.reshape(-1), *self.valores, self.total, salida).reshape(
+            estados.shape[1], -1).T
+
+    def _integrar(self, inicial, t):
+        return odeint(self.modelo.rhs, inicial, t, args=self.argumentos, Dfun=self.modelo.jac,
+                      **self.tolerancias)
+
+    def _extender(self, pasos):
+        # Continúa odeint desde el último estado hasta `pasos` pasos internos
+        actuales = len(self.estados)
+        t = np.arange(actuales - 1, pasos + 1) * self.paso
+        self.estados = np.concatenate([self.estados, self._integrar(self.estados[-1], t)[1:]])
+
+    def _interpolar(self, s):
+        # Hermite cúbico entre los pasos internos que rodean cada s
+        u = s / self.paso
+        i = np.clip(np.floor(u).astype(int), 0, len(self.estados) - 2)
+        x = (u - i)[:, None]
+        izquierda, derecha = self.estados[i], self.estados[i + 1]
+        h00, h10 = (1 + 2 * x) * (1 - x) ** 2, x * (1 - x) ** 2
+        h01, h11 = x ** 2 * (3 - 2 * x), x ** 2 * (x - 1)
+        return (h00 * izquierda + h10 * self.paso * self._derivadas(izquierda)
+                + h01 * derecha + h11 * self.paso * self._derivadas(derecha))
+
+    def resolver(self, t):
+        # (len(t), compartimentos) como Modelo.resolver, con y0 en t[0]; los
+        # modelos son autónomos, así que solo importa t - t[0]
+        s = t - t[0]
+        pasos = s[-1] / self.paso if len(s) > 1 else np.inf
+        if not np.isfinite(pasos) or pasos > PUNTOS_INTERNOS_MAXIMOS or np.any(np.diff(s) < 0):
+            # Sin escala de tiempo (jacobiano nulo), horizonte demasiado largo
+            # o malla no creciente: directo, sin cache
+            estados = self._integrar(self.estados0, t)
+        else:
+            pasos = max(int(np.ceil(pasos)), 1)
+            if pasos >= len(self.estados):
+                self._extender(max(pasos, min(int(pasos * HOLGURA), PUNTOS_INTERNOS_MAXIMOS)))
+            estados = self._interpolar(s)
+        return self.modelo.completar(estados, self.total)
+
+
+_trayectorias = OrderedDict()
+_candado = threading.Lock()
+
+
+def _trayectoria(clave, modelo, y0, parametros, **tolerancias):
+    # LRU de trayectorias por escenario
+    with _candado:
+        trayectoria = _trayectorias.pop(clave, None)
+        if trayectoria is None:
+            trayectoria = Trayectoria(modelo, y0, parametros, **tolerancias)
+        _trayectorias[clave] = trayectoria
+        while len(_trayectorias) > ESCENARIOS_EN_CACHE:
+            _trayectorias.popitem(last=False)
+    return trayectoria
+
+
+def resolver_incremental(modelo, y0, t, **parametros):
+    # Igual que modelo.resolver(y0, t, **parametros), reutilizando lo ya
+    # integrado para el mismo escenario
+    t = np.asarray(t, dtype=float)
+    clave = (modelo.nombre, tuple(np.asarray(y0, dtype=float).tolist()), modelo.valores_parametros(parametros))
+    trayectoria = _trayectoria(clave, modelo, y0, parametros)
+    with trayectoria.candado:
+        return trayectoria.resolver(t)
+
+
+def _redondear(x):
+    return float(f'{x:.{CIFRAS_CLAVE}g}')
+
+
+def _estructura(modelo):
+    # Clave de cache independiente del nombre del modelo
+    return (tuple(modelo.compartimentos),
+            tuple((f.origen, f.destino, f.parametro, f.factores) for f in modelo.flujos))
+
+
+def resolver_normalizado(modelo, y0, t, b, k):
+    # Igual que resolver_incremental(modelo, y0, t, b=b, k=k) para modelos
+    # con flujos S -> I (b S I) e I -> R (k I), vía la trayectoria
+    # adimensional compartida; sin escala posible (k o N' no positivos)
+    # se resuelve el escenario tal cual
+    t = np.asarray(t, dtype=float)
+    S0, I0, R_inicial = (float(v) for v in y0)
+    poblacion = S0 + I0
+    if k <= 0 or poblacion <= 0:
+        return resolver_incremental(modelo, y0, t, b=b, k=k)
+
+    R0, i0 = _redondear(b * poblacion / k), _redondear(I0 / poblacion)
+    parametros = {'b': R0, 'k': 1.0}
+    clave = (_estructura(modelo), 'normalizado', R0, i0)
+    trayectoria = _trayectoria(clave, modelo, (1 - i0, i0, 0.0), parametros, atol=ATOL_NORMALIZADO)
+    # El sistema es autónomo: la malla se mide desde su primer instante
+    tau = k * (t - t[0])
+    with trayectoria.candado:
+        fracciones = trayectoria.resolver(tau)
+    resultado = poblacion * fracciones
+    resultado[:, 2] += R_inicial
+    return resultado
+
+
+def resolver_en_bloques(modelo, y0, t_max, puntos, filas=FILAS_POR_BLOQUE, **parametros):
+    # Mismos valores que modelo.resolver sobre np.linspace(0, t_max, puntos),
+    # entregados de a `filas` puntos sin armar nunca la malla entera: cada
+    # bloque continúa odeint desde el último estado del anterior
+    estados, total = modelo.reducir(y0)
+    argumentos = modelo.argumentos(modelo.valores_parametros(parametros), total)
+    paso = t_max / (puntos - 1) if puntos > 1 else 0.0
+    anterior = None
+    for inicio in range(0, puntos, filas):
+        t = np.arange(inicio, min(inicio + filas, puntos)) * paso
+        malla = t if anterior is None else np.concatenate([[anterior], t])
+        tramo = odeint(modelo.rhs, estados, malla, args=argumentos, Dfun=modelo.jac)
+        if anterior is not None:
+            tramo = tramo[1:]
+        estados, anterior = tramo[-1], t[-1]
+        yield t, modelo.completar(tramo, total)
+
+
+def limpiar():
+    with _candado:
+        _trayectorias.clear()
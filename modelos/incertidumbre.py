@@ -0,0 +1,93 @@
+# ==========================================
+# PROPAGACIÓN DE INCERTIDUMBRE (HIPERCUBO LATINO)
+# ==========================================
+# Los parámetros inciertos se describen con distribuciones:
+#
+#     {'b': ('uniforme', 0.8 / N, 1.2 / N),
+#      'k': ('triangular', 0.33, 0.40, 0.50)}
+#
+# Se toman muestras por hipercubo latino (cada distribución se divide en
+# tantos estratos como muestras y cada estrato se usa una vez), que cubre
+# el espacio mucho mejor que el muestreo aleatorio simple con el mismo
+# número de simulaciones. Todas las muestras se resuelven juntas con
+# Modelo.resolver_lote y se resumen en percentiles por instante y en la
+# distribución del día y el tamaño del pico.
+import numpy as np
+from scipy import stats
+from scipy.stats import qmc
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# ==========================================
+# 1. DISTRIBUCIONES Y MUESTREO
+# ==========================================
+def _distribucion(especificacion):
+    tipo, *valores = especificacion
+    if tipo == 'uniforme':
+        bajo, alto = valores
+        return stats.uniform(loc=bajo, scale=alto - bajo)
+    if tipo == 'triangular':
+        bajo, moda, alto = valores
+        return stats.triang(c=(moda - bajo) / (alto - bajo), loc=bajo, scale=alto - bajo)
+    if tipo == 'normal':
+        media, desviacion = valores
+        return stats.norm(loc=media, scale=desviacion)
+    if tipo == 'lognormal':
+        # mediana y factor multiplicativo de una desviación (p. ej. 1.2 = ±20%)
+        mediana, factor = valores
+        return stats.lognorm(s=np.log(factor), scale=mediana)
+    raise ValueError(f"Distribución desconocida: {tipo!r}")
+
+
+def transformar(distribuciones, u):
+    # Lleva puntos del cubo unitario u (muestras, parámetros) a cada
+    # distribución, columna por columna en el orden de `distribuciones`
+    return {nombre: _distribucion(especificacion).ppf(u[:, j])
+            for j, (nombre, especificacion) in enumerate(distribuciones.items())}
+
+
+def hipercubo_latino(distribuciones, muestras, semilla=None):
+    # Devuelve {parámetro: arreglo (muestras,)}
+    u = qmc.LatinHypercube(d=len(distribuciones), seed=semilla).random(muestras)
+    return transformar(distribuciones, u)
+
+
+# ==========================================
+# 2. PROYECCIÓN POR LOTES
+# ==========================================
+class Proyeccion:
+    def __init__(self, compartimentos, t, soluciones, muestras):
+        self.compartimentos = tuple(compartimentos)
+        self.t = t
+        self.soluciones = soluciones      # (compartimentos, muestras, len(t))
+        self.muestras = muestras          # {parámetro: arreglo (muestras,)}
+
+    def serie(self, compartimento):
+        return self.soluciones[self.compartimentos.index(compartimento)]
+
+    def percentiles(self, compartimento, percentiles=PERCENTILES):
+        return dict(zip(percentiles, np.percentile(self.serie(compartimento), percentiles, axis=0)))
+
+    def picos(self, compartimento='I'):
+        # (día del pico, tamaño del pico) de cada muestra
+        serie = self.serie(compartimento)
+        indices = serie.argmax(axis=1)
+        return self.t[indices], serie[np.arange(serie.shape[0]), indices]
+
+    def valor_en(self, compartimento, dia):
+        # Interpola cada muestra en un día dado
+        serie = self.serie(compartimento)
+        j = np.clip(np.searchsorted(self.t, dia), 1, len(self.t) - 1)
+        peso = (dia - self.t[j - 1]) / (self.t[j] - self.t[j - 1])
+        return serie[:, j - 1] * (1 - peso) + serie[:, j] * peso
+
+
+def proyectar(modelo, y0, t, distribuciones, muestras=2000, fijos=None, semilla=None, **opciones):
+    # Los parámetros que no están en `distribuciones` se toman de `fijos`.
+    # y0 puede ser un estado (compartimentos,) común a todas las muestras.
+    valores = hipercubo_latino(distribuciones, muestras, semilla)
+    parametros = dict(fijos or {}, **valores)
+    y0 = np.broadcast_to(np.asarray(y0, dtype=float), (muestras, len(modelo.compartimentos)))
+    soluciones = modelo.resolver_lote(y0, t, **opciones, **parametros)
+    return Proyeccion(modelo.compartimentos, np.asarray(t, dtype=float), soluciones, valores)
@@ -0,0 +1,44 @@
+# ==========================================
+# CRECIMIENTO LOGÍSTICO (SOLUCIÓN CERRADA ESTABLE)
+# ==========================================
+# dP/dt = r P (1 - P/K) tiene solución
+#
+#     P(t) = K / (1 + A e^{-rt}),   A = (K - P0) / P0
+#
+# escrita aquí como K P0 / (P0 + (K - P0) e^{-rt}). Con r t >= 0 la
+# exponencial está en (0, 1] y nada se desborda aunque r t sea enorme
+# (P tiende a K). Con r t < 0 se usa la forma equivalente multiplicada por
+# e^{rt}, K P0 e^{rt} / (P0 e^{rt} + K - P0), que también queda acotada.
+# El denominador solo cambia de signo en una explosión en tiempo finito
+# (p. ej. r < 0 con P0 > K); desde ahí la solución no existe y se marca
+# con NaN.
+#
+# P0, r y K pueden ser arreglos: se combinan por broadcasting y cada
+# combinación es una curva, así que una familia de cientos de curvas sale
+# de una sola evaluación vectorizada.
+import numpy as np
+
+
+def logistica(t, P0, r, K):
+    # Devuelve un arreglo de forma broadcast(P0, r, K).shape + (len(t),)
+    t = np.asarray(t, dtype=float)
+    P0, r, K = (np.asarray(v, dtype=float)[..., None] for v in (P0, r, K))
+    rt = r * t
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        e = np.exp(-np.abs(rt))
+        crece = rt >= 0
+        numerador = np.where(crece, K * P0, K * P0 * e)
+        denominador = np.where(crece, P0 + (K - P0) * e, P0 * e + (K - P0))
+        P = np.where(denominador * P0 > 0, numerador / denominador, np.nan)
+    # P0 = 0 es un equilibrio
+    return np.where(P0 == 0, 0.0, P)
+
+
+def familia_logistica(t, P0, r, K):
+    # Familia de curvas aplanada en un solo trazo: (x, y) con NaN entre
+    # curvas, para dibujar cientos de trayectorias sin un trazo por curva
+    P = logistica(t, P0, r, K).reshape(-1, len(t))
+    separador = np.full((P.shape[0], 1), np.nan)
+    x = np.hstack([np.broadcast_to(t, P.shape), separador]).ravel()
+    y = np.hstack([P, separador]).ravel()
+    return x, y
@@ -0,0 +1,62 @@
+# ==========================================
+# EJECUCIÓN EN VARIOS PROCESOS
+# ==========================================
+# Pool de procesos compartido por los módulos que reparten bloques de
+# trabajo independientes (ensambles estocásticos, índices de Sobol). Se
+# crea la primera vez que se pide más de un trabajador y se reutiliza en
+# las llamadas siguientes. El número por defecto sale de la variable de
+# entorno MODELOS_TRABAJADORES (1 = todo en el proceso actual).
+#
+# Varios hilos (callbacks, trabajos) pueden llamar a la vez. Si uno pide
+# más trabajadores se crea un pool nuevo para las llamadas siguientes; el
+# anterior no se cierra mientras tenga llamadas en curso, sino cuando
+# termina la última (cerrarlo antes rompería sus envíos pendientes).
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+TRABAJADORES = int(os.environ.get('MODELOS_TRABAJADORES', '1'))
+
+_candado = threading.Lock()
+_pool = None
+_trabajadores_pool = 0
+_en_uso = {}  # pool -> llamadas en curso
+
+
+def _tomar(trabajadores):
+    # Un solo pool vigente por proceso; se reemplaza si se piden más
+    # trabajadores
+    global _pool, _trabajadores_pool
+    with _candado:
+        if _pool is None or _trabajadores_pool < trabajadores:
+            anterior = _pool
+            _pool = ProcessPoolExecutor(max_workers=trabajadores)
+            _trabajadores_pool = trabajadores
+            if anterior is not None and anterior not in _en_uso:
+                anterior.shutdown(wait=False)
+        _en_uso[_pool] = _en_uso.get(_pool, 0) + 1
+        return _pool
+
+
+def _soltar(pool):
+    with _candado:
+        _en_uso[pool] -= 1
+        if _en_uso[pool] == 0:
+            del _en_uso[pool]
+            # Un pool reemplazado se cierra al terminar su última llamada
+            if pool is not _pool:
+                pool.shutdown(wait=False)
+
+
+def mapear(funcion, tareas, trabajadores=None):
+    # [funcion(*tarea) for tarea in tareas], en paralelo si corresponde.
+    # `funcion` y los argumentos deben poder serializarse (funciones de
+    # módulo, arreglos, objetos simples).
+    trabajadores = TRABAJADORES if trabajadores is None else trabajadores
+    if trabajadores > 1 and len(tareas) > 1:
+        pool = _tomar(trabajadores)
+        try:
+            return list(pool.map(funcion, *zip(*tareas)))
+        finally:
+            _soltar(pool)
+    return [funcion(*tarea) for tarea in tareas]
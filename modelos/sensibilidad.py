@@ -0,0 +1,128 @@
+# ==========================================
+# ANÁLISIS DE SENSIBILIDAD GLOBAL (ÍNDICES DE SOBOL)
+# ==========================================
+# Para una salida escalar Y = f(X1, ..., Xd) con parámetros inciertos:
+#   - índice de primer orden S_i: fracción de Var(Y) explicada por X_i solo,
+#   - índice total ST_i: fracción en la que participa X_i (incluye sus
+#     interacciones con los demás).
+# Un parámetro con ST_i pequeño puede fijarse sin perder nada; el de S_i
+# grande es donde conviene actuar.
+#
+# Diseño de Saltelli: de una secuencia cuasi-aleatoria de Sobol en 2d
+# dimensiones salen dos matrices A y B (n x d) y, para cada parámetro, la
+# matriz AB_i = A con la columna i de B. En total n (d + 2) evaluaciones,
+# que se hacen por lotes (todas las filas de un bloque en una sola
+# integración) y, opcionalmente, repartidas entre procesos.
+#
+# Estimadores de Saltelli (2010) para S_i y de Jansen para ST_i, con
+# intervalos por bootstrap sobre las n filas.
+from functools import partial
+
+import numpy as np
+from scipy.stats import qmc
+
+from modelos import SIR
+from modelos.incertidumbre import transformar
+from modelos.paralelo import mapear
+
+TAMANO_BLOQUE = 4096
+REMUESTREOS = 200
+
+
+# ==========================================
+# 1. SALIDAS DE LOS MODELOS SIR
+# ==========================================
+def salidas_sir(muestras, t_max, fijos, modelo=SIR, puntos=401):
+    # Evalúa un modelo tipo SIR para muchas combinaciones de parámetros.
+    # muestras/fijos pueden incluir b, k (tasas), N, I0 y R0 (condiciones
+    # iniciales); lo que no esté en `muestras` se toma de `fijos`.
+    # Devuelve {salida: arreglo (m,)}.
+    valores = dict(fijos, **muestras)
+    m = len(next(iter(muestras.values())))
+    N = np.broadcast_to(valores['N'], (m,))
+    I0 = np.broadcast_to(valores['I0'], (m,))
+    R0 = np.broadcast_to(valores.get('R0', 0.0), (m,))
+    y0 = np.column_stack([N - I0 - R0, I0, R0])
+    t = np.linspace(0, t_max, puntos)
+    S, I, R = modelo.resolver_lote(y0, t, b=valores['b'], k=valores['k'])
+    indices = I.argmax(axis=1)
+    return {
+        'pico': I[np.arange(m), indices],
+        'dia_pico': t[indices],
+        # Personas alcanzadas durante el horizonte (contagiados, usuarios o
+        # personas que oyeron el rumor)
+        'tamano_final': S[:, 0] - S[:, -1],
+    }
+
+
+# ==========================================
+# 2. DISEÑO DE SALTELLI Y ESTIMADORES
+# ==========================================
+def diseno_saltelli(d, n, semilla=None):
+    # Devuelve (A, B, AB) en el cubo unitario; AB tiene forma (d, n, d)
+    base = qmc.Sobol(d=2 * d, scramble=True, seed=semilla).random(n)
+    A, B = base[:, :d], base[:, d:]
+    AB = np.repeat(A[None], d, axis=0)
+    for i in range(d):
+        AB[i, :, i] = B[:, i]
+    return A, B, AB
+
+
+def _evaluar_bloque(evaluar, distribuciones, u):
+    return evaluar(transformar(distribuciones, u))
+
+
+def _estimar(fA, fB, fAB):
+    # fA, fB: (n,); fAB: (d, n). Devuelve (S, ST) de forma (d,)
+    varianza = np.var(np.concatenate([fA, fB]))
+    if varianza == 0:
+        return np.zeros(len(fAB)), np.zeros(len(fAB))
+    primer_orden = np.mean(fB * (fAB - fA), axis=1) / varianza
+    total = 0.5 * np.mean((fA - fAB) ** 2, axis=1) / varianza
+    return primer_orden, total
+
+
+class IndicesSobol:
+    def __init__(self, parametros, salidas, primer_orden, total, intervalos_primer_orden, intervalos_total, evaluaciones):
+        self.parametros = parametros                      # nombres en el orden de las columnas
+        self.salidas = salidas                            # nombres de las salidas
+        self.primer_orden = primer_orden                  # {salida: (d,)}
+        self.total = total                                # {salida: (d,)}
+        self.intervalos_primer_orden = intervalos_primer_orden  # {salida: (2, d)} percentiles 2.5-97.5
+        self.intervalos_total = intervalos_total
+        self.evaluaciones = evaluaciones
+
+
+def indices_sobol(evaluar, distribuciones, n=1024, semilla=None, trabajadores=None):
+    # evaluar: función de módulo (o partial) {parámetro: (m,)} -> {salida: (m,)}
+    # distribuciones: {parámetro: especificación de modelos.incertidumbre}
+    # n: filas base (potencia de 2 para el diseño de Sobol)
+    nombres = list(distribuciones)
+    d = len(nombres)
+    A, B, AB = diseno_saltelli(d, n, semilla)
+    puntos = np.concatenate([A, B, AB.reshape(-1, d)])
+
+    # Evaluación por bloques (y por procesos si trabajadores > 1)
+    tareas = [(evaluar, distribuciones, puntos[i:i + TAMANO_BLOQUE])
+              for i in range(0, len(puntos), TAMANO_BLOQUE)]
+    bloques = mapear(_evaluar_bloque, tareas, trabajadores)
+    salidas = list(bloques[0])
+    resultados = {s: np.concatenate([b[s] for b in bloques]) for s in salidas}
+
+    rng = np.random.default_rng(semilla)
+    remuestras = rng.integers(0, n, (REMUESTREOS, n))
+    primer_orden, total, ic_primer, ic_total = {}, {}, {}, {}
+    for s, valores in resultados.items():
+        fA, fB, fAB = valores[:n], valores[n:2 * n], valores[2 * n:].reshape(d, n)
+        primer_orden[s], total[s] = _estimar(fA, fB, fAB)
+        # Bootstrap: se remuestrean las mismas filas en A, B y AB_i
+        remuestreados = [_estimar(fA[r], fB[r], fAB[:, r]) for r in remuestras]
+        ic_primer[s] = np.percentile([p for p, _ in remuestreados], [2.5, 97.5], axis=0)
+        ic_total[s] = np.percentile([t for _, t in remuestreados], [2.5, 97.5], axis=0)
+    return IndicesSobol(nombres, salidas, primer_orden, total, ic_primer, ic_total, len(puntos))
+
+
+def sobol_sir(distribuciones, fijos, t_max, n=1024, modelo=SIR, semilla=None, trabajadores=None):
+    # Atajo para los modelos tipo SIR de las páginas
+    evaluar = partial(salidas_sir, t_max=t_max, fijos=fijos, modelo=modelo)
+    return indices_sobol(evaluar, distribuciones, n, semilla, trabajadores)
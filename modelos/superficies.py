@@ -0,0 +1,85 @@
+# ==========================================
+# SUPERFICIES z = f(x, y) CON NIVELES DE DETALLE
+# ==========================================
+# El dominio se cubre con una pirámide de mallas: el nivel k tiene
+# NIVELES[k] puntos por eje (de 125 hasta 2000). Cada nivel se divide en
+# teselas de TESELA x TESELA celdas que se evalúan bajo demanda y quedan en
+# caché, así que volver a una zona ya vista no recalcula nada.
+#
+# Para una vista (rango x, rango y) se elige el nivel más grueso que ponga
+# al menos PUNTOS_VISTA puntos a lo ancho de la vista y se arma la parte
+# visible con las teselas que la cubren. Lo enviado al navegador queda
+# entre PUNTOS_VISTA y 2*PUNTOS_VISTA puntos por eje sin importar el zoom,
+# con una resolución efectiva de hasta 2000 x 2000 sobre todo el dominio.
+from functools import lru_cache
+
+import numpy as np
+
+from modelos.expresiones import compilar
+
+NIVELES = (125, 250, 500, 1000, 2000)
+TESELA = 125
+PUNTOS_VISTA = 120
+
+
+def coordenadas(minimo, maximo, nivel):
+    return np.linspace(minimo, maximo, NIVELES[nivel])
+
+
+@lru_cache(maxsize=256)
+def tesela(texto, dominio, nivel, i, j):
+    # Bloque (i, j) del nivel: filas y, columnas x; comparte el borde con
+    # las teselas vecinas para que la superficie armada no tenga huecos
+    x = coordenadas(dominio[0], dominio[1], nivel)[i * TESELA:(i + 1) * TESELA + 1]
+    y = coordenadas(dominio[2], dominio[3], nivel)[j * TESELA:(j + 1) * TESELA + 1]
+    X, Y = np.meshgrid(x, y)
+    Z = compilar(texto)(X, Y)
+    Z = np.where(np.isfinite(Z), Z, np.nan)
+    Z.flags.writeable = False
+    return Z
+
+
+def elegir_nivel(dominio, rango_x, rango_y):
+    # Nivel más grueso con PUNTOS_VISTA puntos en el eje más estrecho de la vista
+    fraccion = min((rango_x[1] - rango_x[0]) / (dominio[1] - dominio[0]),
+                   (rango_y[1] - rango_y[0]) / (dominio[3] - dominio[2]))
+    for nivel, puntos in enumerate(NIVELES):
+        if fraccion * puntos >= PUNTOS_VISTA:
+            return nivel
+    return len(NIVELES) - 1
+
+
+def _indices(minimo, maximo, rango, nivel):
+    # Índices [inicio, fin] del nivel que cubren el rango (recortado al dominio)
+    n = NIVELES[nivel]
+    h = (maximo - minimo) / (n - 1)
+    inicio = int(np.clip(np.floor((rango[0] - minimo) / h), 0, n - 2))
+    fin = int(np.clip(np.ceil((rango[1] - minimo) / h), inicio + 1, n - 1))
+    return inicio, fin
+
+
+def vista(texto, dominio, rango_x=None, rango_y=None, nivel=None):
+    # Devuelve (x, y, Z, nivel) de la parte visible; sin rangos, todo el
+    # dominio. dominio = (x_min, x_max, y_min, y_max)
+    dominio = tuple(float(v) for v in dominio)
+    rango_x = rango_x or dominio[:2]
+    rango_y = rango_y or dominio[2:]
+    if nivel is None:
+        nivel = elegir_nivel(dominio, rango_x, rango_y)
+    ix0, ix1 = _indices(dominio[0], dominio[1], rango_x, nivel)
+    iy0, iy1 = _indices(dominio[2], dominio[3], rango_y, nivel)
+
+    Z = np.empty((iy1 - iy0 + 1, ix1 - ix0 + 1))
+    # La tesela k cubre los índices [k*TESELA, (k+1)*TESELA]
+    for j in range(iy0 // TESELA, (iy1 - 1) // TESELA + 1):
+        for i in range(ix0 // TESELA, (ix1 - 1) // TESELA + 1):
+            bloque = tesela(texto, dominio, nivel, i, j)
+            # Intersección de la tesela con la vista, en índices globales
+            x0, y0 = max(ix0, i * TESELA), max(iy0, j * TESELA)
+            x1 = min(ix1, i * TESELA + bloque.shape[1] - 1)
+            y1 = min(iy1, j * TESELA + bloque.shape[0] - 1)
+            Z[y0 - iy0:y1 - iy0 + 1, x0 - ix0:x1 - ix0 + 1] = \
+                bloque[y0 - j * TESELA:y1 - j * TESELA + 1, x0 - i * TESELA:x1 - i * TESELA + 1]
+    x = coordenadas(dominio[0], dominio[1], nivel)[ix0:ix1 + 1]
+    y = coordenadas(dominio[2], dominio[3], nivel)[iy0:iy1 + 1]
+    return x, y, Z, nivel
@@ -0,0 +1,232 @@
+# ==========================================
+# SUSTITUTO TABULADO DEL MODELO SIR
+# ==========================================
+# Con s = S/N', i = I/N' (N' = S0 + I0) y tau = k t, el modelo
+# dS/dt = -b S I, dI/dt = b S I - k I queda
+#
+#     ds/dtau = -R0 s i,   di/dtau = R0 s i - i,   R0 = b N' / k
+#
+# y la curva solo depende de (R0, i0). La tabla guarda s(tau) e i(tau) en
+# una malla logarítmica de (R0, i0) y de tau; cualquier escenario se
+# aproxima interpolando entre los cuatro nodos vecinos y reescalando, en
+# microsegundos y sin integrar. Los recuperados iniciales no cambian la
+# dinámica de s e i: solo se suman a R.
+#
+# Mezclar directamente curvas vecinas deja dos picos a medias cuando el
+# día del pico cambia entre nodos. Por eso cada nodo tiene un tiempo
+# característico tau_c (cuando la caída de s llega a la mitad de su valor
+# en TAU_MAXIMO: cerca del pico, y continuo aunque no haya pico) y su curva
+# se guarda en el tiempo relativo u = tau / tau_c. En u todos los picos
+# caen en el mismo lugar y tienen la misma resolución, sea R0 = 1.5 (pico
+# ancho) o R0 = 400 (pico de horas). Una consulta interpola tau_c
+# (log-bilineal), pasa su tau a u y mezcla las cuatro curvas vecinas.
+#
+# La tabla se construye fuera de línea y se guarda como .npz junto con su
+# error de validación (en fracción de N'):
+#
+#   python -m modelos.sustituto                 # construye y valida
+#   python -m modelos.sustituto --salida x.npz
+#
+# El .npz no se versiona: si falta, la primera consulta lanza su
+# construcción en un hilo (unos segundos) y la guarda en RUTA con un
+# reemplazo atómico. Mientras tanto aproximar_sir devuelve None y las
+# páginas muestran directamente la solución exacta. La tabla se relee
+# cuando el archivo aparece o cambia, sin reiniciar el servidor.
+# SUSTITUTO_AUTOMATICO=0 desactiva la construcción automática.
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from modelos import SIR
+
+RUTA = os.environ.get('SUSTITUTO_RUTA', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sustituto_sir.npz'))
+RANGO_R0 = (0.2, 500.0)
+RANGO_I0 = (1e-5, 0.5)
+PUNTOS_R0 = 64
+PUNTOS_I0 = 32
+PUNTOS_U = 256
+TAU_MAXIMO = 60.0
+U_EPIDEMIA = 4.0
+MUESTRAS_VALIDACION = 400
+AUTOMATICO = os.environ.get('SUSTITUTO_AUTOMATICO', '1') != '0'
+
+logger = logging.getLogger(__name__)
+_candado = threading.Lock()
+_lanzadas = set()
+
+
+# ==========================================
+# 1. CONSTRUCCIÓN Y VALIDACIÓN
+# ==========================================
+def malla_u(u_maximo, puntos=PUNTOS_U):
+    # Dos tercios de los puntos, uniformes, en la epidemia (u <= U_EPIDEMIA);
+    # el resto, geométricos, en la cola casi constante hasta u_maximo
+    densos = 2 * puntos // 3
+    return np.concatenate([np.linspace(0, U_EPIDEMIA, densos, endpoint=False),
+                           np.geomspace(U_EPIDEMIA, max(u_maximo, 2 * U_EPIDEMIA), puntos - densos)])
+
+
+def tiempo_caracteristico(R0, i0):
+    tau = np.concatenate([[0.0], np.geomspace(1e-5, TAU_MAXIMO, 4000)])
+    s = curva_normalizada(R0, i0, tau)[:, 0]
+    # La caída de s es creciente salvo ruido numérico en la meseta
+    caida = np.maximum.accumulate(s[0] - s)
+    return np.interp(0.5 * caida[-1], caida, tau)
+
+
+def curva_normalizada(R0, i0, tau):
+    # (len(tau), 2) con s e i
+    return SIR.resolver([1 - i0, i0, 0.0], tau, b=R0, k=1.0)[:, :2]
+
+
+def construir(puntos_r0=PUNTOS_R0, puntos_i0=PUNTOS_I0, puntos_u=PUNTOS_U):
+    r0 = np.geomspace(*RANGO_R0, puntos_r0)
+    i0 = np.geomspace(*RANGO_I0, puntos_i0)
+    caracteristicos = np.array([[tiempo_caracteristico(R0, fraccion) for fraccion in i0] for R0 in r0])
+    # La malla u cubre tau hasta TAU_MAXIMO aun para el tau_c más corto
+    u = malla_u(TAU_MAXIMO / caracteristicos.min(), puntos_u)
+    curvas = np.empty((puntos_r0, puntos_i0, puntos_u, 2), dtype=np.float32)
+    for a, R0 in enumerate(r0):
+        for c, fraccion in enumerate(i0):
+            curvas[a, c] = curva_normalizada(R0, fraccion, u * caracteristicos[a, c])
+    return {'r0': r0, 'i0': i0, 'u': u, 'curvas': curvas, 'caracteristicos': caracteristicos}
+
+
+def validar(tabla, muestras=MUESTRAS_VALIDACION, semilla=0):
+    # Error máximo |s - s_exacta|, |i - i_exacta| de cada muestra aleatoria
+    # (fuera de los nodos) sobre tau en [0, TAU_MAXIMO]
+    rng = np.random.default_rng(semilla)
+    r0 = np.exp(rng.uniform(*np.log(RANGO_R0), muestras))
+    i0 = np.exp(rng.uniform(*np.log(RANGO_I0), muestras))
+    tau = np.sort(np.concatenate([np.linspace(0, TAU_MAXIMO, 400), np.geomspace(1e-3, 1, 200)]))
+    errores = np.array([np.abs(_interpolar(tabla, R0, fraccion, tau) - curva_normalizada(R0, fraccion, tau)).max()
+                        for R0, fraccion in zip(r0, i0)])
+    return {'error_medio': errores.mean(), 'error_p95': np.percentile(errores, 95), 'error_max': errores.max()}
+
+
+def guardar(tabla, errores, ruta=RUTA):
+    np.savez_compressed(ruta, **tabla, **errores)
+
+
+def _construir_y_guardar(ruta):
+    inicio = time.perf_counter()
+    try:
+        tabla = construir()
+        errores = validar(tabla)
+        # Se escribe aparte y se reemplaza: un lector nunca ve un .npz a
+        # medias (y varios procesos que construyan a la vez no se pisan)
+        temporal = f"{os.path.splitext(ruta)[0]}.{os.getpid()}.tmp.npz"
+        guardar(tabla, errores, temporal)
+        os.replace(temporal, ruta)
+    except Exception:
+        logger.exception("No se pudo construir la tabla sustituta en %s", ruta)
+        return
+    logger.info("Tabla sustituta construida en %.1f s (%s)", time.perf_counter() - inicio, ruta)
+
+
+def construir_en_segundo_plano(ruta=RUTA):
+    # Una sola construcción por ruta y proceso; si falla no se reintenta
+    # en cada consulta (queda en el registro)
+    with _candado:
+        if ruta in _lanzadas:
+            return
+        _lanzadas.add(ruta)
+    threading.Thread(target=_construir_y_guardar, args=(ruta,), name='sustituto', daemon=True).start()
+
+
+# ==========================================
+# 2. CONSULTA
+# ==========================================
+@lru_cache(maxsize=1)
+def _leer(ruta, modificado):
+    # modificado (fecha del archivo) solo forma parte de la clave del caché
+    with np.load(ruta) as datos:
+        return {clave: datos[clave] for clave in datos.files}
+
+
+def cargar(ruta=RUTA, automatico=AUTOMATICO):
+    # La ausencia no se guarda en caché: una tabla construida con el
+    # servidor en marcha se usa en la consulta siguiente
+    try:
+        modificado = os.stat(ruta).st_mtime_ns
+    except OSError:
+        if automatico:
+            construir_en_segundo_plano(ruta)
+        return None
+    return _leer(ruta, modificado)
+
+
+def _posicion(valores, x):
+    # Índice de celda y peso en una malla geométrica
+    u = (np.log(x) - np.log(valores[0])) / (np.log(valores[-1]) - np.log(valores[0])) * (len(valores) - 1)
+    j = int(np.clip(np.floor(u), 0, len(valores) - 2))
+    return j, u - j
+
+
+def _interpolar(tabla, R0, i0, tau):
+    a, wa = _posicion(tabla['r0'], R0)
+    c, wc = _posicion(tabla['i0'], i0)
+    vecinos = [(a, c, (1 - wa) * (1 - wc)), (a + 1, c, wa * (1 - wc)),
+               (a, c + 1, (1 - wa) * wc), (a + 1, c + 1, wa * wc)]
+    tau_c = np.exp(sum(peso * np.log(tabla['caracteristicos'][x, y]) for x, y, peso in vecinos))
+    u = np.asarray(tau) / tau_c
+    resultado = np.zeros((len(u), 2))
+    for x, y, peso in vecinos:
+        curva = tabla['curvas'][x, y]
+        resultado[:, 0] += peso * np.interp(u, tabla['u'], curva[:, 0])
+        resultado[:, 1] += peso * np.interp(u, tabla['u'], curva[:, 1])
+    return resultado
+
+
+def aproximar_sir(y0, t, b, k, tabla=None):
+    # Aproximación de modelo.resolver(y0, t, b=b, k=k) para SIR o RUMOR
+    # (mismas ecuaciones); None si no hay tabla o el escenario queda fuera
+    tabla = cargar() if tabla is None else tabla
+    S0, I0, R_inicial = (float(v) for v in y0)
+    poblacion = S0 + I0
+    if tabla is None or k <= 0 or b <= 0 or poblacion <= 0:
+        return None
+    R0, i0 = b * poblacion / k, I0 / poblacion
+    tau = k * np.asarray(t, dtype=float)
+    if not (RANGO_R0[0] <= R0 <= RANGO_R0[1] and RANGO_I0[0] <= i0 <= RANGO_I0[1]) or tau[-1] > TAU_MAXIMO:
+        return None
+    s, i = _interpolar(tabla, R0, i0, tau).T
+    return np.column_stack([poblacion * s, poblacion * i, R_inicial + poblacion * (1 - s - i)])
+
+
+def error_tabla(tabla=None):
+    # Error de validación guardado con la tabla (fracción de N'), o None
+    tabla = cargar() if tabla is None else tabla
+    return None if tabla is None else float(tabla['error_p95'])
+
+
+# ==========================================
+# 3. LÍNEA DE COMANDOS
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construye la tabla sustituta del modelo SIR")
+    parser.add_argument('--salida', default=RUTA, help="ruta del .npz")
+    parser.add_argument('--puntos-r0', type=int, default=PUNTOS_R0)
+    parser.add_argument('--puntos-i0', type=int, default=PUNTOS_I0)
+    parser.add_argument('--puntos-u', type=int, default=PUNTOS_U)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    tabla = construir(args.puntos_r0, args.puntos_i0, args.puntos_u)
+    print(f"Tabla {tabla['curvas'].shape} construida en {time.perf_counter() - inicio:.1f} s")
+    errores = validar(tabla)
+    print("Error de validación (fracción de la población): "
+          f"medio {errores['error_medio']:.2e}, p95 {errores['error_p95']:.2e}, máximo {errores['error_max']:.2e}")
+    guardar(tabla, errores, args.salida)
+    print(f"Guardada en {args.salida} ({os.path.getsize(args.salida) / 1e6:.2f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,17 @@
 import dash 
-from dash import html, dcc
+from functools import lru_cache
+from dash import html, dcc, Input, Output, State, callback
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
-from scipy.integrate import odeint
+
+from modelos import SIR
+from modelos.estocastico import simular
+from modelos.incertidumbre import proyectar
+from modelos.sensibilidad import sobol_sir
+from modelos import redes
+from servidor.metricas import fase
+from servidor.vuelo_unico import vuelo_unico
 
 dash.register_page(__name__, path="/Proyecto/Proyecto", name="Proyecto Modelo SIR")
 
@@ -24,18 +33,8 @@ COLOR_RECUPERADOS = '#9400D3'  # Violeta oscuro
 # ==========================================
 # 2. MODELO MATEMÁTICO
 # ==========================================
-def modelo_sir(y, t, b, g):
-    S, I, R = y 
-    # Protección contra valores negativos numéricos
-    S = max(0, S)
-    I = max(0, I)
-    
-    # Ecuaciones: dS/dt = -beta*S*I
-    # Nota: Aquí beta ya incluye el factor 1/N si se definió así en los parámetros
-    dS_dt = -b * S * I
-    dI_dt = b * S * I - g * I
-    dR_dt = g * I
-    return [dS_dt, dI_dt, dR_dt]
+# Ecuaciones: dS/dt = -beta*S*I (modelos.SIR con b = beta, k = gamma)
+# Nota: Aquí beta ya incluye el factor 1/N si se definió así en los parámetros
 
 # --- PARAMETROS DEL PROYECTO ---
 N_total = 7138.0             # Población de la facultad
@@ -48,13 +47,13 @@ y0 = [S0, I0, R0_inicial]
 
 # --- SIMULACIÓN ---
 t = np.linspace(0, 40, 400) 
-solucion = odeint(modelo_sir, y0, t, args=(beta, gamma))
+solucion = SIR.resolver(y0, t, b=beta, k=gamma)
 S, I, R = solucion.T
 
 # --- ANÁLISIS DE RESULTADOS ---
 # 1. Valor al día 6
 t_6 = np.linspace(0, 6, 100)
-sol_6 = odeint(modelo_sir, y0, t_6, args=(beta, gamma))
+sol_6 = SIR.resolver(y0, t_6, b=beta, k=gamma)
 I_6 = sol_6.T[1][-1]
 
 # 2. Pico de infección
@@ -67,6 +66,71 @@ max_infectados = I[idx_pico]
 # entonces beta_code * N = beta_std.
 R0_calc = (beta * N_total) / gamma
 
+# 4. Versión estocástica: con un solo paciente cero el brote puede
+# extinguirse antes de despegar (probabilidad teórica ~ 1/R0).
+# Con @vuelo_unico, si toda la clase pide lo mismo a la vez se calcula una vez
+@vuelo_unico
+def simular_proyecto_estocastico(realizaciones, semilla=0):
+    t_est = np.linspace(0, 40, 161)
+    return simular(SIR, y0, t_est, realizaciones=realizaciones, semilla=semilla, b=beta, k=gamma)
+
+# 5. Versión en red: cada estudiante solo contagia a sus contactos. La tasa
+# por contacto se elige para que beta*N contactos efectivos por día se
+# repartan entre los vecinos (mismo "beta" que el modelo homogéneo).
+SECCIONES_POR_ESTUDIANTE = 5
+
+@lru_cache(maxsize=8)
+def construir_red(tipo, grado_medio, semilla=0):
+    n = int(N_total)
+    if tipo == 'potencia':
+        return redes.red_configuracion(n, grado_medio, 'potencia', semilla=semilla)
+    if tipo == 'mundo_pequeno':
+        return redes.red_mundo_pequeno(n, grado_medio, 0.1, semilla=semilla)
+    if tipo == 'secciones':
+        # Secciones pequeñas: grado ~ secciones_por_estudiante * tamaño de sección
+        secciones = max(int(n * SECCIONES_POR_ESTUDIANTE ** 2 / grado_medio), 1)
+        return redes.red_secciones(n, secciones, SECCIONES_POR_ESTUDIANTE, semilla=semilla)
+    return redes.red_configuracion(n, grado_medio, semilla=semilla)
+
+@vuelo_unico
+def simular_proyecto_red(tipo, grado_medio, modo, realizaciones=20, semilla=0):
+    red = construir_red(tipo, grado_medio)
+    tau = redes.tasa_por_contacto(beta * N_total, red)
+    t_red = np.linspace(0, 40, 161)
+    if modo == 'estocastico':
+        resultado = redes.sir_estocastico(red, tau, gamma, int(I0), t_red, realizaciones=realizaciones, semilla=semilla)
+    else:
+        resultado = redes.sir_campo_medio(red, tau, gamma, redes.elegir_infectados(red, int(I0), semilla), t_red)
+    return red, tau, t_red, resultado
+
+# 6. Incertidumbre: beta*N y gamma dentro de rangos, muestreados por
+# hipercubo latino y resueltos todos en un solo lote
+@vuelo_unico
+def proyectar_incertidumbre(beta_min, beta_max, gamma_min, gamma_max, distribucion, muestras, semilla=0):
+    t_inc = np.linspace(0, 40, 401)
+    if distribucion == 'triangular':
+        # Moda en el valor nominal del proyecto (si cae dentro del rango)
+        moda_b = min(max(beta * N_total, beta_min), beta_max)
+        moda_g = min(max(gamma, gamma_min), gamma_max)
+        distribuciones = {'b': ('triangular', beta_min / N_total, moda_b / N_total, beta_max / N_total),
+                          'k': ('triangular', gamma_min, moda_g, gamma_max)}
+    else:
+        distribuciones = {'b': ('uniforme', beta_min / N_total, beta_max / N_total),
+                          'k': ('uniforme', gamma_min, gamma_max)}
+    return proyectar(SIR, y0, t_inc, distribuciones, muestras, semilla=semilla)
+
+# 7. Sensibilidad global: índices de Sobol de beta, gamma, I0 y N (cada uno
+# uniforme en ±variación% alrededor de su valor nominal)
+ETIQUETAS_SOBOL = {'b': 'β', 'k': 'γ', 'I0': 'I₀', 'N': 'N'}
+SALIDAS_SOBOL = {'pico': 'Infectados en el pico', 'dia_pico': 'Día del pico', 'tamano_final': 'Tamaño final'}
+
+@vuelo_unico
+def sensibilidad_proyecto(variacion, muestras_base, semilla=0):
+    f = variacion / 100
+    nominales = {'b': beta, 'k': gamma, 'I0': I0, 'N': N_total}
+    distribuciones = {p: ('uniforme', v * (1 - f), v * (1 + f)) for p, v in nominales.items()}
+    return sobol_sir(distribuciones, {'R0': R0_inicial}, 40, n=muestras_base, semilla=semilla)
+
 # ==========================================
 # 3. CREACIÓN DEL GRÁFICO
 # ==========================================
@@ -129,6 +193,152 @@ estilo_ejes = dict(
 fig.update_xaxes(**estilo_ejes, range=[0, 40])
 fig.update_yaxes(**estilo_ejes, range=[0, N_total * 1.05])
 
+def crear_figura_estocastica(ensamble):
+    p = ensamble.percentiles('I')
+    t_est = ensamble.t
+    fig_est = go.Figure()
+    # Bandas: se dibuja el percentil inferior y se rellena hasta el superior
+    for bajo, alto, relleno in ((5, 95, 'rgba(255, 20, 147, 0.12)'), (25, 75, 'rgba(255, 20, 147, 0.25)')):
+        fig_est.add_trace(go.Scatter(x=t_est, y=p[bajo], mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip'))
+        fig_est.add_trace(go.Scatter(x=t_est, y=p[alto], mode='lines', line=dict(width=0),
+                                     fill='tonexty', fillcolor=relleno, name=f'Percentil {bajo}-{alto}'))
+    fig_est.add_trace(go.Scatter(x=t_est, y=p[50], mode='lines', name='Mediana I(t)',
+                                 line=dict(color=COLOR_INFECTADOS, width=3)))
+    fig_est.add_trace(go.Scatter(x=t, y=I, mode='lines', name='Determinista I(t)',
+                                 line=dict(color='black', width=1.5, dash='dash')))
+    fig_est.update_layout(
+        title=dict(text=f"<b>Infectados en {ensamble.realizaciones} simulaciones estocásticas</b>",
+                   x=0.5, y=0.95, font=dict(size=18, color=COLOR_TITULO)),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Estudiantes infectados",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center',
+                    bgcolor='rgba(255,255,255,0.9)', bordercolor='#ddd', borderwidth=1),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+    fig_est.update_xaxes(**estilo_ejes, range=[0, 40])
+    fig_est.update_yaxes(**estilo_ejes)
+    return fig_est
+
+def crear_figura_red(t_red, resultado, nombre_red):
+    fig_red = go.Figure()
+    if hasattr(resultado, 'percentiles'):
+        # Modo estocástico: mediana y banda 5-95 de las realizaciones
+        p = resultado.percentiles('I')
+        fig_red.add_trace(go.Scatter(x=t_red, y=p[5], mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip'))
+        fig_red.add_trace(go.Scatter(x=t_red, y=p[95], mode='lines', line=dict(width=0), fill='tonexty',
+                                     fillcolor='rgba(255, 20, 147, 0.15)', name='Red: percentil 5-95'))
+        I_red = p[50]
+        nombre = 'Red: mediana I(t)'
+    else:
+        I_red = resultado[:, 1]
+        nombre = 'Red: I(t) campo medio'
+    fig_red.add_trace(go.Scatter(x=t_red, y=I_red, mode='lines', name=nombre,
+                                 line=dict(color=COLOR_INFECTADOS, width=3)))
+    fig_red.add_trace(go.Scatter(x=t, y=I, mode='lines', name='Homogéneo I(t)',
+                                 line=dict(color='black', width=1.5, dash='dash')))
+    fig_red.update_layout(
+        title=dict(text=f"<b>Infectados: red de contactos ({nombre_red}) vs. mezcla homogénea</b>",
+                   x=0.5, y=0.95, font=dict(size=18, color=COLOR_TITULO)),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Estudiantes infectados",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center',
+                    bgcolor='rgba(255,255,255,0.9)', bordercolor='#ddd', borderwidth=1),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+    fig_red.update_xaxes(**estilo_ejes, range=[0, 40])
+    fig_red.update_yaxes(**estilo_ejes)
+    return fig_red
+
+def crear_figura_incertidumbre(proyeccion):
+    fig_inc = go.Figure()
+    colores = {'S': (COLOR_SUCEPTIBLES, 'rgba(0, 191, 255, 0.18)'),
+               'I': (COLOR_INFECTADOS, 'rgba(255, 20, 147, 0.18)'),
+               'R': (COLOR_RECUPERADOS, 'rgba(148, 0, 211, 0.18)')}
+    nombres = {'S': 'Susceptibles', 'I': 'Infectados', 'R': 'Recuperados'}
+    for c in ('S', 'I', 'R'):
+        p = proyeccion.percentiles(c)
+        linea, relleno = colores[c]
+        fig_inc.add_trace(go.Scatter(x=proyeccion.t, y=p[5], mode='lines', line=dict(width=0),
+                                     showlegend=False, hoverinfo='skip', legendgroup=c))
+        fig_inc.add_trace(go.Scatter(x=proyeccion.t, y=p[95], mode='lines', line=dict(width=0), fill='tonexty',
+                                     fillcolor=relleno, name=f'{nombres[c]} 5-95%', legendgroup=c))
+        fig_inc.add_trace(go.Scatter(x=proyeccion.t, y=p[50], mode='lines', name=f'{nombres[c]} (mediana)',
+                                     line=dict(color=linea, width=2.5), legendgroup=c))
+    fig_inc.update_layout(
+        title=dict(text=f"<b>Proyección con incertidumbre ({len(proyeccion.muestras['b'])} muestras)</b>",
+                   x=0.5, y=0.95, font=dict(size=18, color=COLOR_TITULO)),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Estudiantes",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center',
+                    bgcolor='rgba(255,255,255,0.9)', bordercolor='#ddd', borderwidth=1),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+    fig_inc.update_xaxes(**estilo_ejes, range=[0, 40])
+    fig_inc.update_yaxes(**estilo_ejes, range=[0, N_total * 1.05])
+    return fig_inc
+
+def crear_figura_picos(dias_pico, tamanos_pico):
+    fig_picos = make_subplots(rows=1, cols=2, subplot_titles=("Día del pico", "Infectados en el pico"),
+                              horizontal_spacing=0.12)
+    fig_picos.add_trace(go.Histogram(x=dias_pico, nbinsx=40, marker_color=COLOR_RECUPERADOS,
+                                     name='Día del pico'), row=1, col=1)
+    fig_picos.add_trace(go.Histogram(x=tamanos_pico, nbinsx=40, marker_color=COLOR_INFECTADOS,
+                                     name='Tamaño del pico'), row=1, col=2)
+    fig_picos.update_layout(
+        showlegend=False,
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        margin=dict(l=40, r=40, t=60, b=40),
+        bargap=0.05
+    )
+    fig_picos.update_xaxes(**estilo_ejes)
+    fig_picos.update_yaxes(**estilo_ejes, title_text="Muestras", row=1, col=1)
+    fig_picos.update_yaxes(**estilo_ejes, row=1, col=2)
+    return fig_picos
+
+def crear_figura_sobol(indices):
+    # Un panel por salida: barras de primer orden y total con su IC 95% (bootstrap)
+    nombres = [ETIQUETAS_SOBOL[p] for p in indices.parametros]
+    fig_sobol = make_subplots(rows=1, cols=len(indices.salidas), horizontal_spacing=0.08,
+                              subplot_titles=[SALIDAS_SOBOL[s] for s in indices.salidas])
+    for col, s in enumerate(indices.salidas, start=1):
+        for valores, intervalo, nombre, color in (
+                (indices.primer_orden[s], indices.intervalos_primer_orden[s], 'Primer orden (Sᵢ)', COLOR_SUCEPTIBLES),
+                (indices.total[s], indices.intervalos_total[s], 'Total (STᵢ)', COLOR_INFECTADOS)):
+            fig_sobol.add_trace(go.Bar(
+                x=nombres, y=valores, name=nombre, marker_color=color, legendgroup=nombre, showlegend=(col == 1),
+                error_y=dict(type='data', symmetric=False, array=intervalo[1] - valores,
+                             arrayminus=valores - intervalo[0], color='gray')
+            ), row=1, col=col)
+    fig_sobol.update_layout(
+        title=dict(text=f"<b>Índices de Sobol ({indices.evaluaciones} evaluaciones del modelo)</b>",
+                   x=0.5, y=0.97, font=dict(size=18, color=COLOR_TITULO)),
+        barmode='group',
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=-0.12, x=0.5, xanchor='center'),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    fig_sobol.update_xaxes(**estilo_ejes)
+    fig_sobol.update_yaxes(**estilo_ejes, range=[0, 1.05])
+    return fig_sobol
+
 # ==========================================
 # 4. TEXTOS DE ANÁLISIS (DETALLADOS)
 # ==========================================
@@ -167,6 +377,8 @@ La simulación numérica arroja los siguientes indicadores críticos para la tom
 # ==========================================
 # 5. LAYOUT
 # ==========================================
+ESTILO_INPUT_CORTO = {'width': '80px', 'padding': '8px', 'margin': '0 10px', 'borderRadius': '5px', 'border': '1px solid #ccc'}
+
 layout = html.Div([
     
     html.H1("Proyecto Final: Modelamiento de Epidemia", 
@@ -215,6 +427,236 @@ layout = html.Div([
             'overflowY': 'auto' # Scroll si el texto es muy largo
         })
         
-    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1600px', 'margin': '0 auto'})
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1600px', 'margin': '0 auto'}),
+
+    # --- SIMULACIÓN ESTOCÁSTICA ---
+    html.Div([
+        html.H3("Variabilidad del Brote (Simulación Estocástica)", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Label("Realizaciones:", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-realizaciones-proyecto', type='number', value=1000, min=10, step=10,
+                      style={'width': '120px', 'padding': '8px', 'margin': '0 15px', 'borderRadius': '5px', 'border': '1px solid #ccc'}),
+            html.Button("Simular Ensamble", id='btn-estocastico-proyecto',
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '10px 20px', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer'})
+        ], style={'marginBottom': '15px'}),
+        dcc.Graph(id='grafica-proyecto-estocastico', style={"height": "500px", "width": "100%"}),
+        html.Div(id='stats-proyecto-estocastico', style={'marginTop': '15px'})
+    ], style={'maxWidth': '1600px', 'margin': '40px auto 0 auto', 'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 4px 10px rgba(0,0,0,0.05)'}),
+
+    # --- MODELO EN RED DE CONTACTOS ---
+    html.Div([
+        html.H3("Red de Contactos (sin Mezcla Homogénea)", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Label("Tipo de red:", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Dropdown(
+                id='dropdown-tipo-red',
+                options=[
+                    {'label': 'Configuración (grados Poisson)', 'value': 'configuracion'},
+                    {'label': 'Configuración (ley de potencia)', 'value': 'potencia'},
+                    {'label': 'Mundo pequeño', 'value': 'mundo_pequeno'},
+                    {'label': 'Secciones de cursos', 'value': 'secciones'},
+                ],
+                value='configuracion', clearable=False,
+                style={'width': '280px', 'margin': '0 15px', 'display': 'inline-block', 'verticalAlign': 'middle'}
+            ),
+            html.Label("Grado medio:", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-grado-red', type='number', value=20, min=2, step=1,
+                      style={'width': '80px', 'padding': '8px', 'margin': '0 15px', 'borderRadius': '5px', 'border': '1px solid #ccc'}),
+            dcc.RadioItems(
+                id='radio-modo-red',
+                options=[{'label': ' Campo medio', 'value': 'campo_medio'},
+                         {'label': ' Estocástico', 'value': 'estocastico'}],
+                value='campo_medio', inline=True,
+                style={'display': 'inline-block', 'margin': '0 15px'}, inputStyle={'marginLeft': '10px'}
+            ),
+            html.Button("Simular en Red", id='btn-red-proyecto',
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '10px 20px', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer'})
+        ], style={'marginBottom': '15px'}),
+        dcc.Graph(id='grafica-proyecto-red', style={"height": "500px", "width": "100%"}),
+        html.Div(id='stats-proyecto-red', style={'marginTop': '15px'})
+    ], style={'maxWidth': '1600px', 'margin': '40px auto 0 auto', 'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 4px 10px rgba(0,0,0,0.05)'}),
+
+    # --- INCERTIDUMBRE EN LOS PARÁMETROS ---
+    html.Div([
+        html.H3("Incertidumbre en β y γ (Hipercubo Latino)", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Label("β·N entre", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-beta-min-inc', type='number', value=0.8, step=0.05, style=ESTILO_INPUT_CORTO),
+            html.Label("y", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-beta-max-inc', type='number', value=1.2, step=0.05, style=ESTILO_INPUT_CORTO),
+            html.Label("γ entre", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-gamma-min-inc', type='number', value=0.33, step=0.01, style=ESTILO_INPUT_CORTO),
+            html.Label("y", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-gamma-max-inc', type='number', value=0.5, step=0.01, style=ESTILO_INPUT_CORTO),
+            dcc.Dropdown(
+                id='dropdown-distribucion-inc',
+                options=[{'label': 'Uniforme', 'value': 'uniforme'},
+                         {'label': 'Triangular (moda en el valor nominal)', 'value': 'triangular'}],
+                value='uniforme', clearable=False,
+                style={'width': '300px', 'margin': '0 10px', 'display': 'inline-block', 'verticalAlign': 'middle'}
+            ),
+            html.Label("Muestras:", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-muestras-inc', type='number', value=2000, min=50, step=50, style=ESTILO_INPUT_CORTO),
+            html.Button("Proyectar", id='btn-incertidumbre-proyecto',
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '10px 20px', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer'})
+        ], style={'marginBottom': '15px'}),
+        dcc.Graph(id='grafica-proyecto-incertidumbre', style={"height": "500px", "width": "100%"}),
+        dcc.Graph(id='grafica-proyecto-picos', style={"height": "350px", "width": "100%"}),
+        html.Div(id='stats-proyecto-incertidumbre', style={'marginTop': '15px'})
+    ], style={'maxWidth': '1600px', 'margin': '40px auto 0 auto', 'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 4px 10px rgba(0,0,0,0.05)'}),
+
+    # --- SENSIBILIDAD GLOBAL (SOBOL) ---
+    html.Div([
+        html.H3("¿Sobre qué parámetro conviene actuar? (Índices de Sobol)", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Label("Variación de β, γ, I₀ y N (±%):", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Input(id='input-variacion-sobol-proyecto', type='number', value=20, min=1, max=90, step=1, style=ESTILO_INPUT_CORTO),
+            html.Label("Muestras base:", style={'fontWeight': 'bold', 'color': COLOR_TITULO}),
+            dcc.Dropdown(
+                id='dropdown-muestras-sobol-proyecto', options=[256, 1024, 4096], value=1024, clearable=False,
+                style={'width': '110px', 'margin': '0 10px', 'display': 'inline-block', 'verticalAlign': 'middle'}
+            ),
+            html.Button("Calcular Sensibilidad", id='btn-sobol-proyecto',
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '10px 20px', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer'})
+        ], style={'marginBottom': '15px'}),
+        dcc.Graph(id='grafica-proyecto-sobol', style={"height": "450px", "width": "100%"}),
+        html.Div(id='stats-proyecto-sobol', style={'marginTop': '15px'})
+    ], style={'maxWidth': '1600px', 'margin': '40px auto 0 auto', 'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '10px', 'boxShadow': '0 4px 10px rgba(0,0,0,0.05)'})
+
+], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
+
+# ==========================================
+# 6. CALLBACKS
+# ==========================================
+@callback(
+    [Output('grafica-proyecto-estocastico', 'figure'),
+     Output('stats-proyecto-estocastico', 'children')],
+    Input('btn-estocastico-proyecto', 'n_clicks'),
+    State('input-realizaciones-proyecto', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_proyecto_estocastico(n_clicks, realizaciones):
+    if realizaciones is None: realizaciones = 1000
+    realizaciones = int(min(max(realizaciones, 10), 20000))
+
+    with fase("resolver"):
+        ensamble = simular_proyecto_estocastico(realizaciones)
+
+    with fase("figura"):
+        fig_est = crear_figura_estocastica(ensamble)
+
+    # Pico en las realizaciones donde el brote sí despegó
+    picos = ensamble.serie('I').max(axis=1)
+    mayores = picos[picos >= 0.1 * max_infectados]
+    stats = dcc.Markdown(f"""
+* **Probabilidad de extinción temprana:** {ensamble.probabilidad_extincion():.1%} (aproximación teórica $1/R_0$ = {1 / R0_calc:.1%}).
+* **Pico de infectados en brotes mayores:** mediana {np.median(mayores) if mayores.size else 0:.0f} (percentiles 5-95: {np.percentile(mayores, 5) if mayores.size else 0:.0f} - {np.percentile(mayores, 95) if mayores.size else 0:.0f}); el modelo determinista da {max_infectados:.0f}.
+* **Método:** {'Gillespie exacto' if ensamble.metodo == 'gillespie' else 'tau-leaping'}.
+""", mathjax=True)
+
+    return fig_est, stats
+
+@callback(
+    [Output('grafica-proyecto-red', 'figure'),
+     Output('stats-proyecto-red', 'children')],
+    Input('btn-red-proyecto', 'n_clicks'),
+    State('dropdown-tipo-red', 'value'),
+    State('input-grado-red', 'value'),
+    State('radio-modo-red', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_proyecto_red(n_clicks, tipo, grado_medio, modo):
+    if tipo is None: tipo = 'configuracion'
+    if grado_medio is None: grado_medio = 20
+    grado_medio = int(min(max(grado_medio, 2), 500))
+
+    with fase("resolver"):
+        red, tau, t_red, resultado = simular_proyecto_red(tipo, grado_medio, modo)
+
+    with fase("figura"):
+        fig_red = crear_figura_red(t_red, resultado, red.nombre)
+
+    I_red = resultado.percentiles('I')[50] if modo == 'estocastico' else resultado[:, 1]
+    stats = dcc.Markdown(f"""
+* **Red:** {red.n} estudiantes, {red.aristas} contactos, grado medio {red.grado_medio:.1f}.
+* **Tasa por contacto ($\\tau$):** {tau:.4f} por día.
+* **$R_0$ en la red:** {red.r0(tau, gamma):.2f} (homogéneo: {R0_calc:.2f}).
+* **Pico de infectados:** {I_red.max():.0f} el día {t_red[np.argmax(I_red)]:.1f} (homogéneo: {max_infectados:.0f} el día {dia_pico:.1f}).
+""", mathjax=True)
+
+    return fig_red, stats
+
+@callback(
+    [Output('grafica-proyecto-incertidumbre', 'figure'),
+     Output('grafica-proyecto-picos', 'figure'),
+     Output('stats-proyecto-incertidumbre', 'children')],
+    Input('btn-incertidumbre-proyecto', 'n_clicks'),
+    State('input-beta-min-inc', 'value'),
+    State('input-beta-max-inc', 'value'),
+    State('input-gamma-min-inc', 'value'),
+    State('input-gamma-max-inc', 'value'),
+    State('dropdown-distribucion-inc', 'value'),
+    State('input-muestras-inc', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_proyecto_incertidumbre(n_clicks, beta_min, beta_max, gamma_min, gamma_max, distribucion, muestras):
+    if beta_min is None: beta_min = 0.8
+    if beta_max is None: beta_max = 1.2
+    if gamma_min is None: gamma_min = 0.33
+    if gamma_max is None: gamma_max = 0.5
+    if muestras is None: muestras = 2000
+    muestras = int(min(max(muestras, 50), 20000))
+    # Rangos ordenados y estrictamente positivos
+    beta_min, beta_max = sorted((max(beta_min, 1e-6), max(beta_max, 1e-6)))
+    gamma_min, gamma_max = sorted((max(gamma_min, 1e-6), max(gamma_max, 1e-6)))
+    if beta_max == beta_min: beta_max = beta_min * 1.001
+    if gamma_max == gamma_min: gamma_max = gamma_min * 1.001
+
+    with fase("resolver"):
+        proyeccion = proyectar_incertidumbre(beta_min, beta_max, gamma_min, gamma_max, distribucion, muestras)
+        dias_pico, tamanos_pico = proyeccion.picos('I')
+        I_dia6 = proyeccion.valor_en('I', 6)
+
+    with fase("figura"):
+        fig_inc = crear_figura_incertidumbre(proyeccion)
+        fig_picos = crear_figura_picos(dias_pico, tamanos_pico)
+
+    def rango(valores, formato):
+        p5, p50, p95 = np.percentile(valores, [5, 50, 95])
+        return f"{p50:{formato}} (90%: {p5:{formato}} - {p95:{formato}})"
+
+    stats = dcc.Markdown(f"""
+* **Infectados al día 6:** {rango(I_dia6, '.0f')} (valor nominal: {int(I_6)}).
+* **Día del pico:** {rango(dias_pico, '.1f')} (valor nominal: {dia_pico:.1f}).
+* **Infectados en el pico:** {rango(tamanos_pico, '.0f')} (valor nominal: {int(max_infectados)}).
+""")
+
+    return fig_inc, fig_picos, stats
+
+@callback(
+    [Output('grafica-proyecto-sobol', 'figure'),
+     Output('stats-proyecto-sobol', 'children')],
+    Input('btn-sobol-proyecto', 'n_clicks'),
+    State('input-variacion-sobol-proyecto', 'value'),
+    State('dropdown-muestras-sobol-proyecto', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_proyecto_sobol(n_clicks, variacion, muestras_base):
+    if variacion is None: variacion = 20
+    if muestras_base is None: muestras_base = 1024
+    variacion = min(max(variacion, 1), 90)
+
+    with fase("resolver"):
+        indices = sensibilidad_proyecto(variacion, int(muestras_base))
+
+    with fase("figura"):
+        fig_sobol = crear_figura_sobol(indices)
+
+    # Parámetro más influyente (índice total) en cada salida
+    lineas = [f"* **{SALIDAS_SOBOL[s]}:** domina {ETIQUETAS_SOBOL[indices.parametros[int(np.argmax(indices.total[s]))]]} "
+              f"(STᵢ = {indices.total[s].max():.2f}); la suma de los Sᵢ es {indices.primer_orden[s].sum():.2f} "
+              f"(cerca de 1 si casi no hay interacciones)."
+              for s in indices.salidas]
+    stats = dcc.Markdown("\n".join(lineas))
 
-], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
\ No newline at end of file
+    return fig_sobol, stats
@@ -3,6 +3,10 @@ from dash import html, dcc, Input, Output, State, callback
 import plotly.graph_objects as go
 import numpy as np
 
+from modelos.incertidumbre import hipercubo_latino
+from modelos.logistico import familia_logistica, logistica
+from servidor.metricas import fase
+
 dash.register_page(__name__, path='/Crecimiento_poblacion', name='Crecimiento poblacion logístico')
 
 # ==========================================
@@ -12,12 +16,21 @@ def calcular_crecimiento_logistico(P0, r, K, t_max, num_puntos=200):
     t = np.linspace(0, t_max, num_puntos)
     if K == 0:
         return t, np.full(num_puntos, P0)
-    denominador = (K - P0) + P0 * np.exp(r * t)
-    if np.any(denominador == 0):
-        return t, np.zeros(num_puntos)
-    numerador = P0 * K * np.exp(r * t)
-    P = numerador / denominador
-    return t, P
+    # Forma K / (1 + A e^{-rt}): sin desbordes aunque r*t sea muy grande
+    return t, logistica(t, P0, r, K)
+
+def calcular_familia_logistica(rango_P0, rango_r, rango_K, t_max, curvas, num_puntos=200, semilla=0):
+    # Curvas con (P0, r, K) repartidos por hipercubo latino en los rangos
+    # dados (un rango de ancho cero deja el valor fijo), evaluadas todas
+    # juntas; devuelve el trazo aplanado (x, y) y las muestras
+    rangos = {'P0': rango_P0, 'r': rango_r, 'K': rango_K}
+    distribuciones = {p: ('uniforme', bajo, alto) for p, (bajo, alto) in rangos.items() if alto > bajo}
+    muestras = {p: np.full(curvas, float(bajo)) for p, (bajo, alto) in rangos.items()}
+    if distribuciones:
+        muestras.update(hipercubo_latino(distribuciones, curvas, semilla))
+    t = np.linspace(0, t_max, num_puntos)
+    x, y = familia_logistica(t, muestras['P0'], muestras['r'], muestras['K'])
+    return x, y, muestras
 
 # ==========================================
 # 2. COMPONENTES DE INTERFAZ (ESTILO MEJORADO)
@@ -113,12 +126,45 @@ def crear_figura_logistica(t, P, K, t_max):
     
     fig.update_xaxes(**estilo_ejes, range=[0, t_max])
     
-    y_max = max(K, np.max(P)) * 1.1 if len(P) > 0 else K * 1.1
+    y_max = max(K, np.nanmax(P)) * 1.1 if len(P) > 0 else K * 1.1
     if y_max == 0: y_max = 10
     fig.update_yaxes(**estilo_ejes, range=[0, y_max])
     
     return fig
 
+def crear_figura_familia(x, y, muestras, t_max):
+    # Todas las curvas en un solo trazo WebGL (separadas por NaN)
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=x, y=y,
+        mode='lines',
+        name=f"{len(muestras['r'])} curvas",
+        line=dict(color='rgba(0, 0, 255, 0.25)', width=1),
+        hoverinfo='skip'
+    ))
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Familia de {len(muestras['r'])} curvas logísticas</b>",
+            font=dict(size=20, color='green'),
+            x=0.5, y=0.95
+        ),
+        xaxis_title='Tiempo (t)',
+        yaxis_title='Población P(t)',
+        margin=dict(l=40, r=40, t=70, b=40),
+        paper_bgcolor='lightblue',
+        plot_bgcolor='white',
+        font=dict(family='Outfit, Arial, sans-serif', size=12, color='black'),
+        showlegend=False
+    )
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor='lightpink',
+        zeroline=True, zerolinewidth=2, zerolinecolor='red',
+        showline=True, linecolor='black', linewidth=2, mirror=True
+    )
+    fig.update_xaxes(**estilo_ejes, range=[0, t_max])
+    fig.update_yaxes(**estilo_ejes, range=[0, max(muestras['K'].max(), np.nanmax(y)) * 1.1])
+    return fig
+
 # ==========================================
 # 4. LAYOUT
 # ==========================================
@@ -150,7 +196,34 @@ layout = html.Div([
             )
         ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
         
-    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'})
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'}),
+
+    # --- FAMILIA DE CURVAS (mismo tiempo máximo de arriba) ---
+    html.Div([
+        html.Div([
+            html.H3("Familia de Curvas", style={'color': 'green', 'borderBottom': '2px solid lightpink', 'marginBottom': '20px'}),
+            html.P("Cientos de trayectorias con P(0), r y K dentro de los rangos:", style={'fontSize': '14px', 'marginBottom': '20px'}),
+
+            crear_grupo_input("P(0) mínimo:", "input-p0-min-familia", value=5, step=1),
+            crear_grupo_input("P(0) máximo:", "input-p0-max-familia", value=200, step=1),
+            crear_grupo_input("r mínimo:", "input-r-min-familia", value=0.05, step=0.01),
+            crear_grupo_input("r máximo:", "input-r-max-familia", value=0.3, step=0.01),
+            crear_grupo_input("K mínimo:", "input-k-min-familia", value=800, step=10),
+            crear_grupo_input("K máximo:", "input-k-max-familia", value=1200, step=10),
+            crear_grupo_input("Número de curvas:", "input-curvas-familia", value=300, min_val=1, step=50),
+
+            html.Button("Generar Familia", id="btn-familia",
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '10px', 'fontSize': '16px'})
+        ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+
+        html.Div([
+            dcc.Graph(
+                id='grafica-familia-logistica',
+                style={'height': '600px', 'width': '100%'}
+            )
+        ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
+
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '40px auto 0 auto'})
     
 ], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
 
@@ -183,6 +256,47 @@ def actualizar_grafica(n_clicks, P0, r, K, t_max):
         )
         return fig_empty
         
-    t, P = calcular_crecimiento_logistico(P0, r, K, t_max)
-    fig = crear_figura_logistica(t, P, K, t_max)
-    return fig
\ No newline at end of file
+    with fase("resolver"):
+        t, P = calcular_crecimiento_logistico(P0, r, K, t_max)
+    with fase("figura"):
+        fig = crear_figura_logistica(t, P, K, t_max)
+    return fig
+
+@callback(
+    Output('grafica-familia-logistica', 'figure'),
+    Input('btn-familia', 'n_clicks'),
+    State('input-p0-min-familia', 'value'),
+    State('input-p0-max-familia', 'value'),
+    State('input-r-min-familia', 'value'),
+    State('input-r-max-familia', 'value'),
+    State('input-k-min-familia', 'value'),
+    State('input-k-max-familia', 'value'),
+    State('input-curvas-familia', 'value'),
+    State('input-t', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_familia(n_clicks, P0_min, P0_max, r_min, r_max, K_min, K_max, curvas, t_max):
+    # Valores por defecto
+    if P0_min is None: P0_min = 5
+    if P0_max is None: P0_max = 200
+    if r_min is None: r_min = 0.05
+    if r_max is None: r_max = 0.3
+    if K_min is None: K_min = 800
+    if K_max is None: K_max = 1200
+    if curvas is None: curvas = 300
+    if t_max is None: t_max = 100
+    curvas = int(min(max(curvas, 1), 5000))
+
+    if min(K_min, K_max) <= 0 or t_max <= 0 or min(P0_min, P0_max) < 0:
+        fig_empty = go.Figure()
+        fig_empty.update_layout(title="Error: Ingrese valores positivos", paper_bgcolor='lightblue')
+        return fig_empty
+
+    # Rangos ordenados
+    rango_P0, rango_r, rango_K = sorted((P0_min, P0_max)), sorted((r_min, r_max)), sorted((K_min, K_max))
+
+    with fase("resolver"):
+        x, y, muestras = calcular_familia_logistica(rango_P0, rango_r, rango_K, t_max, curvas)
+    with fase("figura"):
+        fig = crear_figura_familia(x, y, muestras, t_max)
+    return fig
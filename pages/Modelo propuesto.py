@@ -1,8 +1,15 @@
 import dash
-from dash import html, dcc, Input, Output, State, callback
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import numpy as np
-from scipy.integrate import odeint
+
+from modelos import SIR
+from modelos.horizonte import resolver_normalizado, resolver_en_bloques
+from modelos.sensibilidad import sobol_sir
+from servidor import en_vivo, exportacion
+from servidor.metricas import fase
+from servidor.vuelo_unico import vuelo_unico
 
 # Registro de la página (si usas multipage)
 dash.register_page(__name__, path='/Moda_Crocs', name='Ciclo de Vida Moda Crocs')
@@ -10,14 +17,9 @@ dash.register_page(__name__, path='/Moda_Crocs', name='Ciclo de Vida Moda Crocs'
 # ==========================================
 # 1. LÓGICA MATEMÁTICA (MODELO SIR)
 # ==========================================
+@vuelo_unico
 def calcular_moda_sir(N, b, k, I0, t_max, num_puntos=200):
-    # Definición de las ecuaciones diferenciales
-    def deriv(y, t, N, b, k):
-        S, I, R = y
-        dSdt = -b * S * I
-        dIdt = b * S * I - k * I
-        dRdt = k * I
-        return dSdt, dIdt, dRdt
+    # Ecuaciones: dS/dt = -b*S*I, dI/dt = b*S*I - k*I, dR/dt = k*I (modelos.SIR)
 
     # Condiciones iniciales
     S0 = N - I0
@@ -27,12 +29,34 @@ def calcular_moda_sir(N, b, k, I0, t_max, num_puntos=200):
     # Vector de tiempo
     t = np.linspace(0, t_max, num_puntos)
     
-    # Resolver EDO
-    ret = odeint(deriv, y0, t, args=(N, b, k))
+    # Resolver EDO en forma adimensional (compartida con todo escenario del
+    # mismo R0 = b N / k e I0/N); al subir solo t_max se integra únicamente
+    # el tramo nuevo
+    ret = resolver_normalizado(SIR, y0, t, b=b, k=k)
     S, I, R = ret.T
     
     return t, S, I, R
 
+def exportar_moda(N, b, k, I0, t_max, puntos):
+    for t, ret in resolver_en_bloques(SIR, (N - I0, I0, 0), t_max, puntos, b=b, k=k):
+        yield np.column_stack([t, ret])
+
+exportacion.registrar('moda', ('t', 'S', 'I', 'R'),
+                      dict(N=1000.0, b=0.0005, k=0.1, I0=5.0, t_max=60.0, puntos=200),
+                      exportar_moda, positivos=('N',))
+
+ETIQUETAS_SOBOL = {'b': 'b', 'k': 'k', 'I0': 'I₀', 'N': 'N'}
+SALIDAS_SOBOL = {'pico': 'Usuarios en el pico', 'dia_pico': 'Día del pico', 'tamano_final': 'Adoptantes totales'}
+
+@vuelo_unico
+def sensibilidad_moda(N, b, k, I0, t_max, variacion, muestras_base, semilla=0):
+    # Índices de Sobol de b, k, I0 y N, cada uno uniforme en ±variación%
+    # alrededor del valor de la página (los que valen 0 quedan fijos)
+    f = variacion / 100
+    nominales = {'b': b, 'k': k, 'I0': I0, 'N': N}
+    distribuciones = {p: ('uniforme', v * (1 - f), v * (1 + f)) for p, v in nominales.items() if v}
+    return sobol_sir(distribuciones, nominales, t_max, n=muestras_base, semilla=semilla)
+
 # ==========================================
 # 2. COMPONENTES DE INTERFAZ (ESTILO DEL ARCHIVO ORIGINAL)
 # ==========================================
@@ -145,6 +169,45 @@ def crear_figura_moda(t, S, I, R, t_max):
     
     return fig
 
+def crear_figura_sobol(indices):
+    # Barras de primer orden y total con su IC 95% (bootstrap), un panel por salida
+    nombres = [ETIQUETAS_SOBOL[p] for p in indices.parametros]
+    fig = make_subplots(
+        rows=1, cols=len(indices.salidas),
+        subplot_titles=[SALIDAS_SOBOL[s] for s in indices.salidas],
+        horizontal_spacing=0.08
+    )
+    for col, s in enumerate(indices.salidas, start=1):
+        for valores, intervalo, nombre, color in (
+                (indices.primer_orden[s], indices.intervalos_primer_orden[s], 'Primer orden (Sᵢ)', '#1f77b4'),
+                (indices.total[s], indices.intervalos_total[s], 'Total (STᵢ)', '#d62728')):
+            fig.add_trace(go.Bar(
+                x=nombres, y=valores, name=nombre, marker_color=color, legendgroup=nombre, showlegend=(col == 1),
+                error_y=dict(type='data', symmetric=False, array=intervalo[1] - valores,
+                             arrayminus=valores - intervalo[0], color='gray')
+            ), row=1, col=col)
+
+    fig.update_layout(
+        title=dict(
+            text=f'<b>Índices de Sobol ({indices.evaluaciones} evaluaciones del modelo)</b>',
+            font=dict(size=20, color='green'),
+            x=0.5, y=0.95
+        ),
+        barmode='group',
+        margin=dict(l=40, r=40, t=80, b=40),
+        paper_bgcolor='lightblue',
+        plot_bgcolor='white',
+        font=dict(family='Outfit, Arial, sans-serif', size=12, color='black'),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center')
+    )
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor='lightpink',
+        showline=True, linecolor='black', linewidth=1, mirror=True
+    )
+    fig.update_xaxes(**estilo_ejes)
+    fig.update_yaxes(**estilo_ejes, range=[0, 1.05])
+    return fig
+
 # ==========================================
 # 4. LAYOUT
 # ==========================================
@@ -166,7 +229,15 @@ layout = html.Div([
             crear_grupo_input("Tiempo máximo (Días):", "input-t-moda", value=60, step=5),
             
             html.Button("Actualizar Gráfico", id="btn-generar-moda", 
-                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '10px', 'fontSize': '16px'})
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '10px', 'fontSize': '16px'}),
+
+            exportacion.controles("moda", 200),
+
+            # --- MODO EN VIVO: la gráfica sigue a los deslizadores ---
+            html.H4("Modo en vivo", style={'color': 'green', 'marginTop': '20px'}),
+            en_vivo.deslizador("Imitación b (arrastre):", "slider-b-en-vivo-moda", 0.0001, 0.005, 0.0001, 0.0005),
+            en_vivo.deslizador("Aburrimiento k (arrastre):", "slider-k-en-vivo-moda", 0.01, 1.0, 0.01, 0.1),
+            dcc.Store(id="store-en-vivo-moda")
         ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
         
         # --- COLUMNA DERECHA: GRÁFICO ---
@@ -177,7 +248,26 @@ layout = html.Div([
             )
         ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
         
-    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'})
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'}),
+
+    # --- SENSIBILIDAD GLOBAL (alrededor de los parámetros de arriba) ---
+    html.Div([
+        html.Div([
+            html.H3("Sensibilidad Global", style={'color': 'green', 'borderBottom': '2px solid lightpink', 'marginBottom': '20px'}),
+            html.P("Índices de Sobol: qué parámetro explica más la variación del pico y del total de adoptantes.", style={'fontSize': '14px', 'marginBottom': '20px'}),
+            crear_grupo_input("Variación de cada parámetro (±%):", "input-variacion-sobol-moda", value=20, step=1),
+            html.Label("Muestras base:", style={'fontWeight': 'bold', 'color': 'green', 'fontSize': '14px'}),
+            dcc.Dropdown(id='dropdown-muestras-sobol-moda', options=[256, 1024, 4096], value=1024, clearable=False,
+                         style={'marginTop': '5px', 'marginBottom': '15px'}),
+            html.Button("Calcular Sensibilidad", id="btn-sobol-moda",
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '10px', 'fontSize': '16px'})
+        ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+
+        html.Div([
+            dcc.Graph(id='grafica-sobol-moda', style={'height': '450px', 'width': '100%'})
+        ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
+
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '40px auto 0 auto'})
     
 ], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
 
@@ -208,6 +298,87 @@ def actualizar_grafica_moda(n_clicks, N, b, k, I0, t_max):
         fig_empty.update_layout(title="Error: Ingrese valores positivos", paper_bgcolor='lightblue')
         return fig_empty
         
-    t, S, I, R = calcular_moda_sir(N, b, k, I0, t_max)
-    fig = crear_figura_moda(t, S, I, R, t_max)
-    return fig
\ No newline at end of file
+    with fase("resolver"):
+        t, S, I, R = calcular_moda_sir(N, b, k, I0, t_max)
+    with fase("figura"):
+        fig = crear_figura_moda(t, S, I, R, t_max)
+    return fig
+
+@callback(
+    Output('grafica-sobol-moda', 'figure'),
+    Input('btn-sobol-moda', 'n_clicks'),
+    State('input-N-moda', 'value'),
+    State('input-b-moda', 'value'),
+    State('input-k-moda', 'value'),
+    State('input-I0-moda', 'value'),
+    State('input-t-moda', 'value'),
+    State('input-variacion-sobol-moda', 'value'),
+    State('dropdown-muestras-sobol-moda', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_sobol_moda(n_clicks, N, b, k, I0, t_max, variacion, muestras_base):
+    if N is None: N = 1000
+    if b is None: b = 0.0005
+    if k is None: k = 0.1
+    if I0 is None: I0 = 5
+    if t_max is None: t_max = 60
+    if variacion is None: variacion = 20
+    if muestras_base is None: muestras_base = 1024
+    variacion = min(max(variacion, 1), 90)
+
+    if N <= 0 or t_max <= 0:
+        fig_empty = go.Figure()
+        fig_empty.update_layout(title="Error: Ingrese valores positivos", paper_bgcolor='lightblue')
+        return fig_empty
+
+    with fase("resolver"):
+        indices = sensibilidad_moda(N, b, k, I0, t_max, variacion, int(muestras_base))
+    with fase("figura"):
+        fig = crear_figura_sobol(indices)
+    return fig
+
+
+@callback(
+    Output('descarga-moda', 'href'),
+    Input('btn-generar-moda', 'n_clicks'),
+    Input('formato-descarga-moda', 'value'),
+    Input('puntos-descarga-moda', 'value'),
+    State('input-N-moda', 'value'),
+    State('input-b-moda', 'value'),
+    State('input-k-moda', 'value'),
+    State('input-I0-moda', 'value'),
+    State('input-t-moda', 'value'),
+)
+def enlace_descarga_moda(n_clicks, formato, puntos, N, b, k, I0, t_max):
+    return exportacion.enlace('moda', formato, N=N, b=b, k=k, I0=I0, t_max=t_max, puntos=puntos)
+
+
+# --- MODO EN VIVO ---
+clientside_callback(
+    ClientsideFunction(namespace='en_vivo', function_name='limitar'),
+    Output('store-en-vivo-moda', 'data'),
+    Input('slider-b-en-vivo-moda', 'value'),
+    Input('slider-k-en-vivo-moda', 'value'),
+    prevent_initial_call=True
+)
+
+@callback(
+    Output('grafica-moda-sir', 'figure', allow_duplicate=True),
+    Input('store-en-vivo-moda', 'data'),
+    State('input-N-moda', 'value'),
+    State('input-I0-moda', 'value'),
+    State('input-t-moda', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_moda_en_vivo(datos, N, I0, t_max):
+    with en_vivo.turno(datos, 'actualizar_moda_en_vivo') as (b, k):
+        if N is None: N = 1000
+        if I0 is None: I0 = 5
+        if t_max is None: t_max = 60
+        if N <= 0 or t_max <= 0:
+            return dash.no_update
+        with fase("resolver"):
+            t, S, I, R = calcular_moda_sir(N, b, k, I0, t_max)
+        with fase("figura"):
+            fig = crear_figura_moda(t, S, I, R, t_max)
+    return fig
@@ -0,0 +1,260 @@
+import base64
+import time
+
+import dash
+from dash import html, dcc, Input, Output, State, callback
+import plotly.graph_objects as go
+import numpy as np
+
+from modelos import SIR, RUMOR
+from modelos.ajuste import ajustar, leer_csv
+from servidor.metricas import fase
+
+dash.register_page(__name__, path='/Ajuste', name='Ajuste de Parámetros')
+
+# ==========================================
+# 1. ESTILOS Y MODELOS DISPONIBLES
+# ==========================================
+COLOR_FONDO_PAPEL = 'lightblue'
+COLOR_FONDO_GRAFICO = 'white'
+COLOR_GRID = 'lightpink'
+COLOR_TITULO = 'green'
+COLOR_TEXTO = 'black'
+COLORES = {'S': '#00BFFF', 'I': '#FF1493', 'R': '#9400D3'}
+
+# 'por_N': el parámetro de contagio se muestra como beta = b*N (página SIR);
+# en el rumor y la moda se usa b directamente, como en sus páginas
+MODELOS_AJUSTE = {
+    'sir': dict(nombre='Epidemia SIR', modelo=SIR, por_N=True, etiquetas=('β', 'γ'),
+                iniciales=(0.3, 0.1), N=1000),
+    'rumor': dict(nombre='Rumor', modelo=RUMOR, por_N=False, etiquetas=('b', 'k'),
+                  iniciales=(0.004, 0.01), N=275),
+    'moda': dict(nombre='Moda Crocs', modelo=SIR, por_N=False, etiquetas=('b', 'k'),
+                 iniciales=(0.0005, 0.1), N=1000),
+}
+
+NOMBRES_COMPARTIMENTOS = {'S': 'Susceptibles', 'I': 'Infectados', 'R': 'Recuperados'}
+
+texto_formato = """
+**Formato del CSV:** una columna de tiempo (`dia`) y una o más columnas de
+conteos: `S`/`susceptibles`, `I`/`infectados`/`casos`/`propagadores`,
+`R`/`recuperados`/`racionales`. Separador `,` o `;`. Las celdas vacías se
+ignoran.
+
+```
+dia,infectados,recuperados
+0,5,0
+1,7,1
+2,10,2
+```
+"""
+
+
+def crear_input_ajuste(label, id_input, value, step=None):
+    return html.Div([
+        html.Label(label, style={'fontWeight': 'bold', 'color': COLOR_TITULO, 'fontSize': '14px'}),
+        dcc.Input(
+            id=id_input, type="number", value=value, step=step or 'any',
+            style={'width': '100%', 'padding': '8px', 'borderRadius': '5px', 'border': '1px solid #ccc',
+                   'marginTop': '5px', 'marginBottom': '15px', 'boxSizing': 'border-box'}
+        )
+    ])
+
+# ==========================================
+# 2. LÓGICA MATEMÁTICA
+# ==========================================
+def decodificar_csv(contenido):
+    # dcc.Upload entrega "data:<tipo>;base64,<datos>"
+    _, datos = contenido.split(',', 1)
+    return base64.b64decode(datos).decode('utf-8-sig')
+
+
+def ajustar_datos(clave, texto, N, param1, param2, ajustar_I0=True):
+    config = MODELOS_AJUSTE[clave]
+    modelo = config['modelo']
+    t_obs, observaciones = leer_csv(texto, modelo.compartimentos)
+
+    # Condiciones iniciales tomadas de la primera fila observada
+    # (I0 >= 1 porque se ajusta en escala logarítmica)
+    I0 = observaciones['I'][0] if 'I' in observaciones and np.isfinite(observaciones['I'][0]) else 1.0
+    R0 = observaciones['R'][0] if 'R' in observaciones and np.isfinite(observaciones['R'][0]) else 0.0
+    I0 = max(I0, 1.0)
+    y0 = [N - I0 - R0, I0, R0]
+
+    b0 = param1 / N if config['por_N'] else param1
+    resultado = ajustar(modelo, t_obs, observaciones, y0, {'b': b0, 'k': param2},
+                        inicial='I' if ajustar_I0 else None)
+    return t_obs, observaciones, resultado
+
+# ==========================================
+# 3. GENERACIÓN DE GRÁFICOS
+# ==========================================
+def crear_figura_ajuste(t_obs, observaciones, resultado, titulo):
+    fig = go.Figure()
+    for i, c in enumerate(resultado.modelo.compartimentos):
+        color = COLORES.get(c, 'gray')
+        if c in observaciones:
+            fig.add_trace(go.Scatter(x=t_obs, y=observaciones[c], mode='markers',
+                                     name=f'{NOMBRES_COMPARTIMENTOS[c]} (datos)',
+                                     marker=dict(color=color, size=7, opacity=0.7)))
+        fig.add_trace(go.Scatter(x=resultado.t, y=resultado.curva[:, i], mode='lines',
+                                 name=f'{NOMBRES_COMPARTIMENTOS[c]} (ajuste)',
+                                 line=dict(color=color, width=3, dash='solid' if c in observaciones else 'dot')))
+
+    fig.update_layout(
+        title=dict(text=f"<b>{titulo}: datos y curva ajustada</b>", x=0.5, y=0.95,
+                   font=dict(size=18, color=COLOR_TITULO)),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Personas",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center',
+                    bgcolor='rgba(255,255,255,0.9)', bordercolor='#ddd', borderwidth=1),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
+        zeroline=True, zerolinewidth=2, zerolinecolor='red',
+        showline=True, linecolor=COLOR_TEXTO, linewidth=2, mirror=True
+    )
+    fig.update_xaxes(**estilo_ejes)
+    fig.update_yaxes(**estilo_ejes)
+    return fig
+
+# ==========================================
+# 4. LAYOUT
+# ==========================================
+layout = html.Div([
+
+    html.H1("Ajuste de Parámetros a Datos Observados",
+            style={'textAlign': 'center', 'color': COLOR_TITULO, 'marginBottom': '30px'}),
+
+    html.Div([
+        # --- COLUMNA IZQUIERDA: DATOS Y CONTROLES ---
+        html.Div([
+            html.H3("Datos", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+            dcc.Upload(
+                id='upload-datos-ajuste',
+                children=html.Div(["Arrastre o ", html.A("seleccione un CSV", style={'color': COLOR_TITULO, 'fontWeight': 'bold'})]),
+                style={'width': '100%', 'height': '60px', 'lineHeight': '60px', 'borderWidth': '2px',
+                       'borderStyle': 'dashed', 'borderColor': 'lightpink', 'borderRadius': '8px',
+                       'textAlign': 'center', 'backgroundColor': 'white', 'marginBottom': '10px', 'boxSizing': 'border-box'}
+            ),
+            html.Div(id='nombre-archivo-ajuste', style={'fontSize': '13px', 'color': 'gray', 'marginBottom': '15px'}),
+
+            html.Label("Modelo:", style={'fontWeight': 'bold', 'color': COLOR_TITULO, 'fontSize': '14px'}),
+            dcc.Dropdown(
+                id='dropdown-modelo-ajuste',
+                options=[{'label': c['nombre'], 'value': k} for k, c in MODELOS_AJUSTE.items()],
+                value='sir', clearable=False, style={'marginTop': '5px', 'marginBottom': '15px'}
+            ),
+
+            crear_input_ajuste("Población Total (N):", "input-N-ajuste", 1000, 1),
+            crear_input_ajuste("Valor inicial β / b:", "input-p1-ajuste", 0.3),
+            crear_input_ajuste("Valor inicial γ / k:", "input-p2-ajuste", 0.1),
+            dcc.Checklist(
+                id='check-I0-ajuste',
+                options=[{'label': ' Ajustar también I₀ (infectados del primer día)', 'value': 'I0'}],
+                value=['I0'], style={'marginBottom': '15px', 'fontSize': '14px'}
+            ),
+
+            html.Button("Ajustar", id="btn-ajustar",
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%',
+                               'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px'}),
+            dcc.Markdown(texto_formato, style={'fontSize': '13px', 'marginTop': '20px'})
+
+        ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+
+        # --- COLUMNA DERECHA: RESULTADOS ---
+        html.Div([
+            dcc.Graph(id='grafica-ajuste', style={'height': '550px', 'width': '100%'}),
+            html.Div(id='resultado-ajuste', style={'marginTop': '20px', 'padding': '15px', 'backgroundColor': 'white', 'borderRadius': '5px'})
+        ], style={'flex': '3', 'minWidth': '500px', 'padding': '10px'})
+
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1400px', 'margin': '0 auto'})
+
+], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
+
+# ==========================================
+# 5. CALLBACKS
+# ==========================================
+@callback(
+    [Output('input-N-ajuste', 'value'),
+     Output('input-p1-ajuste', 'value'),
+     Output('input-p2-ajuste', 'value')],
+    Input('dropdown-modelo-ajuste', 'value'),
+    prevent_initial_call=True
+)
+def valores_por_modelo(clave):
+    # Al cambiar de modelo se proponen los valores de su página
+    config = MODELOS_AJUSTE[clave]
+    return config['N'], *config['iniciales']
+
+
+@callback(
+    Output('nombre-archivo-ajuste', 'children'),
+    Input('upload-datos-ajuste', 'filename'),
+)
+def mostrar_nombre_archivo(nombre):
+    return f"Archivo: {nombre}" if nombre else "Ningún archivo cargado."
+
+
+@callback(
+    [Output('grafica-ajuste', 'figure'),
+     Output('resultado-ajuste', 'children')],
+    Input('btn-ajustar', 'n_clicks'),
+    State('upload-datos-ajuste', 'contents'),
+    State('dropdown-modelo-ajuste', 'value'),
+    State('input-N-ajuste', 'value'),
+    State('input-p1-ajuste', 'value'),
+    State('input-p2-ajuste', 'value'),
+    State('check-I0-ajuste', 'value'),
+    prevent_initial_call=True
+)
+def ejecutar_ajuste(n_clicks, contenido, clave, N, param1, param2, opciones):
+    config = MODELOS_AJUSTE.get(clave, MODELOS_AJUSTE['sir'])
+    if not N: N = config['N']
+    if not param1: param1 = config['iniciales'][0]
+    if not param2: param2 = config['iniciales'][1]
+
+    if not contenido:
+        return go.Figure(), html.P("Primero cargue un archivo CSV.", style={'color': 'red'})
+
+    inicio = time.perf_counter()
+    try:
+        with fase("resolver"):
+            t_obs, observaciones, resultado = ajustar_datos(clave, decodificar_csv(contenido), N, param1, param2,
+                                                            'I0' in (opciones or []))
+    except (ValueError, IndexError, UnicodeDecodeError) as e:
+        return go.Figure(), html.P(f"No se pudo leer o ajustar el archivo: {e}", style={'color': 'red'})
+    duracion = time.perf_counter() - inicio
+
+    with fase("figura"):
+        fig = crear_figura_ajuste(t_obs, observaciones, resultado, config['nombre'])
+
+    # Resultados en la escala de la página correspondiente
+    factor = N if config['por_N'] else 1.0
+    filas = []
+    ajustados = list(zip(config['etiquetas'], ('b', 'k'), (factor, 1.0)))
+    if 'I0' in resultado.intervalos:
+        ajustados.append(('I₀', 'I0', 1.0))
+    for etiqueta, nombre, escala in ajustados:
+        valor = resultado.parametros[nombre] * escala
+        bajo, alto = (v * escala for v in resultado.intervalos[nombre])
+        filas.append(html.Tr([html.Td(etiqueta), html.Td(f"{valor:.5g}"),
+                              html.Td(f"[{bajo:.5g}, {alto:.5g}]")]))
+
+    beta_N = resultado.parametros['b'] * N
+    r0 = beta_N / resultado.parametros['k']
+    resumen = html.Div([
+        html.H4("Estimaciones (intervalo de confianza 95%)", style={'color': COLOR_TITULO}),
+        html.Table([html.Tr([html.Th("Parámetro"), html.Th("Estimado"), html.Th("IC 95%")])] + filas,
+                   style={'width': '100%', 'textAlign': 'left', 'marginBottom': '10px'}),
+        html.P(f"R₀ estimado = {r0:.2f}. Error cuadrático medio: {resultado.rms:.2f} personas."),
+        html.P(f"{resultado.evaluaciones} evaluaciones del modelo en {duracion * 1e3:.0f} ms"
+               f"{'' if resultado.exito else ' (el optimizador no convergió: ' + resultado.mensaje + ')'}.",
+               style={'fontSize': '12px', 'color': 'gray'})
+    ])
+    return fig, resumen
@@ -4,6 +4,9 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.figure_factory as ff 
 
+from modelos.expresiones import compilar
+from servidor.metricas import fase
+
 dash.register_page(__name__, path="/Campo_Vectorial", name="Campo Vectorial")
 
 # ==========================================
@@ -92,60 +95,31 @@ layout = html.Div([
 
 
 # ==========================================
-# 3. LÓGICA (CALLBACK)
+# 3. LÓGICA MATEMÁTICA
 # ==========================================
-@callback(
-    [Output("grafica-campo-c5", "figure"),
-     Output("info-campo-c5", "children")],
-     Input("btn-generar-c5", "n_clicks"),
-     State("input-fx-c5", "value"),
-     State("input-fy-c5", "value"),
-     State("input-xmax-c5", "value"),
-     State("input-ymax-c5", "value"),
-     State("input-n-c5", "value"),
-     prevent_initial_call=False
-)
-def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
-    
-    # Validaciones básicas
-    if not n or n < 5: n = 5
-    if n > 50: n = 50 # Límite para rendimiento
-    if not xmax: xmax = 5
-    if not ymax: ymax = 5
-
+def evaluar_campo(fx_str, fy_str, xmax, ymax, n):
     x = np.linspace(-xmax, xmax, n)
     y = np.linspace(-ymax, ymax, n)
     X, Y = np.meshgrid(x, y)
+
+    # Expresiones validadas y compiladas (sin eval sobre el texto del usuario)
+    fx = compilar(fx_str)(X, Y)
+    fy = compilar(fy_str)(X, Y)
     
-    try:
-        # Diccionario seguro para eval
-        diccionario = {
-            "x": X, "y": Y, "np": np,
-            "sin": np.sin, "cos": np.cos, "tan": np.tan,
-            "exp": np.exp, 'sqrt': np.sqrt, 'pi': np.pi, 'e': np.e 
-        }
-        
-        fx = eval(fx_str, {}, diccionario)
-        fy = eval(fy_str, {}, diccionario)
-        
-        # Normalización para visualización limpia
-        mag = np.sqrt(fx**2 + fy**2)
-        # Evitar división por cero
-        mag_safe = np.where(mag == 0, 1, mag) 
-        
-        # Vectores unitarios para dirección (opcional, aquí normalizamos un poco)
-        fx_norm = fx / mag_safe
-        fy_norm = fy / mag_safe
-        
-        info_mensaje = f"Rango evaluado: [-{xmax}, {xmax}]"
-        
-    except Exception as error:
-        # Retornar gráfico vacío con mensaje de error
-        fig_error = go.Figure()
-        fig_error.add_annotation(text=f"Error en sintaxis: {str(error)}", x=0.5, y=0.5, showarrow=False, font=dict(color="red", size=14))
-        fig_error.update_layout(paper_bgcolor=COLOR_FONDO_PAPEL, plot_bgcolor=COLOR_FONDO_GRAFICO)
-        return fig_error, "Error de cálculo"
+    # Normalización para visualización limpia
+    mag = np.sqrt(fx**2 + fy**2)
+    # Evitar división por cero
+    mag_safe = np.where(mag == 0, 1, mag) 
+    
+    # Vectores unitarios para dirección (opcional, aquí normalizamos un poco)
+    fx_norm = fx / mag_safe
+    fy_norm = fy / mag_safe
+    return X, Y, fx_norm, fy_norm
 
+# ==========================================
+# 4. GENERACIÓN DE GRÁFICOS
+# ==========================================
+def crear_figura_campo(X, Y, fx_norm, fy_norm, fx_str, fy_str, xmax, ymax):
     # Crear Quiver Plot (Flechas)
     fig = ff.create_quiver(
         X, Y, fx_norm, fy_norm,
@@ -187,4 +161,42 @@ def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
     # Mantener aspecto cuadrado (importante para campos vectoriales)
     fig.update_yaxes(scaleanchor="x", scaleratio=1)
     
+    return fig
+
+# ==========================================
+# 5. CALLBACKS
+# ==========================================
+@callback(
+    [Output("grafica-campo-c5", "figure"),
+     Output("info-campo-c5", "children")],
+     Input("btn-generar-c5", "n_clicks"),
+     State("input-fx-c5", "value"),
+     State("input-fy-c5", "value"),
+     State("input-xmax-c5", "value"),
+     State("input-ymax-c5", "value"),
+     State("input-n-c5", "value"),
+     prevent_initial_call=False
+)
+def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
+    
+    # Validaciones básicas
+    if not n or n < 5: n = 5
+    if n > 50: n = 50 # Límite para rendimiento
+    if not xmax: xmax = 5
+    if not ymax: ymax = 5
+    
+    try:
+        with fase("resolver"):
+            X, Y, fx_norm, fy_norm = evaluar_campo(fx_str, fy_str, xmax, ymax, n)
+        info_mensaje = f"Rango evaluado: [-{xmax}, {xmax}]"
+        
+    except Exception as error:
+        # Retornar gráfico vacío con mensaje de error
+        fig_error = go.Figure()
+        fig_error.add_annotation(text=f"Error en sintaxis: {str(error)}", x=0.5, y=0.5, showarrow=False, font=dict(color="red", size=14))
+        fig_error.update_layout(paper_bgcolor=COLOR_FONDO_PAPEL, plot_bgcolor=COLOR_FONDO_GRAFICO)
+        return fig_error, "Error de cálculo"
+
+    with fase("figura"):
+        fig = crear_figura_campo(X, Y, fx_norm, fy_norm, fx_str, fy_str, xmax, ymax)
     return fig, info_mensaje
\ No newline at end of file
@@ -3,6 +3,11 @@ from dash import html, dcc, Input, Output, State, callback
 import plotly.graph_objects as go
 import numpy as np
 
+from modelos.horizonte import FILAS_POR_BLOQUE
+from modelos.logistico import logistica
+from servidor import exportacion
+from servidor.metricas import fase
+
 dash.register_page(__name__, path='/Crecimiento_Logistico', name='Crecimiento Logístico')
 
 # ==========================================
@@ -44,6 +49,18 @@ ESTILO_BTN = {
     'fontSize': '16px'
 }
 
+# ==========================================
+# EXPORTACIÓN (solución cerrada evaluada por bloques)
+# ==========================================
+def exportar_poblacion(P0, r, K, t_max, puntos):
+    paso = t_max / (puntos - 1)
+    for inicio in range(0, puntos, FILAS_POR_BLOQUE):
+        t = np.arange(inicio, min(inicio + FILAS_POR_BLOQUE, puntos)) * paso
+        yield np.column_stack([t, logistica(t, P0, r, K)])
+
+exportacion.registrar('poblacion', ('t', 'P'), dict(P0=20.0, r=0.1, K=1000.0, t_max=100.0, puntos=200),
+                      exportar_poblacion, positivos=('K',))
+
 # ==========================================
 # LAYOUT DE LA PÁGINA
 # ==========================================
@@ -76,7 +93,9 @@ layout = html.Div([
                 dcc.Input(id="input-t", type="number", value=100, style=ESTILO_INPUT)
             ]),
             
-            html.Button("Generar gráfico", id="btn-generar", style=ESTILO_BTN)
+            html.Button("Generar gráfico", id="btn-generar", style=ESTILO_BTN),
+
+            exportacion.controles("poblacion", 200)
             
         ], style={'flex': '1', 'minWidth': '300px', **ESTILO_CONTENEDOR_INPUT}),
         
@@ -135,69 +154,79 @@ def actualizar_grafica(n_clicks, P0, r, K, t_max):
         return fig_empty
 
     # Cálculo matemático
-    t = np.linspace(0, t_max, 200)
-    if K == 0:
-        P = np.full(200, P0)
-    else:
-        denominador = (K - P0) + P0 * np.exp(r * t)
-        # Evitar división por cero
-        with np.errstate(divide='ignore', invalid='ignore'):
-             numerador = P0 * K * np.exp(r * t)
-             P = np.where(denominador == 0, 0, numerador / denominador)
-
-    # Crear trazos
-    trace_poblacion = go.Scatter(
-        x=t, y=P,
-        mode='lines',
-        name='Población P(t)',
-        line=dict(color=COLOR_DATOS, width=3),
-        hovertemplate='t: %{x:.2f}<br>P(t):%{y:.2f}<extra></extra>'
-    )
+    with fase("resolver"):
+        t = np.linspace(0, t_max, 200)
+        # Forma K / (1 + A e^{-rt}): sin desbordes aunque r*t sea muy grande
+        P = logistica(t, P0, r, K)
+
+    with fase("figura"):
+        # Crear trazos
+        trace_poblacion = go.Scatter(
+            x=t, y=P,
+            mode='lines',
+            name='Población P(t)',
+            line=dict(color=COLOR_DATOS, width=3),
+            hovertemplate='t: %{x:.2f}<br>P(t):%{y:.2f}<extra></extra>'
+        )
     
-    trace_capacidad = go.Scatter(
-        x=[0, t_max], y=[K, K],
-        mode='lines',
-        name='Capacidad de Carga (K)',
-        line=dict(color=COLOR_LIMITE, width=2, dash='dash'),
-        hovertemplate='K: %{y:.2f}<extra></extra>'
-    )
-
-    fig = go.Figure(data=[trace_poblacion, trace_capacidad])
+        trace_capacidad = go.Scatter(
+            x=[0, t_max], y=[K, K],
+            mode='lines',
+            name='Capacidad de Carga (K)',
+            line=dict(color=COLOR_LIMITE, width=2, dash='dash'),
+            hovertemplate='K: %{y:.2f}<extra></extra>'
+        )
+
+        fig = go.Figure(data=[trace_poblacion, trace_capacidad])
     
-    # Configuración del diseño (Layout)
-    fig.update_layout(
-        title=dict(
-            text='<b>Dinámica Poblacional</b>',
-            font=dict(size=20, color=COLOR_TITULO),
-            x=0.5, y=0.95
-        ),
-        xaxis_title='Tiempo (t)',
-        yaxis_title='Población',
-        margin=dict(l=40, r=40, t=70, b=40),
+        # Configuración del diseño (Layout)
+        fig.update_layout(
+            title=dict(
+                text='<b>Dinámica Poblacional</b>',
+                font=dict(size=20, color=COLOR_TITULO),
+                x=0.5, y=0.95
+            ),
+            xaxis_title='Tiempo (t)',
+            yaxis_title='Población',
+            margin=dict(l=40, r=40, t=70, b=40),
         
-        # APLICACIÓN DE COLORES CLAROS
-        paper_bgcolor=COLOR_FONDO_PAPEL,
-        plot_bgcolor=COLOR_FONDO_GRAFICO,
-        font=dict(color=COLOR_TEXTO),
+            # APLICACIÓN DE COLORES CLAROS
+            paper_bgcolor=COLOR_FONDO_PAPEL,
+            plot_bgcolor=COLOR_FONDO_GRAFICO,
+            font=dict(color=COLOR_TEXTO),
         
-        legend=dict(
-            orientation='h',
-            yanchor='bottom', y=1.02, xanchor='right', x=1,
-            bgcolor='rgba(255,255,255,0.6)'
+            legend=dict(
+                orientation='h',
+                yanchor='bottom', y=1.02, xanchor='right', x=1,
+                bgcolor='rgba(255,255,255,0.6)'
+            )
         )
-    )
 
-    # Configuración de Ejes
-    estilo_ejes = dict(
-        showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
-        zeroline=True, zerolinewidth=1, zerolinecolor='red',
-        showline=True, linecolor=COLOR_TEXTO, linewidth=1, mirror=True
-    )
+        # Configuración de Ejes
+        estilo_ejes = dict(
+            showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
+            zeroline=True, zerolinewidth=1, zerolinecolor='red',
+            showline=True, linecolor=COLOR_TEXTO, linewidth=1, mirror=True
+        )
 
-    fig.update_xaxes(**estilo_ejes, range=[0, t_max])
+        fig.update_xaxes(**estilo_ejes, range=[0, t_max])
     
-    y_max = max(K, np.max(P)) * 1.1 if len(P) > 0 else K * 1.1
-    if y_max == 0: y_max = 10
-    fig.update_yaxes(**estilo_ejes, range=[0, y_max])
+        y_max = max(K, np.nanmax(P)) * 1.1 if len(P) > 0 else K * 1.1
+        if y_max == 0: y_max = 10
+        fig.update_yaxes(**estilo_ejes, range=[0, y_max])
+
+    return fig
+
 
-    return fig
\ No newline at end of file
+@callback(
+    Output('descarga-poblacion', 'href'),
+    Input('btn-generar', 'n_clicks'),
+    Input('formato-descarga-poblacion', 'value'),
+    Input('puntos-descarga-poblacion', 'value'),
+    State('input-p0', 'value'),
+    State('input-r', 'value'),
+    State('input-k', 'value'),
+    State('input-t', 'value'),
+)
+def enlace_descarga_poblacion(n_clicks, formato, puntos, P0, r, K, t_max):
+    return exportacion.enlace('poblacion', formato, P0=P0, r=r, K=K, t_max=t_max, puntos=puntos)
@@ -1,8 +1,14 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State
 import numpy as np
 import plotly.graph_objects as go
-from scipy.integrate import odeint
+
+from modelos import SIR
+from modelos.sustituto import aproximar_sir, error_tabla
+from modelos.horizonte import resolver_normalizado, resolver_en_bloques
+from servidor import en_vivo, exportacion
+from servidor.metricas import fase
+from servidor.vuelo_unico import vuelo_unico
 
 dash.register_page(__name__, path="/SIR", name="Modelo SIR")
 
@@ -49,20 +55,109 @@ def crear_input_sir(label, id_input, value, step=1, min_val=0):
 # ==========================================
 # 2. LÓGICA MATEMÁTICA
 # ==========================================
-def modelo_sir(y, t, b, g, N):
-    S, I, R = y
-    # Asegurar no negatividad
-    S = max(0, S)
-    I = max(0, I)
+# dS/dt = -b*S*I/N: se usa modelos.SIR con el contagio ya dividido por N.
+# Se resuelve en forma adimensional: escenarios con el mismo R0 e I0/N
+# (de esta u otras páginas) comparten la integración; al cambiar solo "Días
+# a simular" se integra únicamente el tramo nuevo, y las solicitudes
+# idénticas simultáneas comparten una sola integración
+@vuelo_unico
+def resolver_sir(n, beta, gamma, y0, t):
+    return resolver_normalizado(SIR, y0, t, b=beta / n, k=gamma)
+
+# --- MODO PROGRESIVO ---
+# La malla de tiempo se reparte en tramos: el primero se dibuja con la figura
+# y cada tic del dcc.Interval agrega el siguiente a las curvas con
+# extendData (solo los puntos nuevos). Cada tramo pasa por la trayectoria
+# guardada del escenario, que continúa la integración desde donde quedó.
+PUNTOS_SIR = 200
+TRAMOS_PROGRESIVOS = 10
+INTERVALO_PROGRESIVO_MS = 100
+
+def limites_tramo(i, puntos=PUNTOS_SIR, tramos=TRAMOS_PROGRESIVOS):
+    # Índices [inicio, fin] de la malla que cubre el tramo i (comparten el
+    # punto de unión con el tramo anterior)
+    return i * (puntos - 1) // tramos, (i + 1) * (puntos - 1) // tramos
+
+def resolver_tramo(estado):
+    # Resuelve hasta el tramo estado['tramo'] y devuelve (t, solucion) con los
+    # puntos nuevos (sin el punto de unión, que ya está dibujado)
+    t = np.linspace(0, estado['tiempo_max'], PUNTOS_SIR)
+    inicio, fin = limites_tramo(estado['tramo'])
+    solucion = resolver_sir(estado['n'], estado['beta'], estado['gamma'], estado['y0'], t[:fin + 1])
+    return t[inicio + 1:fin + 1], solucion[inicio + 1:]
+
+# --- EXPORTACIÓN (CSV/Parquet por bloques) ---
+def exportar_sir(n, beta, gamma, I0, tiempo_max, puntos):
+    for t, solucion in resolver_en_bloques(SIR, [n - I0, I0, 0], tiempo_max, puntos, b=beta / n, k=gamma):
+        yield np.column_stack([t, solucion])
+
+exportacion.registrar('sir', ('t', 'S', 'I', 'R'),
+                      dict(n=1000.0, beta=0.3, gamma=0.1, I0=1.0, tiempo_max=100.0, puntos=PUNTOS_SIR),
+                      exportar_sir, horizonte='tiempo_max', positivos=('n',))
+
+
+# ==========================================
+# 3. GENERACIÓN DE GRÁFICOS
+# ==========================================
+def crear_figura_sir(t, S, I, R, beta, gamma):
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=t, y=S, mode='lines', name='Susceptibles',
+        line=dict(color=COLOR_SUCEPTIBLES, width=3),
+        hovertemplate="Día %{x:.0f}: %{y:.0f} Susceptibles<extra></extra>"
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=t, y=I, mode='lines', name='Infectados',
+        line=dict(color=COLOR_INFECTADOS, width=3),
+        fill='tozeroy', fillcolor='rgba(255, 20, 147, 0.1)', # Relleno suave rosa
+        hovertemplate="Día %{x:.0f}: %{y:.0f} Infectados<extra></extra>"
+    ))
     
-    dS_dt = -b * S * I / N
-    dI_dt = b * S * I / N - g * I
-    dR_dt = g * I
-    return [dS_dt, dI_dt, dR_dt]
+    fig.add_trace(go.Scatter(
+        x=t, y=R, mode='lines', name='Recuperados',
+        line=dict(color=COLOR_RECUPERADOS, width=3),
+        hovertemplate="Día %{x:.0f}: %{y:.0f} Recuperados<extra></extra>"
+    ))
+
+    # Cálculo del número reproductivo básico
+    r0_val = beta / gamma if gamma != 0 else 0
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Evolución del Modelo SIR (R₀ ≈ {r0_val:.2f})</b>",
+            font=dict(color=COLOR_TITULO, size=20),
+            x=0.5, y=0.95
+        ),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Número de personas",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(
+            orientation='h', y=1.02, x=0.5, xanchor='center', 
+            bgcolor='rgba(255,255,255,0.8)', bordercolor='#ddd', borderwidth=1
+        ),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+
+    # Configuración de ejes (Grid Rosa)
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
+        zeroline=True, zerolinewidth=2, zerolinecolor=COLOR_ZEROLINE,
+        showline=True, linecolor=COLOR_TEXTO, linewidth=2, mirror=True,
+    )
+    
+    fig.update_xaxes(**estilo_ejes)
+    fig.update_yaxes(**estilo_ejes)
+
+    return fig
 
 
 # ==========================================
-# 3. LAYOUT
+# 4. LAYOUT
 # ==========================================
 layout = html.Div([
     
@@ -80,16 +175,36 @@ layout = html.Div([
             crear_input_sir("Tasa de recuperación (γ):", "input-g-sir", 0.1, 0.01),
             crear_input_sir("Infectados iniciales (I₀):", "input-I0-sir", 1, 1),
             crear_input_sir("Días a simular:", "input-tiempo-sir", 100, 10),
+            dcc.Checklist(
+                id="check-progresivo-sir",
+                options=[{'label': ' Dibujar por tramos (modo progresivo)', 'value': 'progresivo'}],
+                value=[],
+                style={'color': COLOR_TITULO, 'fontSize': '14px', 'marginBottom': '10px'}
+            ),
             
             html.Button("Generar Simulación", id="btn-generar-sir", 
                         style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 
-                               'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px', 'marginTop': '10px'})
+                               'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px', 'marginTop': '10px'}),
+
+            exportacion.controles("sir", PUNTOS_SIR),
+
+            # --- MODO EN VIVO: la gráfica sigue a los deslizadores ---
+            html.H4("Modo en vivo", style={'color': COLOR_TITULO, 'marginTop': '20px'}),
+            en_vivo.deslizador("β (arrastre):", "slider-beta-en-vivo-sir", 0.01, 1.0, 0.01, 0.3),
+            en_vivo.deslizador("γ (arrastre):", "slider-gamma-en-vivo-sir", 0.01, 1.0, 0.01, 0.1),
+            dcc.Store(id="store-en-vivo-sir")
 
         ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
         
         # --- COLUMNA DERECHA: GRÁFICO ---
         html.Div([
-            dcc.Graph(id="grafica-sir", style={"height":"500px","width":"100%"})
+            dcc.Graph(id="grafica-sir", style={"height":"500px","width":"100%"}),
+            html.Div(id="info-aproximacion-sir", style={'fontSize': '13px', 'color': 'gray', 'textAlign': 'center'}),
+            # Curva aproximada ya dibujada: dispara la solución exacta
+            dcc.Store(id="store-aproximado-sir"),
+            # Estado del modo progresivo: parámetros, último estado y tramo siguiente
+            dcc.Store(id="store-progresivo-sir"),
+            dcc.Interval(id="intervalo-progresivo-sir", interval=INTERVALO_PROGRESIVO_MS, disabled=True)
         ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
 
     ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'})
@@ -98,93 +213,174 @@ layout = html.Div([
 
 
 # ==========================================
-# 4. CALLBACKS
+# 5. CALLBACKS
 # ==========================================
+def valores_sir(n, beta, gamma, I0, tiempo_max):
+    # Validaciones y valores por defecto para evitar errores
+    if not n: n = 1000
+    if not beta: beta = 0.3
+    if not gamma: gamma = 0.1
+    if not I0: I0 = 1
+    if not tiempo_max: tiempo_max = 100
+    return n, beta, gamma, I0, tiempo_max
+
+def aproximacion_sir(n, beta, gamma, y0, t):
+    # Curva de la tabla sustituta (modelos/sustituto.py) o None
+    return aproximar_sir(y0, t, b=beta / n, k=gamma)
+
+# Primero la curva aproximada (instantánea, sin integrar); al llegar al
+# store, simular_sir la reemplaza por la solución exacta
 @callback(
-    Output("grafica-sir", "figure"),
+    [Output("grafica-sir", "figure", allow_duplicate=True),
+     Output("store-aproximado-sir", "data"),
+     Output("info-aproximacion-sir", "children")],
     Input("btn-generar-sir", "n_clicks"),
     State("input-n-sir", "value"),
     State("input-b-sir", "value"),
     State("input-g-sir", "value"),
     State("input-I0-sir", "value"),
     State("input-tiempo-sir", "value"),
-    prevent_initial_call=False
+    State("check-progresivo-sir", "value"),
+    prevent_initial_call='initial_duplicate'
 )
-def simular_sir(n_clicks, n, beta, gamma, I0, tiempo_max):
-    
-    # Validaciones y valores por defecto para evitar errores
-    if not n: n = 1000
-    if not beta: beta = 0.3
-    if not gamma: gamma = 0.1
-    if not I0: I0 = 1
-    if not tiempo_max: tiempo_max = 100
+def aproximar_simulacion_sir(n_clicks, n, beta, gamma, I0, tiempo_max, progresivo):
+    n, beta, gamma, I0, tiempo_max = valores_sir(n, beta, gamma, I0, tiempo_max)
+    t = np.linspace(0, tiempo_max, PUNTOS_SIR)
+    aproximada = None if progresivo else aproximacion_sir(n, beta, gamma, [n - I0, I0, 0], t)
+    if aproximada is None:
+        return dash.no_update, {'n_clicks': n_clicks, 'aproximado': False}, ""
+
+    with fase("figura"):
+        fig = crear_figura_sir(t, *aproximada.T, beta, gamma)
+        fig.update_layout(title_text=fig.layout.title.text + " (aproximación)")
+    aviso = (f"Curva aproximada (error típico ≤ {100 * error_tabla():.1f} % de N); "
+             "calculando la solución exacta...")
+    return fig, {'n_clicks': n_clicks, 'aproximado': True}, aviso
+
+@callback(
+    [Output("grafica-sir", "figure"),
+     Output("store-progresivo-sir", "data"),
+     Output("intervalo-progresivo-sir", "disabled"),
+     Output("info-aproximacion-sir", "children", allow_duplicate=True)],
+    Input("store-aproximado-sir", "data"),
+    State("input-n-sir", "value"),
+    State("input-b-sir", "value"),
+    State("input-g-sir", "value"),
+    State("input-I0-sir", "value"),
+    State("input-tiempo-sir", "value"),
+    State("check-progresivo-sir", "value"),
+    prevent_initial_call=True
+)
+def simular_sir(solicitud, n, beta, gamma, I0, tiempo_max, progresivo):
+    n, beta, gamma, I0, tiempo_max = valores_sir(n, beta, gamma, I0, tiempo_max)
         
     S0 = n - I0 
     R0_inicial = 0
     y0 = [S0, I0, R0_inicial]
-    t = np.linspace(0, tiempo_max, 200) 
+    t = np.linspace(0, tiempo_max, PUNTOS_SIR) 
+
+    if progresivo:
+        return (*simular_sir_progresivo(n, beta, gamma, y0, t), "")
     
     try:
-        solucion = odeint(modelo_sir, y0, t, args=(beta, gamma, n))
+        with fase("resolver"):
+            solucion = resolver_sir(n, beta, gamma, y0, t)
         S, I, R = solucion.T
     except Exception as e:
         fig_error = go.Figure()
         fig_error.add_annotation(text="Error de cálculo", showarrow=False)
         fig_error.update_layout(paper_bgcolor=COLOR_FONDO_PAPEL, plot_bgcolor=COLOR_FONDO_GRAFICO)
-        return fig_error
+        return fig_error, None, True, ""
+
+    # Diferencia real entre la aproximación que se mostró y la solución exacta
+    info = ""
+    if solicitud and solicitud.get('aproximado'):
+        aproximada = aproximacion_sir(n, beta, gamma, y0, t)
+        if aproximada is not None:
+            info = f"Solución exacta. La aproximación se desvió como máximo un {100 * np.abs(aproximada - solucion).max() / n:.2f} % de N."
 
     # Construcción del gráfico claro
-    fig = go.Figure()
+    with fase("figura"):
+        fig = crear_figura_sir(t, S, I, R, beta, gamma)
+    return fig, None, True, info
 
-    fig.add_trace(go.Scatter(
-        x=t, y=S, mode='lines', name='Susceptibles',
-        line=dict(color=COLOR_SUCEPTIBLES, width=3),
-        hovertemplate="Día %{x:.0f}: %{y:.0f} Susceptibles<extra></extra>"
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=t, y=I, mode='lines', name='Infectados',
-        line=dict(color=COLOR_INFECTADOS, width=3),
-        fill='tozeroy', fillcolor='rgba(255, 20, 147, 0.1)', # Relleno suave rosa
-        hovertemplate="Día %{x:.0f}: %{y:.0f} Infectados<extra></extra>"
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=t, y=R, mode='lines', name='Recuperados',
-        line=dict(color=COLOR_RECUPERADOS, width=3),
-        hovertemplate="Día %{x:.0f}: %{y:.0f} Recuperados<extra></extra>"
-    ))
+def simular_sir_progresivo(n, beta, gamma, y0, t):
+    # Primer tramo: figura completa con el eje x fijo en todo el horizonte
+    _, fin = limites_tramo(0)
+    with fase("resolver"):
+        solucion = resolver_sir(n, beta, gamma, y0, t[:fin + 1])
+    with fase("figura"):
+        fig = crear_figura_sir(t[:fin + 1], *solucion.T, beta, gamma)
+        fig.update_xaxes(range=[0, t[-1]])
+        fig.update_yaxes(range=[0, n * 1.05])
+    estado = {'n': n, 'beta': beta, 'gamma': gamma, 'tiempo_max': float(t[-1]),
+              'y0': list(y0), 'tramo': 1}
+    return fig, estado, False
 
-    # Cálculo del número reproductivo básico
-    r0_val = beta / gamma if gamma != 0 else 0
+@callback(
+    [Output("grafica-sir", "extendData"),
+     Output("store-progresivo-sir", "data", allow_duplicate=True),
+     Output("intervalo-progresivo-sir", "disabled", allow_duplicate=True)],
+    Input("intervalo-progresivo-sir", "n_intervals"),
+    State("store-progresivo-sir", "data"),
+    prevent_initial_call=True
+)
+def extender_sir(n_intervals, estado):
+    if not estado or estado['tramo'] >= TRAMOS_PROGRESIVOS:
+        return dash.no_update, dash.no_update, True
 
-    fig.update_layout(
-        title=dict(
-            text=f"<b>Evolución del Modelo SIR (R₀ ≈ {r0_val:.2f})</b>",
-            font=dict(color=COLOR_TITULO, size=20),
-            x=0.5, y=0.95
-        ),
-        xaxis_title="Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor=COLOR_FONDO_PAPEL,
-        plot_bgcolor=COLOR_FONDO_GRAFICO,
-        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
-        legend=dict(
-            orientation='h', y=1.02, x=0.5, xanchor='center', 
-            bgcolor='rgba(255,255,255,0.8)', bordercolor='#ddd', borderwidth=1
-        ),
-        margin=dict(l=40, r=40, t=60, b=40),
-        hovermode="x unified"
-    )
+    with fase("resolver"):
+        t, solucion = resolver_tramo(estado)
+    estado = dict(estado, tramo=estado['tramo'] + 1)
+    # Las tres curvas (S, I, R) reciben los mismos tiempos nuevos
+    nuevos = dict(x=[t] * 3, y=list(solucion.T))
+    return (nuevos, [0, 1, 2], PUNTOS_SIR), estado, estado['tramo'] >= TRAMOS_PROGRESIVOS
 
-    # Configuración de ejes (Grid Rosa)
-    estilo_ejes = dict(
-        showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
-        zeroline=True, zerolinewidth=2, zerolinecolor=COLOR_ZEROLINE,
-        showline=True, linecolor=COLOR_TEXTO, linewidth=2, mirror=True,
-    )
-    
-    fig.update_xaxes(**estilo_ejes)
-    fig.update_yaxes(**estilo_ejes)
 
-    return fig
\ No newline at end of file
+@callback(
+    Output("descarga-sir", "href"),
+    Input("btn-generar-sir", "n_clicks"),
+    Input("formato-descarga-sir", "value"),
+    Input("puntos-descarga-sir", "value"),
+    State("input-n-sir", "value"),
+    State("input-b-sir", "value"),
+    State("input-g-sir", "value"),
+    State("input-I0-sir", "value"),
+    State("input-tiempo-sir", "value"),
+)
+def enlace_descarga_sir(n_clicks, formato, puntos, n, beta, gamma, I0, tiempo_max):
+    # El archivo se genera al pedirlo, con los parámetros de la última simulación
+    return exportacion.enlace('sir', formato, n=n, beta=beta, gamma=gamma, I0=I0,
+                              tiempo_max=tiempo_max, puntos=puntos)
+
+
+# --- MODO EN VIVO ---
+# El navegador limita los envíos del arrastre; el servidor descarta los
+# que ya fueron superados antes de resolver (servidor/en_vivo.py)
+clientside_callback(
+    ClientsideFunction(namespace='en_vivo', function_name='limitar'),
+    Output("store-en-vivo-sir", "data"),
+    Input("slider-beta-en-vivo-sir", "value"),
+    Input("slider-gamma-en-vivo-sir", "value"),
+    prevent_initial_call=True
+)
+
+@callback(
+    Output("grafica-sir", "figure", allow_duplicate=True),
+    Input("store-en-vivo-sir", "data"),
+    State("input-n-sir", "value"),
+    State("input-I0-sir", "value"),
+    State("input-tiempo-sir", "value"),
+    prevent_initial_call=True
+)
+def simular_sir_en_vivo(datos, n, I0, tiempo_max):
+    with en_vivo.turno(datos, 'simular_sir_en_vivo') as (beta, gamma):
+        if not n: n = 1000
+        if not I0: I0 = 1
+        if not tiempo_max: tiempo_max = 100
+        t = np.linspace(0, tiempo_max, PUNTOS_SIR)
+        with fase("resolver"):
+            solucion = resolver_sir(n, beta, gamma, [n - I0, I0, 0], t)
+        with fase("figura"):
+            fig = crear_figura_sir(t, *solucion.T, beta, gamma)
+    return fig
@@ -3,7 +3,9 @@ from dash import html, dcc, Input, Output, State, callback
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from scipy.integrate import odeint
+
+from modelos import RUMOR
+from servidor.metricas import fase
 
 # Configuración de la app (ajustar según tu estructura de proyecto)
 dash.register_page(__name__, path='/comparacion_escenarios', name='Comparacion Escenarios')
@@ -12,20 +14,14 @@ dash.register_page(__name__, path='/comparacion_escenarios', name='Comparacion E
 # 1. LÓGICA MATEMÁTICA (MODELO SIR RUMOR)
 # ==========================================
 def resolver_sir_rumor(N, b, k, S0, I0, R0, t_max, num_puntos=200):
-    # Ecuaciones Diferenciales
-    def deriv(y, t, N, b, k):
-        S, I, R = y
-        dSdt = -b * S * I
-        dIdt = b * S * I - k * I
-        dRdt = k * I
-        return dSdt, dIdt, dRdt
+    # Ecuaciones: dS/dt = -b*S*I, dI/dt = b*S*I - k*I, dR/dt = k*I (modelos.RUMOR)
 
     # Vector de tiempo
     t = np.linspace(0, t_max, num_puntos)
     y0 = (S0, I0, R0)
     
     # Resolver EDO
-    ret = odeint(deriv, y0, t, args=(N, b, k))
+    ret = RUMOR.resolver(y0, t, b=b, k=k)
     S, I, R = ret.T
     return t, S, I, R
 
@@ -193,8 +189,10 @@ def actualizar_grafica(n_clicks, N, b, k1, k2, I0, days):
     S0 = N - I0 - R_init
 
     # Simular
-    t, S1, I1, R1 = resolver_sir_rumor(N, b, k1, S0, I0, R_init, days)
-    _, S2, I2, R2 = resolver_sir_rumor(N, b, k2, S0, I0, R_init, days)
+    with fase("resolver"):
+        t, S1, I1, R1 = resolver_sir_rumor(N, b, k1, S0, I0, R_init, days)
+        _, S2, I2, R2 = resolver_sir_rumor(N, b, k2, S0, I0, R_init, days)
 
     # Crear Figura
-    return crear_figura_replica(t, (S1, I1, R1), (S2, I2, R2), k1, k2)
\ No newline at end of file
+    with fase("figura"):
+        return crear_figura_replica(t, (S1, I1, R1), (S2, I2, R2), k1, k2)
\ No newline at end of file
@@ -3,6 +3,8 @@ from dash import html, dcc
 import plotly.graph_objects as go
 import numpy as np
 
+from modelos import LOTKA_VOLTERRA
+
 dash.register_page(__name__, path='/inicio', name='Inicio')
 
 # ==========================================
@@ -40,10 +42,9 @@ fig_3d.update_layout(
     scene=dict(xaxis_title='X', yaxis_title='Y', zaxis_title='Z')
 )
 
-# --- Modelo C: Predador-Presa (Simulación Temporal) ---
-time = np.linspace(0, 15, 100)
-prey = 10 + 5 * np.sin(time)
-predator = 5 + 4 * np.sin(time - 1.5)
+# --- Modelo C: Predador-Presa (Lotka-Volterra, ver página Depredador-Presa) ---
+time = np.linspace(0, 15, 300)
+prey, predator = LOTKA_VOLTERRA.resolver([10, 5], time, alfa=1.0, beta=0.1, delta=0.075, gamma=1.5).T
 
 fig_bio = go.Figure()
 fig_bio.add_trace(go.Scatter(x=time, y=prey, name='Presas', line=dict(color='#00c853')))
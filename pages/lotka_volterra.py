@@ -0,0 +1,246 @@
+import dash
+from dash import html, dcc, callback, Input, Output, State
+import numpy as np
+import plotly.graph_objects as go
+
+from modelos import LOTKA_VOLTERRA
+from modelos.depredador_presa import (
+    equilibrio, integral_primera, malla_integral, periodo_lineal, periodos, radios_orbita,
+)
+from servidor.metricas import fase
+
+dash.register_page(__name__, path="/Lotka_Volterra", name="Depredador-Presa")
+
+# ==========================================
+# 1. ESTILOS Y COLORES (TEMA CLARO)
+# ==========================================
+COLOR_PRESAS = '#00c853'        # Verde
+COLOR_DEPREDADORES = '#d50000'  # Rojo
+COLOR_ORBITAS = 'Teal'
+
+COLOR_FONDO_PAPEL = 'lightblue'
+COLOR_FONDO_GRAFICO = 'white'
+COLOR_GRID = 'lightpink'
+COLOR_TITULO = 'green'
+COLOR_TEXTO = 'black'
+
+PUNTOS_MALLA = 300
+
+def crear_input_lv(label, id_input, value, step=0.01, min_val=0):
+    return html.Div([
+        html.Label(label, style={'fontWeight': 'bold', 'color': COLOR_TITULO, 'fontSize': '14px'}),
+        dcc.Input(
+            id=id_input,
+            type="number",
+            value=value,
+            step=step,
+            min=min_val,
+            className="input-field",
+            style={
+                'width': '100%',
+                'padding': '8px',
+                'borderRadius': '5px',
+                'border': '1px solid #ccc',
+                'marginTop': '5px',
+                'marginBottom': '15px',
+                'backgroundColor': 'white',
+                'color': 'black',
+                'boxSizing': 'border-box'
+            }
+        )
+    ])
+
+# ==========================================
+# 2. LÓGICA MATEMÁTICA
+# ==========================================
+# dP/dt = alfa*P - beta*P*D, dD/dt = delta*P*D - gamma*D (modelos.LOTKA_VOLTERRA).
+# Las órbitas del retrato de fases son niveles de la integral primera V
+# evaluada una sola vez sobre una malla; la serie temporal es una sola
+# integración y los períodos salen de la geometría de las órbitas.
+def resolver_lotka_volterra(alfa, beta, delta, gamma, P0, D0, t_max, num_puntos=1000):
+    t = np.linspace(0, t_max, num_puntos)
+    solucion = LOTKA_VOLTERRA.resolver([P0, D0], t, alfa=alfa, beta=beta, delta=delta, gamma=gamma)
+    return t, solucion[:, 0], solucion[:, 1]
+
+def calcular_retrato(alfa, beta, delta, gamma, P0, D0, orbitas):
+    # Órbita cerrada que pasa por (P0, D0), sin integrar: radio del nivel
+    # V(P0, D0) en cada dirección alrededor del equilibrio
+    P_eq, D_eq = equilibrio(alfa, beta, delta, gamma)
+    V0 = integral_primera(P0, D0, alfa, beta, delta, gamma)
+    theta = np.linspace(0, 2 * np.pi, 361)
+    rho = radios_orbita([V0], theta, alfa, beta, delta, gamma)[0]
+    P_orbita, D_orbita = P_eq + rho * np.cos(theta), D_eq + rho * np.sin(theta)
+
+    # Malla que contiene holgadamente esa órbita y el equilibrio
+    p_max = 1.3 * max(P_orbita.max(), 2 * P_eq)
+    d_max = 1.3 * max(D_orbita.max(), 2 * D_eq)
+    p, d, V = malla_integral(p_max, d_max, PUNTOS_MALLA, alfa, beta, delta, gamma)
+
+    # Niveles entre el mínimo (equilibrio) y la órbita cerrada más grande
+    # que cabe en la malla (el menor V sobre los bordes superior y derecho)
+    V_eq = integral_primera(P_eq, D_eq, alfa, beta, delta, gamma)
+    V_max = min(V[-1, :].min(), V[:, -1].min())
+    niveles = V_eq + (V_max - V_eq) * (np.arange(1, orbitas + 1) / (orbitas + 1)) ** 2
+    T = periodos(np.append(niveles, V0), alfa, beta, delta, gamma)
+    return p, d, V, V_eq, niveles, (P_orbita, D_orbita), T[:-1], T[-1]
+
+
+# ==========================================
+# 3. GENERACIÓN DE GRÁFICOS
+# ==========================================
+estilo_ejes = dict(
+    showgrid=True, gridwidth=1, gridcolor=COLOR_GRID,
+    showline=True, linecolor=COLOR_TEXTO, linewidth=2, mirror=True,
+)
+
+def crear_figura_fases(p, d, V, V_eq, niveles, P, D, P_eq, D_eq):
+    fig = go.Figure()
+
+    # Todas las órbitas en un solo contorno de sqrt(V - V_eq), que crece
+    # como la distancia al equilibrio: los niveles quedan equiespaciados
+    radios = np.sqrt(niveles - V_eq)
+    fig.add_trace(go.Contour(
+        x=p, y=d, z=np.sqrt(np.maximum(V - V_eq, 0)),
+        contours=dict(coloring='lines', start=radios[0], end=radios[-1],
+                      size=(radios[-1] - radios[0]) / (len(radios) - 1)),
+        colorscale=[[0, COLOR_ORBITAS], [1, COLOR_ORBITAS]], showscale=False,
+        line=dict(width=1), hoverinfo='skip', name='Órbitas'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=P, y=D, mode='lines', name='Órbita de (P₀, D₀)',
+        line=dict(color=COLOR_DEPREDADORES, width=3),
+        hovertemplate="Presas %{x:.1f}, Depredadores %{y:.1f}<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=[P_eq], y=[D_eq], mode='markers', name='Equilibrio',
+        marker=dict(color='black', size=9, symbol='x')
+    ))
+
+    fig.update_layout(
+        title=dict(text="<b>Retrato de Fases</b>", font=dict(color=COLOR_TITULO, size=20), x=0.5, y=0.95),
+        xaxis_title="Presas (P)",
+        yaxis_title="Depredadores (D)",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center', bgcolor='rgba(255,255,255,0.8)'),
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+    fig.update_xaxes(**estilo_ejes, range=[0, p[-1]])
+    fig.update_yaxes(**estilo_ejes, range=[0, d[-1]])
+    return fig
+
+def crear_figura_series(t, P, D, periodo):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=t, y=P, mode='lines', name='Presas', line=dict(color=COLOR_PRESAS, width=3)))
+    fig.add_trace(go.Scatter(x=t, y=D, mode='lines', name='Depredadores',
+                             line=dict(color=COLOR_DEPREDADORES, width=3, dash='dot')))
+    fig.update_layout(
+        title=dict(text=f"<b>Dinámica de Poblaciones (período ≈ {periodo:.2f})</b>",
+                   font=dict(color=COLOR_TITULO, size=20), x=0.5, y=0.95),
+        xaxis_title="Tiempo",
+        yaxis_title="Individuos",
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        legend=dict(orientation='h', y=1.02, x=0.5, xanchor='center', bgcolor='rgba(255,255,255,0.8)'),
+        margin=dict(l=40, r=40, t=60, b=40),
+        hovermode="x unified"
+    )
+    fig.update_xaxes(**estilo_ejes, range=[0, t[-1]])
+    fig.update_yaxes(**estilo_ejes)
+    return fig
+
+
+# ==========================================
+# 4. LAYOUT
+# ==========================================
+layout = html.Div([
+
+    html.H1("Modelo Depredador-Presa (Lotka-Volterra)",
+            style={'textAlign': 'center', 'color': COLOR_TITULO, 'marginBottom': '30px'}),
+
+    html.Div([
+        # --- COLUMNA IZQUIERDA: CONTROLES ---
+        html.Div([
+            html.H3("Parámetros", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '20px'}),
+
+            crear_input_lv("Crecimiento de presas (α):", "input-alfa-lv", 1.0, 0.05),
+            crear_input_lv("Tasa de depredación (β):", "input-beta-lv", 0.1, 0.01),
+            crear_input_lv("Conversión en depredadores (δ):", "input-delta-lv", 0.075, 0.005),
+            crear_input_lv("Muerte de depredadores (γ):", "input-gamma-lv", 1.5, 0.05),
+            crear_input_lv("Presas iniciales (P₀):", "input-P0-lv", 10, 1),
+            crear_input_lv("Depredadores iniciales (D₀):", "input-D0-lv", 5, 1),
+            crear_input_lv("Tiempo a simular:", "input-t-lv", 30, 5),
+            crear_input_lv("Órbitas en el retrato:", "input-orbitas-lv", 15, 1, 1),
+
+            html.Button("Actualizar", id="btn-generar-lv",
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%',
+                               'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px', 'marginTop': '10px'}),
+            html.Div(id="stats-lv", style={'marginTop': '20px', 'fontSize': '14px'})
+
+        ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+
+        # --- COLUMNA DERECHA: GRÁFICOS ---
+        html.Div([
+            dcc.Graph(id="grafica-fases-lv", style={"height": "500px", "width": "100%"}),
+            dcc.Graph(id="grafica-series-lv", style={"height": "400px", "width": "100%"})
+        ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
+
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'})
+
+], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
+
+
+# ==========================================
+# 5. CALLBACKS
+# ==========================================
+@callback(
+    [Output("grafica-fases-lv", "figure"),
+     Output("grafica-series-lv", "figure"),
+     Output("stats-lv", "children")],
+    Input("btn-generar-lv", "n_clicks"),
+    State("input-alfa-lv", "value"),
+    State("input-beta-lv", "value"),
+    State("input-delta-lv", "value"),
+    State("input-gamma-lv", "value"),
+    State("input-P0-lv", "value"),
+    State("input-D0-lv", "value"),
+    State("input-t-lv", "value"),
+    State("input-orbitas-lv", "value"),
+    prevent_initial_call=False
+)
+def actualizar_lotka_volterra(n_clicks, alfa, beta, delta, gamma, P0, D0, t_max, orbitas):
+    # Valores por defecto
+    if alfa is None: alfa = 1.0
+    if beta is None: beta = 0.1
+    if delta is None: delta = 0.075
+    if gamma is None: gamma = 1.5
+    if P0 is None: P0 = 10
+    if D0 is None: D0 = 5
+    if t_max is None: t_max = 30
+    if orbitas is None: orbitas = 15
+    orbitas = int(min(max(orbitas, 2), 100))
+
+    if min(alfa, beta, delta, gamma, P0, D0, t_max) <= 0:
+        fig_empty = go.Figure()
+        fig_empty.update_layout(title="Error: Ingrese valores positivos", paper_bgcolor=COLOR_FONDO_PAPEL)
+        return fig_empty, fig_empty, ""
+
+    P_eq, D_eq = equilibrio(alfa, beta, delta, gamma)
+    with fase("resolver"):
+        t, P, D = resolver_lotka_volterra(alfa, beta, delta, gamma, P0, D0, t_max)
+        p, d, V, V_eq, niveles, orbita, T_orbitas, T0 = calcular_retrato(alfa, beta, delta, gamma, P0, D0, orbitas)
+
+    with fase("figura"):
+        fig_fases = crear_figura_fases(p, d, V, V_eq, niveles, *orbita, P_eq, D_eq)
+        fig_series = crear_figura_series(t, P, D, T0)
+
+    stats = dcc.Markdown(f"""
+* **Equilibrio:** {P_eq:.2f} presas, {D_eq:.2f} depredadores.
+* **Período de la órbita de (P₀, D₀):** {T0:.3f}.
+* **Órbitas pequeñas:** $2\\pi/\\sqrt{{\\alpha\\gamma}}$ = {periodo_lineal(alfa, gamma):.3f}; las {orbitas} órbitas dibujadas van de {T_orbitas.min():.3f} a {T_orbitas.max():.3f}.
+""", mathjax=True)
+
+    return fig_fases, fig_series, stats
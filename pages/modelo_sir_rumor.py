@@ -1,9 +1,17 @@
 import dash
-from dash import html, dcc, Input, Output, State, callback
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
-from scipy.integrate import odeint
+
+from modelos import RUMOR
+from modelos.horizonte import resolver_normalizado, resolver_en_bloques
+from modelos.estocastico import simular
+from modelos.sustituto import aproximar_sir, error_tabla
+from modelos.sensibilidad import sobol_sir
+from servidor import en_vivo, exportacion
+from servidor.metricas import fase
+from servidor.vuelo_unico import vuelo_unico
 
 # Si usas multipage, mantén esta línea. Si es app única, usa app = dash.Dash(__name__)
 dash.register_page(__name__, path='/Modelo_Rumor', name='Modelo SIR Rumor')
@@ -11,24 +19,61 @@ dash.register_page(__name__, path='/Modelo_Rumor', name='Modelo SIR Rumor')
 # ==========================================
 # 1. LÓGICA MATEMÁTICA (MODELO SIR RUMOR)
 # ==========================================
+@vuelo_unico
 def resolver_sir_rumor(N, b, k, S0, I0, R0, t_max, num_puntos=200):
-    # Ecuaciones Diferenciales
-    def deriv(y, t, N, b, k):
-        S, I, R = y
-        dSdt = -b * S * I
-        dIdt = b * S * I - k * I
-        dRdt = k * I
-        return dSdt, dIdt, dRdt
+    # Ecuaciones: dS/dt = -b*S*I, dI/dt = b*S*I - k*I, dR/dt = k*I (modelos.RUMOR)
 
     # Vector de tiempo
     t = np.linspace(0, t_max, num_puntos)
     y0 = (S0, I0, R0)
     
-    # Resolver EDO
-    ret = odeint(deriv, y0, t, args=(N, b, k))
+    # Resolver EDO en forma adimensional (compartida con todo escenario del
+    # mismo b (S0+I0) / k e I0/(S0+I0)); al subir solo los días se integra
+    # únicamente el tramo nuevo
+    ret = resolver_normalizado(RUMOR, y0, t, b=b, k=k)
+    S, I, R = ret.T
+    return t, S, I, R
+
+def aproximar_sir_rumor(N, b, k, S0, I0, R0, t_max, num_puntos=200):
+    # Misma salida que resolver_sir_rumor, desde la tabla sustituta
+    # (modelos/sustituto.py); None si no hay tabla o queda fuera de rango
+    t = np.linspace(0, t_max, num_puntos)
+    ret = aproximar_sir((S0, I0, R0), t, b=b, k=k)
+    if ret is None:
+        return None
     S, I, R = ret.T
     return t, S, I, R
 
+@vuelo_unico
+def simular_rumor_estocastico(N, b, k, S0, I0, R0, t_max, realizaciones, num_puntos=100, semilla=0):
+    # Mismo modelo con personas enteras: con N pequeño y un solo propagador
+    # inicial el rumor puede apagarse antes de despegar
+    t = np.linspace(0, t_max, num_puntos)
+    return simular(RUMOR, (S0, I0, R0), t, realizaciones=realizaciones, semilla=semilla, b=b, k=k)
+
+def exportar_rumor(N, b, k1, k2, I0, R0, days, puntos):
+    # Los dos escenarios uno tras otro; la columna k indica a cuál pertenece cada fila
+    for k in (k1, k2):
+        for t, ret in resolver_en_bloques(RUMOR, (N - I0 - R0, I0, R0), days, puntos, b=b, k=k):
+            yield np.column_stack([np.full(len(t), k), t, ret])
+
+exportacion.registrar('rumor', ('k', 't', 'S', 'I', 'R'),
+                      dict(N=275.0, b=0.004, k1=0.01, k2=0.02, I0=1.0, R0=8.0, days=15.0, puntos=200),
+                      exportar_rumor, horizonte='days', positivos=('N',))
+
+ETIQUETAS_SOBOL = {'b': 'b', 'k': 'k', 'I0': 'I₀', 'R0': 'R₀'}
+SALIDAS_SOBOL = {'pico': 'Propagadores en el pico', 'dia_pico': 'Día del pico', 'tamano_final': 'Personas alcanzadas'}
+
+@vuelo_unico
+def sensibilidad_rumor(N, b, k, I0, R0, t_max, variacion, muestras_base, semilla=0):
+    # Índices de Sobol de b, k, I0 y R0 (uniformes en ±variación% alrededor
+    # de los valores de la página) con N fijo; los que valen 0 quedan fijos
+    f = variacion / 100
+    nominales = {'b': b, 'k': k, 'I0': I0, 'R0': R0}
+    distribuciones = {p: ('uniforme', v * (1 - f), v * (1 + f)) for p, v in nominales.items() if v}
+    fijos = dict(nominales, N=N)
+    return sobol_sir(distribuciones, fijos, t_max, n=muestras_base, modelo=RUMOR, semilla=semilla)
+
 # ==========================================
 # 2. COMPONENTES DE INTERFAZ (ESTILO REUTILIZADO)
 # ==========================================
@@ -121,6 +166,93 @@ def crear_figura_comparativa(t, res_a, res_b, k1, k2):
 
     return fig
 
+def agregar_bandas(fig, ensamble, t_det, I_det, color, relleno, col, mostrar_leyenda):
+    p = ensamble.percentiles('I')
+    t = ensamble.t
+    # Banda 5-95 y banda 25-75 (se dibuja el borde inferior y se rellena hasta el superior)
+    for bajo, alto, nombre in ((5, 95, 'Percentil 5-95'), (25, 75, 'Percentil 25-75')):
+        fig.add_trace(go.Scatter(x=t, y=p[bajo], mode='lines', line=dict(width=0), showlegend=False,
+                                 hoverinfo='skip', legendgroup=nombre), row=1, col=col)
+        fig.add_trace(go.Scatter(x=t, y=p[alto], mode='lines', line=dict(width=0), fill='tonexty',
+                                 fillcolor=relleno, name=nombre, legendgroup=nombre,
+                                 showlegend=mostrar_leyenda), row=1, col=col)
+    fig.add_trace(go.Scatter(x=t, y=p[50], mode='lines', name='Mediana (I)', legendgroup='mediana',
+                             line=dict(color=color, width=2), showlegend=mostrar_leyenda), row=1, col=col)
+    fig.add_trace(go.Scatter(x=t_det, y=I_det, mode='lines', name='Determinista (I)', legendgroup='det',
+                             line=dict(color='black', width=1.5, dash='dash'),
+                             showlegend=mostrar_leyenda), row=1, col=col)
+
+def crear_figura_estocastica(ens_a, ens_b, det_a, det_b, k1, k2):
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=(f"Escenario A: k={k1}", f"Escenario B: k={k2}"),
+        horizontal_spacing=0.1
+    )
+    agregar_bandas(fig, ens_a, *det_a, 'red', 'rgba(255, 0, 0, 0.15)', 1, True)
+    agregar_bandas(fig, ens_b, *det_b, 'red', 'rgba(255, 0, 0, 0.15)', 2, False)
+
+    fig.update_layout(
+        title=dict(
+            text=f'<b>Propagadores: {ens_a.realizaciones} realizaciones estocásticas</b>',
+            font=dict(size=20, color='green'),
+            x=0.5, y=0.95
+        ),
+        margin=dict(l=40, r=40, t=80, b=40),
+        paper_bgcolor='lightblue',
+        plot_bgcolor='white',
+        font=dict(family='Outfit, Arial, sans-serif', size=12, color='black'),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center'),
+        hovermode="x unified"
+    )
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor='lightpink',
+        zeroline=True, zerolinewidth=1, zerolinecolor='gray',
+        showline=True, linecolor='black', linewidth=1, mirror=True
+    )
+    fig.update_xaxes(**estilo_ejes, title_text="Días")
+    fig.update_yaxes(**estilo_ejes, title_text="Propagadores", row=1, col=1)
+    fig.update_yaxes(**estilo_ejes, row=1, col=2)
+    return fig
+
+def crear_figura_sobol(indices):
+    # Barras de primer orden y total con su IC 95% (bootstrap), un panel por salida
+    nombres = [ETIQUETAS_SOBOL[p] for p in indices.parametros]
+    fig = make_subplots(
+        rows=1, cols=len(indices.salidas),
+        subplot_titles=[SALIDAS_SOBOL[s] for s in indices.salidas],
+        horizontal_spacing=0.08
+    )
+    for col, s in enumerate(indices.salidas, start=1):
+        for valores, intervalo, nombre, color in (
+                (indices.primer_orden[s], indices.intervalos_primer_orden[s], 'Primer orden (Sᵢ)', 'green'),
+                (indices.total[s], indices.intervalos_total[s], 'Total (STᵢ)', 'red')):
+            fig.add_trace(go.Bar(
+                x=nombres, y=valores, name=nombre, marker_color=color, legendgroup=nombre, showlegend=(col == 1),
+                error_y=dict(type='data', symmetric=False, array=intervalo[1] - valores,
+                             arrayminus=valores - intervalo[0], color='gray')
+            ), row=1, col=col)
+
+    fig.update_layout(
+        title=dict(
+            text=f'<b>Índices de Sobol ({indices.evaluaciones} evaluaciones del modelo)</b>',
+            font=dict(size=20, color='green'),
+            x=0.5, y=0.95
+        ),
+        barmode='group',
+        margin=dict(l=40, r=40, t=80, b=40),
+        paper_bgcolor='lightblue',
+        plot_bgcolor='white',
+        font=dict(family='Outfit, Arial, sans-serif', size=12, color='black'),
+        legend=dict(orientation='h', yanchor='bottom', y=-0.2, x=0.5, xanchor='center')
+    )
+    estilo_ejes = dict(
+        showgrid=True, gridwidth=1, gridcolor='lightpink',
+        showline=True, linecolor='black', linewidth=1, mirror=True
+    )
+    fig.update_xaxes(**estilo_ejes)
+    fig.update_yaxes(**estilo_ejes, range=[0, 1.05])
+    return fig
+
 # ==========================================
 # 4. LAYOUT
 # ==========================================
@@ -147,7 +279,16 @@ layout = html.Div([
             crear_grupo_input("Racionales Iniciales (R0):", "input-R0", value=8, step=1),
             
             html.Button("Simular Rumor", id="btn-simular-rumor", 
-                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '15px', 'fontSize': '16px'})
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'marginTop': '15px', 'fontSize': '16px'}),
+
+            exportacion.controles("rumor", 200),
+
+            # --- MODO EN VIVO: la gráfica sigue a los deslizadores ---
+            html.H4("Modo en vivo", style={'color': 'green', 'marginTop': '20px'}),
+            en_vivo.deslizador("b (arrastre):", "slider-b-en-vivo-rumor", 0.0005, 0.02, 0.0005, 0.004),
+            en_vivo.deslizador("k1 (arrastre):", "slider-k1-en-vivo-rumor", 0.0, 0.1, 0.001, 0.01),
+            en_vivo.deslizador("k2 (arrastre):", "slider-k2-en-vivo-rumor", 0.0, 0.1, 0.001, 0.02),
+            dcc.Store(id="store-en-vivo-rumor")
         ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
         
         # --- COLUMNA DERECHA: GRÁFICO ---
@@ -156,20 +297,99 @@ layout = html.Div([
                 id='grafica-rumor',
                 style={'height': '600px', 'width': '100%'}
             ),
-            html.Div(id='stats-output', style={'marginTop': '20px', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '5px'})
+            html.Div(id='stats-output', style={'marginTop': '20px', 'padding': '10px', 'backgroundColor': 'white', 'borderRadius': '5px'}),
+            # Curvas aproximadas ya dibujadas: dispara la solución exacta
+            dcc.Store(id='store-aproximado-rumor')
         ], style={'flex': '3', 'minWidth': '500px', 'padding': '10px'})
         
-    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1400px', 'margin': '0 auto'})
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1400px', 'margin': '0 auto'}),
+
+    # --- SIMULACIÓN ESTOCÁSTICA (usa los mismos parámetros de arriba) ---
+    html.Div([
+        html.H3("Simulación Estocástica", style={'color': 'green', 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Div([
+                crear_grupo_input("Realizaciones:", "input-realizaciones-rumor", value=1000, min_val=10, step=10),
+                html.Button("Simular Ensamble", id="btn-estocastico-rumor",
+                            style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px'}),
+                html.Div(id='stats-estocastico-rumor', style={'marginTop': '20px'})
+            ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+            html.Div([
+                dcc.Graph(id='grafica-rumor-estocastico', style={'height': '500px', 'width': '100%'})
+            ], style={'flex': '3', 'minWidth': '500px', 'padding': '10px'})
+        ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px'})
+    ], style={'maxWidth': '1400px', 'margin': '40px auto 0 auto'}),
+
+    # --- SENSIBILIDAD GLOBAL (b, k del escenario A, I0 y R0 de arriba) ---
+    html.Div([
+        html.H3("Sensibilidad Global (Índices de Sobol)", style={'color': 'green', 'borderBottom': '2px solid lightpink', 'marginBottom': '15px'}),
+        html.Div([
+            html.Div([
+                crear_grupo_input("Variación de cada parámetro (±%):", "input-variacion-sobol-rumor", value=20, min_val=1, step=1),
+                html.Label("Muestras base:", style={'fontWeight': 'bold', 'color': 'green', 'fontSize': '14px'}),
+                dcc.Dropdown(id='dropdown-muestras-sobol-rumor', options=[256, 1024, 4096], value=1024, clearable=False,
+                             style={'marginTop': '5px', 'marginBottom': '15px'}),
+                html.Button("Calcular Sensibilidad", id="btn-sobol-rumor",
+                            style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%', 'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px'}),
+                html.Div(id='stats-sobol-rumor', style={'marginTop': '20px'})
+            ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+            html.Div([
+                dcc.Graph(id='grafica-sobol-rumor', style={'height': '450px', 'width': '100%'})
+            ], style={'flex': '3', 'minWidth': '500px', 'padding': '10px'})
+        ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px'})
+    ], style={'maxWidth': '1400px', 'margin': '40px auto 0 auto'})
     
 ], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
 
 # ==========================================
 # 5. CALLBACKS
 # ==========================================
+def valores_rumor(N, b, k1, k2, I0, R0, days):
+    # Valores por defecto
+    if N is None: N = 275
+    if b is None: b = 0.004
+    if k1 is None: k1 = 0.01
+    if k2 is None: k2 = 0.02
+    if I0 is None: I0 = 1
+    if R0 is None: R0 = 8
+    if days is None: days = 15
+    return N, b, k1, k2, I0, R0, days
+
+# Primero las curvas aproximadas (instantáneas, sin integrar); al llegar
+# al store, actualizar_grafica_rumor las reemplaza por la solución exacta
+@callback(
+    [Output('grafica-rumor', 'figure', allow_duplicate=True),
+     Output('stats-output', 'children', allow_duplicate=True),
+     Output('store-aproximado-rumor', 'data')],
+    Input('btn-simular-rumor', 'n_clicks'),
+    State('input-N', 'value'),
+    State('input-b', 'value'),
+    State('input-k1', 'value'),
+    State('input-k2', 'value'),
+    State('input-I0', 'value'),
+    State('input-R0', 'value'),
+    State('input-days', 'value'),
+    prevent_initial_call='initial_duplicate'
+)
+def aproximar_grafica_rumor(n_clicks, N, b, k1, k2, I0, R0, days):
+    N, b, k1, k2, I0, R0, days = valores_rumor(N, b, k1, k2, I0, R0, days)
+    S0 = N - I0 - R0
+    escenario_a = aproximar_sir_rumor(N, b, k1, S0, I0, R0, days)
+    escenario_b = aproximar_sir_rumor(N, b, k2, S0, I0, R0, days)
+    if escenario_a is None or escenario_b is None:
+        return dash.no_update, dash.no_update, {'n_clicks': n_clicks, 'aproximado': False}
+
+    with fase("figura"):
+        fig = crear_figura_comparativa(escenario_a[0], escenario_a[1:], escenario_b[1:], k1, k2)
+        fig.update_layout(title_text=fig.layout.title.text + " (aproximación)")
+    aviso = html.P(f"Curvas aproximadas (error típico ≤ {100 * error_tabla():.1f} % de la población); "
+                   "calculando la solución exacta...", style={'color': 'gray'})
+    return fig, aviso, {'n_clicks': n_clicks, 'aproximado': True}
+
 @callback(
     [Output('grafica-rumor', 'figure'),
      Output('stats-output', 'children')],
-    Input('btn-simular-rumor', 'n_clicks'),
+    Input('store-aproximado-rumor', 'data'),
     State('input-N', 'value'),
     State('input-b', 'value'),
     State('input-k1', 'value'),
@@ -177,28 +397,31 @@ layout = html.Div([
     State('input-I0', 'value'),
     State('input-R0', 'value'),
     State('input-days', 'value'),
-    prevent_initial_call=False
+    prevent_initial_call=True
 )
-def actualizar_grafica_rumor(n_clicks, N, b, k1, k2, I0, R0, days):
-    # Valores por defecto
-    if N is None: N = 275
-    if b is None: b = 0.004
-    if k1 is None: k1 = 0.01
-    if k2 is None: k2 = 0.02
-    if I0 is None: I0 = 1
-    if R0 is None: R0 = 8
-    if days is None: days = 15
+def actualizar_grafica_rumor(solicitud, N, b, k1, k2, I0, R0, days):
+    N, b, k1, k2, I0, R0, days = valores_rumor(N, b, k1, k2, I0, R0, days)
 
     # Calcular Susceptibles Iniciales
     S0 = N - I0 - R0
 
-    # Simular Escenario A
-    t, S1, I1, R1 = resolver_sir_rumor(N, b, k1, S0, I0, R0, days)
-    # Simular Escenario B
-    _, S2, I2, R2 = resolver_sir_rumor(N, b, k2, S0, I0, R0, days)
+    with fase("resolver"):
+        # Simular Escenario A
+        t, S1, I1, R1 = resolver_sir_rumor(N, b, k1, S0, I0, R0, days)
+        # Simular Escenario B
+        _, S2, I2, R2 = resolver_sir_rumor(N, b, k2, S0, I0, R0, days)
 
     # Crear Figura
-    fig = crear_figura_comparativa(t, (S1, I1, R1), (S2, I2, R2), k1, k2)
+    with fase("figura"):
+        fig = crear_figura_comparativa(t, (S1, I1, R1), (S2, I2, R2), k1, k2)
+
+    # Diferencia real entre las curvas aproximadas que se mostraron y las exactas
+    desvio = None
+    if solicitud and solicitud.get('aproximado'):
+        aproximadas = [aproximar_sir_rumor(N, b, k, S0, I0, R0, days) for k in (k1, k2)]
+        if None not in aproximadas:
+            exactas = [(S1, I1, R1), (S2, I2, R2)]
+            desvio = max(np.abs(np.array(a[1:]) - np.array(e)).max() for a, e in zip(aproximadas, exactas))
 
     # Estadísticas básicas
     max_I1 = max(I1)
@@ -211,5 +434,154 @@ def actualizar_grafica_rumor(n_clicks, N, b, k1, k2, I0, R0, days):
         html.P(f"Escenario A (k={k1}): Pico de propagadores ({max_I1:.0f}) en el día {dia_max_I1:.1f}."),
         html.P(f"Escenario B (k={k2}): Pico de propagadores ({max_I2:.0f}) en el día {dia_max_I2:.1f}.")
     ])
+    if desvio is not None:
+        stats.children.append(html.P(f"La aproximación inicial se desvió como máximo un {100 * desvio / N:.2f} % de la población.",
+                                     style={'color': 'gray', 'fontSize': '13px'}))
+
+    return fig, stats
+
+@callback(
+    [Output('grafica-rumor-estocastico', 'figure'),
+     Output('stats-estocastico-rumor', 'children')],
+    Input('btn-estocastico-rumor', 'n_clicks'),
+    State('input-N', 'value'),
+    State('input-b', 'value'),
+    State('input-k1', 'value'),
+    State('input-k2', 'value'),
+    State('input-I0', 'value'),
+    State('input-R0', 'value'),
+    State('input-days', 'value'),
+    State('input-realizaciones-rumor', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_rumor_estocastico(n_clicks, N, b, k1, k2, I0, R0, days, realizaciones):
+    # Valores por defecto
+    if N is None: N = 275
+    if b is None: b = 0.004
+    if k1 is None: k1 = 0.01
+    if k2 is None: k2 = 0.02
+    if I0 is None: I0 = 1
+    if R0 is None: R0 = 8
+    if days is None: days = 15
+    if realizaciones is None: realizaciones = 1000
+    realizaciones = int(min(max(realizaciones, 10), 20000))
+
+    S0 = N - I0 - R0
+
+    with fase("resolver"):
+        ens_a = simular_rumor_estocastico(N, b, k1, S0, I0, R0, days, realizaciones)
+        ens_b = simular_rumor_estocastico(N, b, k2, S0, I0, R0, days, realizaciones)
+        t_a, _, I1, _ = resolver_sir_rumor(N, b, k1, S0, I0, R0, days)
+        t_b, _, I2, _ = resolver_sir_rumor(N, b, k2, S0, I0, R0, days)
+
+    with fase("figura"):
+        fig = crear_figura_estocastica(ens_a, ens_b, (t_a, I1), (t_b, I2), k1, k2)
+
+    # Aproximación de ramificación: cada propagador inicial se apaga con
+    # probabilidad 1/R0 (si R0 > 1)
+    def teorica(k):
+        r0 = b * S0 / k if k else np.inf
+        return min(1.0, 1.0 / r0) ** I0
+
+    stats = html.Div([
+        html.H4("Probabilidad de que el rumor se apague solo:", style={'color': 'green'}),
+        html.P(f"Escenario A (k={k1}): {ens_a.probabilidad_extincion():.1%} (aprox. teórica {teorica(k1):.1%})."),
+        html.P(f"Escenario B (k={k2}): {ens_b.probabilidad_extincion():.1%} (aprox. teórica {teorica(k2):.1%})."),
+        html.P(f"Método: {'Gillespie exacto' if ens_a.metodo == 'gillespie' else 'tau-leaping'}.",
+               style={'fontSize': '12px', 'color': 'gray'})
+    ])
+
+    return fig, stats
+
+@callback(
+    [Output('grafica-sobol-rumor', 'figure'),
+     Output('stats-sobol-rumor', 'children')],
+    Input('btn-sobol-rumor', 'n_clicks'),
+    State('input-N', 'value'),
+    State('input-b', 'value'),
+    State('input-k1', 'value'),
+    State('input-I0', 'value'),
+    State('input-R0', 'value'),
+    State('input-days', 'value'),
+    State('input-variacion-sobol-rumor', 'value'),
+    State('dropdown-muestras-sobol-rumor', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_sobol_rumor(n_clicks, N, b, k1, I0, R0, days, variacion, muestras_base):
+    # Valores por defecto
+    if N is None: N = 275
+    if b is None: b = 0.004
+    if k1 is None: k1 = 0.01
+    if I0 is None: I0 = 1
+    if R0 is None: R0 = 8
+    if days is None: days = 15
+    if variacion is None: variacion = 20
+    if muestras_base is None: muestras_base = 1024
+    variacion = min(max(variacion, 1), 90)
+
+    with fase("resolver"):
+        indices = sensibilidad_rumor(N, b, k1, I0, R0, days, variacion, int(muestras_base))
+
+    with fase("figura"):
+        fig = crear_figura_sobol(indices)
+
+    stats = html.Div([
+        html.H4("Parámetro más influyente:", style={'color': 'green'}),
+        *[html.P(f"{SALIDAS_SOBOL[s]}: {ETIQUETAS_SOBOL[indices.parametros[int(np.argmax(indices.total[s]))]]} "
+                 f"(índice total {indices.total[s].max():.2f}).")
+          for s in indices.salidas],
+        html.P(f"Escenario A (k={k1}), variación ±{variacion:g}%.", style={'fontSize': '12px', 'color': 'gray'})
+    ])
+
+    return fig, stats
+
 
-    return fig, stats
\ No newline at end of file
+@callback(
+    Output('descarga-rumor', 'href'),
+    Input('btn-simular-rumor', 'n_clicks'),
+    Input('formato-descarga-rumor', 'value'),
+    Input('puntos-descarga-rumor', 'value'),
+    State('input-N', 'value'),
+    State('input-b', 'value'),
+    State('input-k1', 'value'),
+    State('input-k2', 'value'),
+    State('input-I0', 'value'),
+    State('input-R0', 'value'),
+    State('input-days', 'value'),
+)
+def enlace_descarga_rumor(n_clicks, formato, puntos, N, b, k1, k2, I0, R0, days):
+    return exportacion.enlace('rumor', formato, N=N, b=b, k1=k1, k2=k2, I0=I0, R0=R0, days=days, puntos=puntos)
+
+
+# --- MODO EN VIVO ---
+clientside_callback(
+    ClientsideFunction(namespace='en_vivo', function_name='limitar'),
+    Output('store-en-vivo-rumor', 'data'),
+    Input('slider-b-en-vivo-rumor', 'value'),
+    Input('slider-k1-en-vivo-rumor', 'value'),
+    Input('slider-k2-en-vivo-rumor', 'value'),
+    prevent_initial_call=True
+)
+
+@callback(
+    Output('grafica-rumor', 'figure', allow_duplicate=True),
+    Input('store-en-vivo-rumor', 'data'),
+    State('input-N', 'value'),
+    State('input-I0', 'value'),
+    State('input-R0', 'value'),
+    State('input-days', 'value'),
+    prevent_initial_call=True
+)
+def actualizar_rumor_en_vivo(datos, N, I0, R0, days):
+    with en_vivo.turno(datos, 'actualizar_rumor_en_vivo') as (b, k1, k2):
+        if N is None: N = 275
+        if I0 is None: I0 = 1
+        if R0 is None: R0 = 8
+        if days is None: days = 15
+        S0 = N - I0 - R0
+        with fase("resolver"):
+            t, S1, I1, R1 = resolver_sir_rumor(N, b, k1, S0, I0, R0, days)
+            _, S2, I2, R2 = resolver_sir_rumor(N, b, k2, S0, I0, R0, days)
+        with fase("figura"):
+            fig = crear_figura_comparativa(t, (S1, I1, R1), (S2, I2, R2), k1, k2)
+    return fig
@@ -0,0 +1,226 @@
+import dash
+from dash import html, dcc, callback, Input, Output, State, Patch, no_update
+import plotly.graph_objects as go
+
+from modelos import superficies
+from modelos.expresiones import compilar
+from servidor.metricas import fase
+
+dash.register_page(__name__, path="/Superficie", name="Explorador 3D")
+
+# ==========================================
+# 1. ESTILOS Y CONSTANTES
+# ==========================================
+COLOR_FONDO_PAPEL = 'lightblue'
+COLOR_FONDO_GRAFICO = 'white'
+COLOR_GRID = 'lightpink'
+COLOR_TITULO = 'green'
+COLOR_TEXTO = 'black'
+
+# La superficie empieza con la malla gruesa de todo el dominio; al hacer
+# zoom en el mapa se reemplazan sus datos por las teselas de la zona
+# visible al nivel de detalle que corresponda (ver modelos/superficies.py)
+
+
+def crear_input_superficie(label, id_input, value, tipo="text"):
+    return html.Div([
+        html.Label(label, style={'fontWeight': 'bold', 'color': COLOR_TITULO, 'fontSize': '14px'}),
+        dcc.Input(
+            id=id_input,
+            type=tipo,
+            value=value,
+            className="input-field",
+            style={
+                'width': '100%', 'padding': '8px', 'borderRadius': '5px',
+                'border': '1px solid #ccc', 'marginTop': '5px', 'marginBottom': '15px',
+                'boxSizing': 'border-box'
+            }
+        )
+    ])
+
+# ==========================================
+# 2. LAYOUT
+# ==========================================
+layout = html.Div([
+
+    html.H1("Explorador de Superficies z = f(x, y)",
+            style={'textAlign': 'center', 'color': COLOR_TITULO, 'marginBottom': '30px'}),
+
+    html.Div([
+        # --- COLUMNA IZQUIERDA: CONTROLES ---
+        html.Div([
+            html.H3("Definición de la Superficie", style={'color': COLOR_TITULO, 'borderBottom': '2px solid lightpink', 'marginBottom': '20px'}),
+
+            crear_input_superficie("z = f(x, y) =", "input-f-superficie", "sin(sqrt(x**2 + y**2))"),
+
+            html.Div([
+                html.Div([crear_input_superficie("x mín", "input-xmin-superficie", -10, "number")], style={'flex': 1}),
+                html.Div([crear_input_superficie("x máx", "input-xmax-superficie", 10, "number")], style={'flex': 1}),
+            ], style={'display': 'flex', 'gap': '10px'}),
+            html.Div([
+                html.Div([crear_input_superficie("y mín", "input-ymin-superficie", -10, "number")], style={'flex': 1}),
+                html.Div([crear_input_superficie("y máx", "input-ymax-superficie", 10, "number")], style={'flex': 1}),
+            ], style={'display': 'flex', 'gap': '10px'}),
+
+            html.Button("Generar Superficie", id="btn-superficie",
+                        style={'backgroundColor': 'green', 'color': 'white', 'padding': '12px', 'width': '100%',
+                               'border': 'none', 'borderRadius': '5px', 'cursor': 'pointer', 'fontSize': '16px', 'marginTop': '10px'}),
+
+            html.Div([
+                html.H4("Ejemplos:", style={'color': 'black', 'marginTop': '20px'}),
+                html.Ul([
+                    html.Li("Ondas: sin(sqrt(x**2 + y**2))"),
+                    html.Li("Silla: x**2 - y**2"),
+                    html.Li("Huevera: sin(x)*cos(y)"),
+                    html.Li("Detalle fino: sin(20*x)*cos(20*y)*exp(-(x^2+y^2)/50)"),
+                ], style={'fontSize': '13px', 'color': '#555', 'paddingLeft': '20px'}),
+                html.P("Haz zoom en el mapa para ver la zona elegida con más detalle en 3D.",
+                       style={'fontSize': '13px', 'color': '#555'})
+            ]),
+
+            dcc.Graph(id="mapa-superficie", style={"height": "320px", "width": "100%"})
+
+        ], style={'flex': '1', 'minWidth': '300px', 'padding': '25px', 'backgroundColor': '#f9f9f9', 'borderRadius': '10px', 'boxShadow': '0 4px 6px rgba(0,0,0,0.1)'}),
+
+        # --- COLUMNA DERECHA: GRÁFICO 3D ---
+        html.Div([
+            dcc.Graph(id="grafica-superficie", style={"height": "600px", "width": "100%"}),
+            html.Div(id="info-superficie", style={'marginTop': '10px', 'color': 'gray', 'fontSize': '12px', 'textAlign': 'right'})
+        ], style={'flex': '2', 'minWidth': '400px', 'padding': '10px'})
+
+    ], style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px', 'maxWidth': '1200px', 'margin': '0 auto'}),
+
+    # Expresión y dominio validados de la última superficie generada
+    dcc.Store(id="store-superficie")
+
+], style={'padding': '20px', 'fontFamily': 'Outfit, sans-serif'})
+
+
+# ==========================================
+# 3. LÓGICA
+# ==========================================
+def rangos_vista(relayout):
+    # Rango x e y visibles del mapa a partir de relayoutData; None = todo
+    if not relayout:
+        return None, None
+    if relayout.get('xaxis.autorange') or relayout.get('yaxis.autorange'):
+        return None, None
+    rangos = []
+    for eje in ('xaxis', 'yaxis'):
+        if f'{eje}.range[0]' in relayout:
+            rangos.append((relayout[f'{eje}.range[0]'], relayout[f'{eje}.range[1]']))
+        elif f'{eje}.range' in relayout:
+            rangos.append(tuple(relayout[f'{eje}.range']))
+        else:
+            rangos.append(None)
+    return rangos[0], rangos[1]
+
+
+def texto_info(x, y, nivel, dominio):
+    puntos = superficies.NIVELES[nivel]
+    return (f"Nivel {nivel}: malla de {len(x)}x{len(y)} puntos enviada · "
+            f"resolución efectiva {puntos}x{puntos} sobre x ∈ [{dominio[0]}, {dominio[1]}], "
+            f"y ∈ [{dominio[2]}, {dominio[3]}]")
+
+# ==========================================
+# 4. GENERACIÓN DE GRÁFICOS
+# ==========================================
+def crear_figura_superficie(x, y, Z, texto):
+    fig = go.Figure(go.Surface(x=x, y=y, z=Z, colorscale='Viridis', showscale=False))
+    fig.update_layout(
+        title=dict(text=f"<b>z = {texto}</b>", x=0.5, font=dict(color=COLOR_TITULO, size=18)),
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        margin=dict(l=0, r=0, t=60, b=0),
+        # Conserva la cámara del usuario cuando se reemplazan los datos
+        uirevision=texto,
+        scene=dict(
+            xaxis=dict(title="x", backgroundcolor=COLOR_FONDO_GRAFICO, gridcolor=COLOR_GRID),
+            yaxis=dict(title="y", backgroundcolor=COLOR_FONDO_GRAFICO, gridcolor=COLOR_GRID),
+            zaxis=dict(title="z", backgroundcolor=COLOR_FONDO_GRAFICO, gridcolor=COLOR_GRID),
+        )
+    )
+    return fig
+
+
+def crear_mapa(x, y, Z):
+    fig = go.Figure(go.Heatmap(x=x, y=y, z=Z, colorscale='Viridis', showscale=False))
+    fig.update_layout(
+        title=dict(text="<b>Vista (zoom = detalle)</b>", x=0.5, font=dict(color=COLOR_TITULO, size=14)),
+        paper_bgcolor=COLOR_FONDO_PAPEL,
+        plot_bgcolor=COLOR_FONDO_GRAFICO,
+        font=dict(color=COLOR_TEXTO, family='Outfit, sans-serif'),
+        margin=dict(l=40, r=10, t=40, b=30),
+        dragmode='zoom'
+    )
+    return fig
+
+
+def crear_figura_error(mensaje):
+    fig = go.Figure()
+    fig.update_layout(title=f"Error: {mensaje}", paper_bgcolor=COLOR_FONDO_PAPEL)
+    return fig
+
+# ==========================================
+# 5. CALLBACKS
+# ==========================================
+@callback(
+    [Output("grafica-superficie", "figure"),
+     Output("mapa-superficie", "figure"),
+     Output("info-superficie", "children"),
+     Output("store-superficie", "data")],
+    Input("btn-superficie", "n_clicks"),
+    State("input-f-superficie", "value"),
+    State("input-xmin-superficie", "value"),
+    State("input-xmax-superficie", "value"),
+    State("input-ymin-superficie", "value"),
+    State("input-ymax-superficie", "value"),
+)
+def generar_superficie(n_clicks, texto, xmin, xmax, ymin, ymax):
+    if xmin is None: xmin = -10
+    if xmax is None: xmax = 10
+    if ymin is None: ymin = -10
+    if ymax is None: ymax = 10
+    if xmin >= xmax or ymin >= ymax:
+        fig_error = crear_figura_error("el mínimo debe ser menor que el máximo")
+        return fig_error, fig_error, "Dominio inválido", None
+
+    dominio = (float(xmin), float(xmax), float(ymin), float(ymax))
+    try:
+        compilar(texto)
+        # Primero la malla gruesa de todo el dominio
+        with fase("resolver"):
+            x, y, Z, nivel = superficies.vista(texto, dominio, nivel=0)
+    except (ValueError, ArithmeticError) as error:
+        fig_error = crear_figura_error(str(error))
+        return fig_error, fig_error, "Expresión inválida", None
+
+    with fase("figura"):
+        fig = crear_figura_superficie(x, y, Z, texto)
+        mapa = crear_mapa(x, y, Z)
+    return fig, mapa, texto_info(x, y, nivel, dominio), dict(texto=texto, dominio=dominio)
+
+
+@callback(
+    [Output("grafica-superficie", "figure", allow_duplicate=True),
+     Output("info-superficie", "children", allow_duplicate=True)],
+    Input("mapa-superficie", "relayoutData"),
+    State("store-superficie", "data"),
+    prevent_initial_call=True
+)
+def refinar_superficie(relayout, datos):
+    if not datos:
+        return no_update, no_update
+    rango_x, rango_y = rangos_vista(relayout)
+    dominio = tuple(datos['dominio'])
+
+    with fase("resolver"):
+        x, y, Z, nivel = superficies.vista(datos['texto'], dominio, rango_x, rango_y)
+
+    # Solo se reemplazan los datos del trazo; cámara y estilo quedan igual
+    with fase("figura"):
+        fig = Patch()
+        fig['data'][0]['x'] = x
+        fig['data'][0]['y'] = y
+        fig['data'][0]['z'] = Z
+    return fig, texto_info(x, y, nivel, dominio)
@@ -0,0 +1,5 @@
+# ==========================================
+# INFRAESTRUCTURA DEL SERVIDOR
+# ==========================================
+# Utilidades que se montan sobre la app de Dash y su servidor Flask
+# (instrumentación de callbacks, rutas adicionales, etc.).
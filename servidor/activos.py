@@ -0,0 +1,265 @@
+# ==========================================
+# COMPILACIÓN DE ACTIVOS (CSS/JS) CON HUELLA DE CONTENIDO
+# ==========================================
+# Dash incluye en cada página todo .css/.js de la carpeta de activos con
+# nombres estables, así que el navegador los revalida en cada visita. Este
+# paso de compilación toma assets/ y escribe en activos_compilados/:
+#   - un solo ejemplar de cada archivo de contenido idéntico (se avisa del
+#     duplicado y se omite),
+#   - .css y .js minificados,
+#   - nombres con huella del contenido: css/style.<huella>.min.css,
+#   - manifiesto.json con la huella de assets/ y origen -> compilado.
+#
+#   python -m servidor.activos                   # compila
+#   python -m servidor.activos --destino x/
+#
+# Si existe el manifiesto, app.py sirve esa carpeta en lugar de assets/ y
+# los archivos con huella se entregan con Cache-Control immutable de un año:
+# como el nombre cambia con el contenido, las visitas siguientes no hacen
+# ninguna solicitud de activos. Sin compilar, se sirve assets/ como siempre.
+# Al arrancar se compara la huella de assets/ con la del manifiesto: si se
+# editó un activo después de compilar, se recompila (o, si la carpeta no
+# se puede escribir, se sirve assets/) en lugar de servir lo viejo.
+#
+# Los minificadores son conservadores (sin dependencias): quitan
+# comentarios y espacios sobrantes respetando cadenas, plantillas y
+# expresiones regulares, y en JS conservan los saltos de línea necesarios
+# para la inserción automática de punto y coma.
+import argparse
+import hashlib
+import json
+import os
+import logging
+import re
+import sys
+
+from flask import request
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ORIGEN = os.path.join(RAIZ, 'assets')
+DESTINO = os.environ.get('ACTIVOS_DESTINO', os.path.join(RAIZ, 'activos_compilados'))
+MANIFIESTO = 'manifiesto.json'
+LARGO_HUELLA = 10
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+PATRON_HUELLA = re.compile(r'\.[0-9a-f]{%d}\.min\.(css|js)$' % LARGO_HUELLA)
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# 1. MINIFICACIÓN
+# ==========================================
+# Un '/' es el inicio de una expresión regular (y no una división) si lo
+# anterior no es un valor: nada, un operador o una de estas palabras
+# (completas: "margin / 2" es una división aunque margin termine en "in")
+_ANTES_DE_REGEX = set('(,=:[!&|?{};+-*%<>~^\n')
+_PALABRA_ANTES_DE_REGEX = re.compile(
+    r'(?<![\w$.])(return|typeof|case|do|else|in|of|void|yield|await|instanceof|new|delete|throw)$')
+
+
+def _fin_literal(texto, i, cierre):
+    # Índice siguiente al cierre de la cadena/plantilla/regex que empieza en i
+    j = i + 1
+    en_clase = False
+    while j < len(texto):
+        c = texto[j]
+        if c == '\\':
+            j += 2
+            continue
+        if cierre == '/' and c == '[':
+            en_clase = True
+        elif cierre == '/' and c == ']':
+            en_clase = False
+        elif c == cierre and not en_clase:
+            return j + 1
+        j += 1
+    raise ValueError(f"Literal sin cerrar en la posición {i}")
+
+
+def _segmentos(texto, js):
+    # [(es_codigo, fragmento), ...] con comentarios eliminados
+    segmentos = []
+    codigo = []
+    i = 0
+    while i < len(texto):
+        c = texto[i]
+        siguiente = texto[i + 1] if i + 1 < len(texto) else ''
+        if c == '/' and siguiente == '*':
+            fin = texto.find('*/', i + 2)
+            i = len(texto) if fin < 0 else fin + 2
+            codigo.append(' ')
+            continue
+        if js and c == '/' and siguiente == '/':
+            fin = texto.find('\n', i)
+            i = len(texto) if fin < 0 else fin
+            continue
+        es_regex = False
+        if js and c == '/':
+            previo = ''.join(codigo).rstrip(' \t')
+            es_regex = (not previo or previo[-1] in _ANTES_DE_REGEX
+                        or _PALABRA_ANTES_DE_REGEX.search(previo) is not None)
+        if c in '"\'' or (js and c == '`') or es_regex:
+            fin = _fin_literal(texto, i, c)
+            segmentos.append((True, ''.join(codigo)))
+            segmentos.append((False, texto[i:fin]))
+            codigo = []
+            i = fin
+            continue
+        codigo.append(c)
+        i += 1
+    segmentos.append((True, ''.join(codigo)))
+    return segmentos
+
+
+def minificar_css(texto):
+    partes = []
+    for es_codigo, fragmento in _segmentos(texto, js=False):
+        if es_codigo:
+            fragmento = re.sub(r'\s+', ' ', fragmento)
+            # Sin espacio antes de ':' (".a :hover" no es ".a:hover")
+            fragmento = re.sub(r'\s*([{};,>])\s*', r'\1', fragmento)
+            fragmento = re.sub(r':\s+', ':', fragmento)
+            fragmento = fragmento.replace(';}', '}')
+        partes.append(fragmento)
+    return ''.join(partes).strip() + '\n'
+
+
+def minificar_js(texto):
+    partes = []
+    for es_codigo, fragmento in _segmentos(texto, js=True):
+        if es_codigo:
+            lineas = (re.sub(r'[ \t]+', ' ', linea).strip() for linea in fragmento.split('\n'))
+            fragmento = '\n'.join(lineas)
+            fragmento = re.sub(r'\n+', '\n', fragmento)
+            # '+' y '-' conservan sus espacios ("a - -b")
+            fragmento = re.sub(r' ?([{}()\[\];,:=<>!&|?]) ?', r'\1', fragmento)
+            # Tras '{', ';' o ',' y antes de '}' el salto de línea sobra
+            fragmento = re.sub(r'([{;,])\n', r'\1', fragmento)
+            fragmento = re.sub(r'\n}', '}', fragmento)
+        partes.append(fragmento)
+    return ''.join(partes).strip() + '\n'
+
+
+MINIFICADORES = {'.css': minificar_css, '.js': minificar_js}
+
+
+# ==========================================
+# 2. COMPILACIÓN
+# ==========================================
+def huella(contenido):
+    return hashlib.sha256(contenido).hexdigest()[:LARGO_HUELLA]
+
+
+def _archivos(origen):
+    for carpeta, subcarpetas, archivos in os.walk(origen):
+        subcarpetas.sort()
+        for archivo in sorted(archivos):
+            ruta = os.path.join(carpeta, archivo)
+            yield os.path.relpath(ruta, origen).replace(os.sep, '/'), ruta
+
+
+def huella_origen(origen=ORIGEN):
+    # Huella de toda la carpeta de origen (nombres y contenidos)
+    total = hashlib.sha256()
+    for relativo, ruta in _archivos(origen):
+        with open(ruta, 'rb') as archivo:
+            total.update(relativo.encode('utf-8') + b'\0' + hashlib.sha256(archivo.read()).digest())
+    return total.hexdigest()
+
+
+def compilar(origen=ORIGEN, destino=DESTINO):
+    # Devuelve el manifiesto {origen relativo: compilado relativo}
+    manifiesto = {}
+    vistos = {}
+    for relativo, ruta in _archivos(origen):
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+        original = hashlib.sha256(contenido).hexdigest()
+        if original in vistos:
+            print(f"  {relativo}: idéntico a {vistos[original]}, se omite")
+            manifiesto[relativo] = manifiesto[vistos[original]]
+            continue
+        vistos[original] = relativo
+
+        base, extension = os.path.splitext(relativo)
+        minificar = MINIFICADORES.get(extension)
+        if minificar is None:
+            # Otros activos (imágenes, fuentes) se copian tal cual
+            manifiesto[relativo] = relativo
+            salida = contenido
+        else:
+            salida = minificar(contenido.decode('utf-8')).encode('utf-8')
+            manifiesto[relativo] = f"{base}.{huella(salida)}.min{extension}"
+            print(f"  {relativo} -> {manifiesto[relativo]} ({len(contenido)} -> {len(salida)} bytes)")
+
+        ruta_salida = os.path.join(destino, manifiesto[relativo])
+        # Un archivo con huella que ya existe no se reescribe: conserva su
+        # fecha y con ella la URL que Dash publica (?m=<fecha>)
+        if not (PATRON_HUELLA.search(ruta_salida) and os.path.exists(ruta_salida)):
+            os.makedirs(os.path.dirname(ruta_salida), exist_ok=True)
+            with open(ruta_salida, 'wb') as archivo:
+                archivo.write(salida)
+
+    # Dash incluiría cualquier .css/.js que quede: se borran las versiones viejas
+    vigentes = set(manifiesto.values()) | {MANIFIESTO}
+    for relativo, ruta in list(_archivos(destino)):
+        if relativo not in vigentes:
+            os.remove(ruta)
+    with open(os.path.join(destino, MANIFIESTO), 'w', encoding='utf-8') as archivo:
+        json.dump({'origen': huella_origen(origen), 'archivos': manifiesto}, archivo, indent=2, sort_keys=True)
+    return manifiesto
+
+
+# ==========================================
+# 3. SERVIDOR
+# ==========================================
+def _huella_compilada(destino):
+    try:
+        with open(os.path.join(destino, MANIFIESTO), encoding='utf-8') as archivo:
+            return json.load(archivo).get('origen')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def carpeta(destino=DESTINO, origen=ORIGEN):
+    # Carpeta de activos para dash.Dash(assets_folder=...)
+    if not os.path.exists(os.path.join(destino, MANIFIESTO)):
+        return origen
+    if _huella_compilada(destino) != huella_origen(origen):
+        logger.warning("Los activos compilados en %s no corresponden a %s: se recompilan", destino, origen)
+        try:
+            compilar(origen, destino)
+        except (OSError, ValueError) as error:
+            logger.warning("No se pudieron recompilar los activos (%s): se sirve %s", error, origen)
+            return origen
+    return destino
+
+
+def instalar(app):
+    prefijo = app.config.requests_pathname_prefix + app.config.assets_url_path.strip('/') + '/'
+
+    def cache_inmutable(respuesta):
+        if respuesta.status_code == 200 and request.path.startswith(prefijo) and PATRON_HUELLA.search(request.path):
+            respuesta.headers['Cache-Control'] = CACHE_INMUTABLE
+        return respuesta
+
+    app.server.after_request(cache_inmutable)
+
+
+# ==========================================
+# 4. LÍNEA DE COMANDOS
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compila los activos con huella de contenido")
+    parser.add_argument('--origen', default=ORIGEN)
+    parser.add_argument('--destino', default=DESTINO)
+    args = parser.parse_args(argv)
+
+    print(f"Compilando {args.origen} en {args.destino}")
+    manifiesto = compilar(args.origen, args.destino)
+    print(f"{len(set(manifiesto.values()))} archivos; manifiesto en {os.path.join(args.destino, MANIFIESTO)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
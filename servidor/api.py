@@ -0,0 +1,270 @@
+# ==========================================
+# API HTTP POR LOTES (SIN INTERFAZ)
+# ==========================================
+# Rutas POST /api/sir, /api/rumor, /api/logistic y /api/field. El cuerpo es
+# un JSON con los valores comunes (malla de tiempo o del plano) y una lista
+# de escenarios:
+#
+#     {"t_max": 100, "puntos": 200, "escenarios": [{"beta": 0.3}, {"beta": 0.5}]}
+#
+# Lo que falte en cada escenario toma el valor por defecto de la página
+# correspondiente. Todos los escenarios se resuelven juntos (una sola
+# integración de Modelo.resolver_lote, una evaluación vectorizada de la
+# logística, una malla compartida para los campos), así que el costo fijo
+# de la petición se paga una vez y no por escenario.
+#
+# La respuesta es JSON por defecto; con "formato": "npz" (o ?formato=npz)
+# se devuelve un .npz con un arreglo por variable (escenarios en el primer
+# eje) y con "arrow" un stream IPC de Arrow en formato largo (una fila por
+# escenario y punto), si pyarrow está instalado.
+import io
+import json
+
+import numpy as np
+from flask import Response, jsonify, request
+
+from modelos import RUMOR, SIR
+from modelos.expresiones import compilar
+from modelos.logistico import logistica
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ESCENARIOS_MAXIMOS = 10_000
+VALORES_MAXIMOS = 10_000_000
+# Horizonte máximo de integración (en las unidades de tiempo del modelo):
+# con un t_max enorme el integrador ocupa el hilo de la petición por minutos
+T_MAX = 10_000
+# El integrador explícito da del orden de (tasa más rápida * t_max) pasos:
+# se limita por escenario y, sumado sobre el lote, el trabajo total
+# (unos pocos segundos en el peor caso permitido)
+RIGIDEZ_MAXIMA = 1e5
+TRABAJO_MAXIMO = 1e7
+PUNTOS_CAMPO_MAXIMOS = 200
+FORMATOS = ('json', 'npz', 'arrow') if pa is not None else ('json', 'npz')
+
+
+class ErrorPeticion(ValueError):
+    pass
+
+
+# ==========================================
+# 1. LECTURA DE LA PETICIÓN
+# ==========================================
+def _numero(valor, clave):
+    # float() acepta "nan", "inf" y true/false: se rechazan aquí
+    if isinstance(valor, bool):
+        raise ErrorPeticion(f"{clave} debe ser un número")
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ErrorPeticion(f"{clave} debe ser un número") from None
+    if not np.isfinite(numero):
+        raise ErrorPeticion(f"{clave} debe ser un número finito")
+    return numero
+
+
+def _verificar_rangos(valores):
+    # Límites comunes a todas las rutas (y a los trabajos en segundo plano)
+    if 't_max' in valores and not 0 < valores['t_max'] <= T_MAX:
+        raise ErrorPeticion(f"t_max debe ser mayor que 0 y no superar {T_MAX}")
+    if 'N' in valores and np.any(np.asarray(valores['N']) <= 0):
+        raise ErrorPeticion("N debe ser mayor que 0")
+
+
+def verificar_rigidez(b, k, N, t_max):
+    # Tasas del modelo S -> I -> R: contagio b*N y recuperación k
+    rigidez = np.maximum(np.abs(np.asarray(b) * N), np.abs(np.asarray(k))) * t_max
+    if np.max(rigidez) > RIGIDEZ_MAXIMA:
+        raise ErrorPeticion(f"Tasas demasiado rápidas para el horizonte: max(b·N, k)·t_max no debe superar {RIGIDEZ_MAXIMA:g}")
+    if np.max(rigidez) * np.size(rigidez) > TRABAJO_MAXIMO:
+        raise ErrorPeticion("El lote es demasiado costoso de integrar; divida la petición o acorte t_max")
+
+
+def verificar_iniciales(N, *iniciales):
+    # Las condiciones iniciales deben caber en la población: si no, S0 < 0
+    for nombre, valores in iniciales:
+        if np.any(valores < 0):
+            raise ErrorPeticion(f"{nombre} no puede ser negativo")
+    if np.any(sum(valores for _, valores in iniciales) > N):
+        raise ErrorPeticion(f"{' + '.join(nombre for nombre, _ in iniciales)} no puede superar N")
+
+
+def leer_comunes(cuerpo, defectos):
+    valores = {clave: _numero(cuerpo.get(clave, defecto), clave) for clave, defecto in defectos.items()}
+    _verificar_rangos(valores)
+    # Cantidades de puntos: enteras, sin truncar 2.7 a 2
+    for clave in ('puntos', 'n'):
+        if clave in valores:
+            if not valores[clave].is_integer():
+                raise ErrorPeticion(f"{clave} debe ser un entero")
+            valores[clave] = int(valores[clave])
+    if valores.get('puntos', 2) < 2:
+        raise ErrorPeticion("puntos debe ser al menos 2")
+    return valores
+
+
+def _escenarios(cuerpo, defectos, convertir=_numero):
+    # Lista de escenarios con los defectos aplicados; un parámetro por columna
+    escenarios = cuerpo.get('escenarios', [{}])
+    if not isinstance(escenarios, list) or not escenarios:
+        raise ErrorPeticion("escenarios debe ser una lista no vacía")
+    if len(escenarios) > ESCENARIOS_MAXIMOS:
+        raise ErrorPeticion(f"Máximo {ESCENARIOS_MAXIMOS} escenarios por petición")
+    columnas = {clave: [] for clave in defectos}
+    for escenario in escenarios:
+        if not isinstance(escenario, dict):
+            raise ErrorPeticion("Cada escenario debe ser un objeto")
+        desconocidas = set(escenario) - set(defectos)
+        if desconocidas:
+            raise ErrorPeticion(f"Parámetros desconocidos: {', '.join(sorted(desconocidas))}")
+        for clave, defecto in defectos.items():
+            columnas[clave].append(convertir(escenario.get(clave, defecto), clave))
+    columnas = {clave: np.asarray(valores) for clave, valores in columnas.items()}
+    _verificar_rangos(columnas)
+    return columnas
+
+
+def verificar_tamano(*formas):
+    if sum(int(np.prod(forma)) for forma in formas) > VALORES_MAXIMOS:
+        raise ErrorPeticion(f"La respuesta supera {VALORES_MAXIMOS} valores; divida la petición")
+
+
+# ==========================================
+# 2. RESOLUCIÓN POR LOTES
+# ==========================================
+# Cada función devuelve (parametros, comunes, resultados): los parámetros
+# de cada escenario, los arreglos compartidos (t, malla) y los resultados
+# con los escenarios en el primer eje.
+def lote_sir(cuerpo):
+    comunes = leer_comunes(cuerpo, dict(t_max=100, puntos=200))
+    p = _escenarios(cuerpo, dict(N=1000, beta=0.3, gamma=0.1, I0=1))
+    verificar_iniciales(p['N'], ('I0', p['I0']))
+    verificar_tamano((3, len(p['N']), comunes['puntos']))
+    verificar_rigidez(p['beta'] / p['N'], p['gamma'], p['N'], comunes['t_max'])
+    t = np.linspace(0, comunes['t_max'], comunes['puntos'])
+    # dS/dt = -beta S I / N, como la página del modelo SIR
+    S, I, R = SIR.resolver_lote(np.column_stack([p['N'] - p['I0'], p['I0'], np.zeros_like(p['I0'])]), t,
+                                b=p['beta'] / p['N'], k=p['gamma'])
+    return p, dict(t=t), dict(S=S, I=I, R=R)
+
+
+def lote_rumor(cuerpo):
+    comunes = leer_comunes(cuerpo, dict(t_max=15, puntos=200))
+    p = _escenarios(cuerpo, dict(N=275, b=0.004, k=0.01, I0=1, R0=8))
+    verificar_iniciales(p['N'], ('I0', p['I0']), ('R0', p['R0']))
+    verificar_tamano((3, len(p['N']), comunes['puntos']))
+    verificar_rigidez(p['b'], p['k'], p['N'], comunes['t_max'])
+    t = np.linspace(0, comunes['t_max'], comunes['puntos'])
+    S, I, R = RUMOR.resolver_lote(np.column_stack([p['N'] - p['I0'] - p['R0'], p['I0'], p['R0']]), t,
+                                  b=p['b'], k=p['k'])
+    return p, dict(t=t), dict(S=S, I=I, R=R)
+
+
+def lote_logistica(cuerpo):
+    comunes = leer_comunes(cuerpo, dict(t_max=100, puntos=200))
+    p = _escenarios(cuerpo, dict(P0=20, r=0.1, K=1000))
+    verificar_tamano((len(p['P0']), comunes['puntos']))
+    t = np.linspace(0, comunes['t_max'], comunes['puntos'])
+    return p, dict(t=t), dict(P=logistica(t, p['P0'], p['r'], p['K']))
+
+
+def _texto(valor, clave):
+    if not isinstance(valor, str):
+        raise ErrorPeticion(f"{clave} debe ser un texto")
+    return valor
+
+
+def lote_campo(cuerpo):
+    comunes = leer_comunes(cuerpo, dict(xmin=-5, xmax=5, ymin=-5, ymax=5, n=20))
+    n = comunes['n']
+    if not 2 <= n <= PUNTOS_CAMPO_MAXIMOS:
+        raise ErrorPeticion(f"n debe estar entre 2 y {PUNTOS_CAMPO_MAXIMOS}")
+    p = _escenarios(cuerpo, dict(fx='y', fy='-x - 0.1*y'), convertir=_texto)
+    verificar_tamano((2, len(p['fx']), n, n))
+    X, Y = np.meshgrid(np.linspace(comunes['xmin'], comunes['xmax'], n),
+                       np.linspace(comunes['ymin'], comunes['ymax'], n))
+    # Cada expresión distinta se compila y evalúa una sola vez en la malla común
+    evaluadas = {texto: compilar(texto)(X, Y) for texto in set(p['fx']) | set(p['fy'])}
+    return p, dict(x=X, y=Y), dict(u=np.stack([evaluadas[f] for f in p['fx']]),
+                                   v=np.stack([evaluadas[f] for f in p['fy']]))
+
+
+# ==========================================
+# 3. FORMATOS DE RESPUESTA
+# ==========================================
+def _lista(arreglo):
+    # JSON no admite NaN ni infinitos: se envían como null
+    arreglo = np.asarray(arreglo)
+    if arreglo.dtype.kind == 'f' and not np.isfinite(arreglo).all():
+        return np.where(np.isfinite(arreglo), arreglo, None).tolist()
+    return arreglo.tolist()
+
+
+def respuesta_json(parametros, comunes, resultados):
+    m = len(next(iter(parametros.values())))
+    escenarios = [{**{clave: valores[i].item() for clave, valores in parametros.items()},
+                   **{clave: _lista(valores[i]) for clave, valores in resultados.items()}}
+                  for i in range(m)]
+    return jsonify({**{clave: _lista(valor) for clave, valor in comunes.items()}, 'escenarios': escenarios})
+
+
+def respuesta_npz(parametros, comunes, resultados):
+    archivo = io.BytesIO()
+    np.savez_compressed(archivo, **parametros, **comunes, **resultados)
+    return Response(archivo.getvalue(), mimetype='application/octet-stream',
+                    headers={'Content-Disposition': 'attachment; filename="resultados.npz"'})
+
+
+def respuesta_arrow(parametros, comunes, resultados):
+    # Formato largo: columna escenario + comunes repetidos + resultados
+    forma = next(iter(resultados.values())).shape
+    columnas = {'escenario': np.broadcast_to(np.arange(forma[0]).reshape((-1,) + (1,) * (len(forma) - 1)), forma)}
+    columnas.update({clave: np.broadcast_to(valor, forma) for clave, valor in comunes.items()})
+    columnas.update(resultados)
+    tabla = pa.table({clave: np.ascontiguousarray(valor).ravel() for clave, valor in columnas.items()})
+    tabla = tabla.replace_schema_metadata({'parametros': json.dumps({k: v.tolist() for k, v in parametros.items()})})
+    salida = pa.BufferOutputStream()
+    with pa.ipc.new_stream(salida, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return Response(salida.getvalue().to_pybytes(), mimetype='application/vnd.apache.arrow.stream')
+
+
+RESPUESTAS = {'json': respuesta_json, 'npz': respuesta_npz, 'arrow': respuesta_arrow}
+
+
+# ==========================================
+# 4. RUTAS
+# ==========================================
+def _vista(resolver):
+    def vista():
+        cuerpo = request.get_json(silent=True)
+        if isinstance(cuerpo, list):
+            cuerpo = {'escenarios': cuerpo}
+        if not isinstance(cuerpo, dict):
+            return jsonify(error="El cuerpo debe ser un objeto JSON"), 400
+        formato = request.args.get('formato', cuerpo.get('formato', 'json'))
+        if formato not in FORMATOS:
+            return jsonify(error=f"Formato no disponible: {formato} (use {', '.join(FORMATOS)})"), 400
+        try:
+            parametros, comunes, resultados = resolver(cuerpo)
+        except (ValueError, ArithmeticError) as error:
+            # ArithmeticError: desbordes o divisiones por cero al evaluar
+            # expresiones del usuario
+            return jsonify(error=str(error) or type(error).__name__), 400
+        except RuntimeError as error:
+            return jsonify(error=str(error)), 422
+        return RESPUESTAS[formato](parametros, comunes, resultados)
+
+    vista.__name__ = f'api_{resolver.__name__}'
+    return vista
+
+
+RUTAS = {'sir': lote_sir, 'rumor': lote_rumor, 'logistic': lote_logistica, 'field': lote_campo}
+
+
+def instalar(app):
+    for ruta, resolver in RUTAS.items():
+        app.server.add_url_rule(f'/api/{ruta}', f'api_{ruta}', _vista(resolver), methods=['POST'])
@@ -0,0 +1,37 @@
+# ==========================================
+# ACCESO A LOS CALLBACKS REGISTRADOS
+# ==========================================
+# Las páginas registran sus callbacks con dash.callback, que los guarda en un
+# mapa global hasta la primera solicitud; después Dash los copia a
+# app.callback_map. Estas funciones recorren ambos mapas para que la
+# instrumentación funcione sin importar en qué momento se instale.
+import dash
+from dash import _callback
+
+
+def callbacks_registrados(app):
+    for mapa in (_callback.GLOBAL_CALLBACK_MAP, app.callback_map):
+        for clave, entrada in mapa.items():
+            yield clave, entrada
+
+
+def envolver_callbacks(app, decorador):
+    # Reemplaza la función de cada callback de servidor por decorador(función).
+    # Los callbacks de cliente (sin 'callback') se saltan: no se ejecutan en el servidor.
+    for _, entrada in list(callbacks_registrados(app)):
+        if 'callback' in entrada:
+            entrada['callback'] = decorador(entrada['callback'])
+
+
+def nombre_callback(funcion):
+    return funcion.__name__
+
+
+def pagina_callback(funcion):
+    # Dash conserva el módulo original con functools.wraps, lo que permite
+    # ubicar la página que definió el callback
+    modulo = getattr(funcion, '__module__', None)
+    for pagina in dash.page_registry.values():
+        if pagina['module'] == modulo:
+            return pagina['name']
+    return 'app'
@@ -0,0 +1,72 @@
+# ==========================================
+# MODO EN VIVO: SOLO LA ÚLTIMA SOLICITUD SE CALCULA
+# ==========================================
+# Los deslizadores en vivo disparan una solicitud mientras se arrastran.
+# En el navegador, assets/js/en_vivo.js las limita a una cada
+# INTERVALO_MS (la última posición siempre se envía) y numera cada envío:
+# {cliente, secuencia, valores}, con una secuencia aparte por cada store
+# de destino. En el servidor, cada cliente (pestaña) tiene un turno por
+# callback, igual que las secuencias del navegador: las solicitudes de un
+# mismo cliente a un callback se atienden de a una y, al llegar su turno, la que ya fue superada por una secuencia más
+# nueva se descarta sin resolver nada (PreventUpdate). Así solo se
+# calculan los parámetros más recientes y el servidor no se atrasa con
+# trabajo obsoleto.
+#
+# El registro de secuencias vive en memoria del proceso: con varios
+# procesos de servidor cada uno descarta lo que le llega a él.
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from dash import html, dcc
+from dash.exceptions import PreventUpdate
+
+from servidor.metricas import REGISTRO, Contador
+
+CLIENTES_MAXIMOS = 1000
+
+DESCARTADAS = REGISTRO.agregar(Contador(
+    'en_vivo_descartadas_total', 'Solicitudes en vivo descartadas por una más reciente.', ('callback',)))
+
+_clientes = OrderedDict()
+_candado = threading.Lock()
+
+
+class _Cliente:
+    def __init__(self):
+        self.ultima = -1
+        self.turno = threading.Lock()
+
+
+def _cliente(identificador, secuencia):
+    # Registra la secuencia (si es la más nueva) y devuelve el cliente;
+    # identificador es (pestaña, callback)
+    with _candado:
+        cliente = _clientes.pop(identificador, None) or _Cliente()
+        _clientes[identificador] = cliente
+        cliente.ultima = max(cliente.ultima, secuencia)
+        while len(_clientes) > CLIENTES_MAXIMOS:
+            _clientes.popitem(last=False)
+    return cliente
+
+
+@contextmanager
+def turno(datos, nombre):
+    # Uso: with turno(datos_del_store, 'simular_sir_en_vivo'): resolver...
+    if not datos:
+        raise PreventUpdate
+    cliente = _cliente((datos['cliente'], nombre), datos['secuencia'])
+    with cliente.turno:
+        if datos['secuencia'] < cliente.ultima:
+            DESCARTADAS.incrementar(callback=nombre)
+            raise PreventUpdate
+        yield datos['valores']
+
+
+def deslizador(etiqueta, id_deslizador, minimo, maximo, paso, valor):
+    # updatemode='drag': envía valores mientras se arrastra (limitados en el cliente)
+    return html.Div([
+        html.Label(etiqueta, style={'fontWeight': 'bold', 'color': 'green', 'fontSize': '14px'}),
+        dcc.Slider(id=id_deslizador, min=minimo, max=maximo, step=paso, value=valor,
+                   updatemode='drag', marks=None, tooltip={'placement': 'bottom', 'always_visible': True})
+    ], style={'marginBottom': '15px'})
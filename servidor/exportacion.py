@@ -0,0 +1,151 @@
+# ==========================================
+# EXPORTACIÓN DE RESULTADOS EN STREAMING
+# ==========================================
+# Cada página registra un exportador: columnas, parámetros con su valor por
+# defecto y un generador que entrega la tabla en bloques (arreglos de
+# filas x columnas). La ruta /exportar/<nombre>.<formato> convierte cada
+# bloque a CSV (o a un row group de Parquet si pyarrow está instalado) y lo
+# envía en cuanto está listo, así que la descarga empieza de inmediato y el
+# servidor nunca tiene el archivo entero en memoria, aunque sean millones
+# de puntos o muchos escenarios.
+#
+# Como la respuesta empieza antes de generar los datos, los parámetros se
+# validan todos al recibir la solicitud (400): un error dentro del
+# generador cortaría la descarga a medias.
+import io
+import math
+from urllib.parse import urlencode
+
+import numpy as np
+from dash import html, dcc
+from flask import Response, abort, request, stream_with_context
+
+from servidor.api import T_MAX
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PUNTOS_MAXIMOS = 5_000_000
+TIPOS_CONTENIDO = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+FORMATOS = ('csv', 'parquet') if pq is not None else ('csv',)
+
+_exportadores = {}
+
+
+def registrar(nombre, columnas, parametros, generar, horizonte='t_max', positivos=()):
+    # generar(**parametros) -> iterador de bloques (filas, len(columnas));
+    # horizonte es el parámetro del tiempo final y positivos los que deben
+    # ser mayores que 0 (poblaciones por las que se divide)
+    _exportadores[nombre] = (tuple(columnas), dict(parametros), generar, horizonte, tuple(positivos))
+
+
+def enlace(nombre, formato, **parametros):
+    return f"/exportar/{nombre}.{formato}?{urlencode(parametros)}"
+
+
+# ==========================================
+# 1. FORMATOS
+# ==========================================
+def bloques_csv(columnas, bloques):
+    yield ','.join(columnas) + '\n'
+    for bloque in bloques:
+        texto = io.StringIO()
+        np.savetxt(texto, bloque, fmt='%.10g', delimiter=',')
+        yield texto.getvalue()
+
+
+class _Sumidero(io.RawIOBase):
+    # Archivo de solo escritura que se vacía después de cada row group;
+    # tell() cuenta todo lo escrito porque Parquet guarda desplazamientos
+    def __init__(self):
+        super().__init__()
+        self.partes = []
+        self.escritos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        self.escritos += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.escritos
+
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+def bloques_parquet(columnas, bloques):
+    esquema = pa.schema([(columna, pa.float64()) for columna in columnas])
+    sumidero = _Sumidero()
+    with pq.ParquetWriter(sumidero, esquema) as escritor:
+        for bloque in bloques:
+            escritor.write_table(pa.Table.from_arrays(list(np.asarray(bloque, dtype=float).T), schema=esquema))
+            yield sumidero.vaciar()
+    # Pie del archivo (metadatos)
+    yield sumidero.vaciar()
+
+
+# ==========================================
+# 2. RUTA
+# ==========================================
+def _leer_parametros(parametros, horizonte, positivos):
+    valores = {}
+    for clave, defecto in parametros.items():
+        texto = request.args.get(clave)
+        try:
+            valores[clave] = defecto if texto in (None, '', 'None') else type(defecto)(float(texto))
+        except (ValueError, OverflowError):
+            abort(400, f"Parámetro inválido: {clave}")
+        if not math.isfinite(valores[clave]):
+            abort(400, f"{clave} debe ser un número finito")
+    if not 1 < valores.get('puntos', 2) <= PUNTOS_MAXIMOS:
+        abort(400, f"puntos debe estar entre 2 y {PUNTOS_MAXIMOS}")
+    if horizonte in valores and not 0 < valores[horizonte] <= T_MAX:
+        abort(400, f"{horizonte} debe ser mayor que 0 y no superar {T_MAX}")
+    for clave in positivos:
+        if not valores[clave] > 0:
+            abort(400, f"{clave} debe ser mayor que 0")
+    return valores
+
+
+def _vista_exportar(nombre, formato):
+    if nombre not in _exportadores or formato not in FORMATOS:
+        abort(404)
+    columnas, parametros, generar, horizonte, positivos = _exportadores[nombre]
+    bloques = generar(**_leer_parametros(parametros, horizonte, positivos))
+    convertir = bloques_csv if formato == 'csv' else bloques_parquet
+    return Response(stream_with_context(convertir(columnas, bloques)),
+                    mimetype=TIPOS_CONTENIDO[formato],
+                    headers={'Content-Disposition': f'attachment; filename="{nombre}.{formato}"'})
+
+
+def instalar(app):
+    app.server.add_url_rule('/exportar/<nombre>.<formato>', 'exportar', _vista_exportar)
+
+
+# ==========================================
+# 3. CONTROLES PARA LAS PÁGINAS
+# ==========================================
+def controles(sufijo, puntos):
+    # Formato, cantidad de puntos y el enlace de descarga; cada página
+    # actualiza el href del enlace (id descarga-<sufijo>) con sus parámetros
+    return html.Div([
+        html.Label("Exportar resultados:", style={'fontWeight': 'bold', 'color': 'green', 'fontSize': '14px'}),
+        dcc.RadioItems(id=f"formato-descarga-{sufijo}", options=[{'label': f' {f.upper()}', 'value': f} for f in FORMATOS],
+                       value='csv', inline=True, style={'marginTop': '5px'}),
+        html.Div([
+            dcc.Input(id=f"puntos-descarga-{sufijo}", type="number", value=puntos, min=2, max=PUNTOS_MAXIMOS, step=1,
+                      style={'width': '120px', 'padding': '6px', 'borderRadius': '5px', 'border': '1px solid #ccc'}),
+            html.Span(" puntos  ", style={'fontSize': '13px', 'color': '#555'}),
+            html.A("Descargar", id=f"descarga-{sufijo}", href="", download="",
+                   style={'color': 'green', 'fontWeight': 'bold'})
+        ], style={'marginTop': '8px'})
+    ], style={'marginTop': '20px', 'borderTop': '1px dashed lightpink', 'paddingTop': '10px'})
@@ -0,0 +1,158 @@
+# ==========================================
+# MEMORIA POR CALLBACK Y PRESUPUESTO DE ASIGNACIONES
+# ==========================================
+# En contenedores pequeños un campo vectorial denso o una simulación grande
+# pueden disparar la memoria sin aviso. Este módulo exporta siempre la
+# memoria residente del proceso (RSS) en /metrics y, opcionalmente, mide con
+# tracemalloc el pico de memoria asignada por cada invocación de callback.
+#
+# La medición por callback se activa al arrancar con MEMORIA_CALLBACKS=1
+# (sin ella no se instala ningún envoltorio ni se inicia tracemalloc, que
+# hace más lenta cada asignación). Con ella:
+#   - cada pico se observa en el histograma dash_callback_memoria_pico_bytes,
+#   - si supera MEMORIA_PRESUPUESTO_MB se cuenta en
+#     dash_callback_memoria_excedida_total y se registra en el log el pico
+#     y los MEMORIA_TOP sitios (archivo:línea) que más memoria ocupaban
+#     durante el exceso, respecto a una instantánea de referencia.
+#
+# El pico sale de get_traced_memory() tras reset_peak(), que no recorre el
+# heap. Las instantáneas (caras) no se toman en cada llamada: un hilo de
+# muestreo revisa cada MEMORIA_MUESTREO_MS la memoria asignada y, la
+# primera vez que la llamada en curso pasa el presupuesto, toma una
+# instantánea mientras la memoria sigue ocupada. Se compara con la de
+# referencia (tomada al instalar y renovada después de cada informe), así
+# que lista lo que causó el pico y no todo lo que el proceso retiene. Un
+# pico más corto que el intervalo de muestreo se informa con la
+# instantánea del final.
+#
+# tracemalloc tiene un solo pico por proceso: mientras el modo está activo
+# los callbacks medidos se atienden de a uno para que cada pico sea de una
+# sola invocación. Es una herramienta de diagnóstico, no para producción.
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from functools import wraps
+
+from servidor.callbacks import envolver_callbacks, nombre_callback, pagina_callback
+from servidor.metricas import REGISTRO, Contador, Histograma, Medidor
+
+VARIABLE_ENTORNO = 'MEMORIA_CALLBACKS'
+PRESUPUESTO_MB = float(os.environ.get('MEMORIA_PRESUPUESTO_MB', '256'))
+SITIOS_RESUMEN = int(os.environ.get('MEMORIA_TOP', '10'))
+MARCOS = int(os.environ.get('MEMORIA_MARCOS', '1'))
+MUESTREO_MS = float(os.environ.get('MEMORIA_MUESTREO_MS', '10'))
+LIMITES_BYTES = tuple(mb * 2**20 for mb in (1, 4, 16, 64, 128, 256, 512, 1024, 2048, 4096))
+
+logger = logging.getLogger(__name__)
+
+# Serializa los callbacks medidos (un pico por invocación)
+_candado = threading.Lock()
+_referencia = None
+
+
+def activo():
+    return os.environ.get(VARIABLE_ENTORNO, '').lower() not in ('', '0', 'false', 'no')
+
+
+def memoria_residente():
+    # RSS actual en bytes (Linux); NaN donde /proc no existe
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return float('nan')
+
+
+REGISTRO.agregar(Medidor(
+    'proceso_memoria_residente_bytes', 'Memoria residente (RSS) del proceso del servidor.', memoria_residente))
+PICO_CALLBACK = REGISTRO.agregar(Histograma(
+    'dash_callback_memoria_pico_bytes', 'Pico de memoria asignada (tracemalloc) por invocación de callback.',
+    ('callback', 'pagina'), limites=LIMITES_BYTES))
+EXCEDIDOS = REGISTRO.agregar(Contador(
+    'dash_callback_memoria_excedida_total', 'Invocaciones cuyo pico de memoria superó el presupuesto.',
+    ('callback', 'pagina')))
+
+
+# ==========================================
+# 1. RESUMEN DE SITIOS DE ASIGNACIÓN
+# ==========================================
+def sitios_principales(instantanea, referencia, cantidad=SITIOS_RESUMEN):
+    # [(archivo:línea, bytes de más, bloques de más), ...] de mayor a menor,
+    # sin lo que ocupan las propias instantáneas
+    propias = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diferencias = instantanea.filter_traces(propias).compare_to(referencia.filter_traces(propias), 'lineno')
+    return [(f"{d.traceback[0].filename}:{d.traceback[0].lineno}", d.size_diff, d.count_diff)
+            for d in diferencias[:cantidad] if d.size_diff > 0]
+
+
+def _informar(callback, pico, durante):
+    global _referencia
+    momento = "durante el exceso" if durante is not None else "al terminar (pico más corto que el muestreo)"
+    sitios = sitios_principales(durante or tracemalloc.take_snapshot(), _referencia)
+    lineas = '\n'.join(f"  {sitio}: {tamano / 2**20:.1f} MB en {bloques} bloques"
+                       for sitio, tamano, bloques in sitios)
+    logger.warning("%s asignó un pico de %.1f MB (presupuesto %.0f MB). Sitios que más ocupaban %s:\n%s",
+                   callback, pico / 2**20, PRESUPUESTO_MB, momento, lineas or "  (ninguno)")
+    _referencia = tracemalloc.take_snapshot()
+
+
+# ==========================================
+# 2. MUESTREO DURANTE LA LLAMADA
+# ==========================================
+class _Medicion:
+    def __init__(self, base):
+        self.base = base
+        self.instantanea = None
+
+
+_en_curso = None
+
+
+def _muestrear():
+    # Hilo de fondo: instantánea de la llamada en curso al pasar el presupuesto
+    while True:
+        time.sleep(MUESTREO_MS / 1000)
+        medicion = _en_curso
+        if (medicion is not None and medicion.instantanea is None
+                and tracemalloc.get_traced_memory()[0] - medicion.base > PRESUPUESTO_MB * 2**20):
+            medicion.instantanea = tracemalloc.take_snapshot()
+
+
+# ==========================================
+# 3. ENVOLTORIO DE CALLBACKS
+# ==========================================
+def _envolver(funcion):
+    callback = nombre_callback(funcion)
+    pagina = pagina_callback(funcion)
+
+    @wraps(funcion)
+    def medir_memoria(*args, **kwargs):
+        global _en_curso
+        with _candado:
+            medicion = _Medicion(tracemalloc.get_traced_memory()[0])
+            tracemalloc.reset_peak()
+            _en_curso = medicion
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _en_curso = None
+                pico = tracemalloc.get_traced_memory()[1] - medicion.base
+                PICO_CALLBACK.observar(pico, callback=callback, pagina=pagina)
+                if pico > PRESUPUESTO_MB * 2**20:
+                    EXCEDIDOS.incrementar(callback=callback, pagina=pagina)
+                    _informar(callback, pico, medicion.instantanea)
+
+    return medir_memoria
+
+
+def instalar(app):
+    global _referencia
+    if not activo():
+        return
+    tracemalloc.start(MARCOS)
+    _referencia = tracemalloc.take_snapshot()
+    threading.Thread(target=_muestrear, name='memoria-muestreo', daemon=True).start()
+    envolver_callbacks(app, _envolver)
+    logger.warning("Medición de memoria por callback activa (presupuesto %.0f MB)", PRESUPUESTO_MB)
@@ -0,0 +1,257 @@
+# ==========================================
+# MÉTRICAS DE RENDIMIENTO POR CALLBACK
+# ==========================================
+# Mide cada callback registrado y separa su tiempo en fases:
+#   - resolver:       integración numérica (odeint, evaluación de campos, ...)
+#   - figura:         construcción de los go.Figure
+#   - serializacion:  conversión a JSON de la respuesta (la hace Dash)
+#   - otros:          el resto (validaciones, textos, etc.)
+#
+# Las páginas marcan sus fases con:
+#     with fase("resolver"):
+#         ...
+# Fuera de un callback instrumentado `fase` no mide nada.
+#
+# Los datos se exportan en formato de texto de Prometheus en /metrics y cada
+# respuesta de callback lleva un encabezado Server-Timing con las mismas
+# duraciones para verlas en las herramientas del navegador.
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from dash import _callback
+from flask import Response, g
+
+from servidor.callbacks import envolver_callbacks, nombre_callback, pagina_callback
+
+LIMITES_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TIPO_CONTENIDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# ==========================================
+# 1. TIPOS DE MÉTRICA (FORMATO PROMETHEUS)
+# ==========================================
+def _etiquetas_texto(nombres, valores, extra=''):
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Contador:
+    tipo = 'counter'
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores = {}
+        self._candado = threading.Lock()
+
+    def incrementar(self, cantidad=1, **etiquetas):
+        clave = tuple(etiquetas[n] for n in self.etiquetas)
+        with self._candado:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def muestras(self):
+        with self._candado:
+            valores = dict(self._valores)
+        for clave, valor in sorted(valores.items()):
+            yield f"{self.nombre}{_etiquetas_texto(self.etiquetas, clave)} {valor}"
+
+
+class Medidor:
+    # Valor instantáneo calculado al momento de exportar
+    tipo = 'gauge'
+
+    def __init__(self, nombre, ayuda, funcion):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.funcion = funcion
+
+    def muestras(self):
+        yield f"{self.nombre} {self.funcion()}"
+
+
+class Histograma:
+    tipo = 'histogram'
+
+    def __init__(self, nombre, ayuda, etiquetas=(), limites=LIMITES_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.limites = tuple(limites)
+        self._series = {}
+        self._candado = threading.Lock()
+
+    def observar(self, valor, **etiquetas):
+        clave = tuple(etiquetas[n] for n in self.etiquetas)
+        with self._candado:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [[0] * len(self.limites), 0.0, 0]
+            for i, limite in enumerate(self.limites):
+                if valor <= limite:
+                    serie[0][i] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def muestras(self):
+        with self._candado:
+            series = {clave: ([*s[0]], s[1], s[2]) for clave, s in self._series.items()}
+        for clave, (cubetas, suma, cuenta) in sorted(series.items()):
+            for limite, acumulado in zip(self.limites, cubetas):
+                etiquetas = _etiquetas_texto(self.etiquetas, clave, 'le="%s"' % limite)
+                yield f"{self.nombre}_bucket{etiquetas} {acumulado}"
+            etiquetas = _etiquetas_texto(self.etiquetas, clave, 'le="+Inf"')
+            yield f"{self.nombre}_bucket{etiquetas} {cuenta}"
+            yield f"{self.nombre}_sum{_etiquetas_texto(self.etiquetas, clave)} {suma}"
+            yield f"{self.nombre}_count{_etiquetas_texto(self.etiquetas, clave)} {cuenta}"
+
+
+class Registro:
+    def __init__(self):
+        self.metricas = []
+
+    def agregar(self, metrica):
+        self.metricas.append(metrica)
+        return metrica
+
+    def exportar(self):
+        lineas = []
+        for metrica in self.metricas:
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            lineas.extend(metrica.muestras())
+        return '\n'.join(lineas) + '\n'
+
+
+REGISTRO = Registro()
+
+DURACION_CALLBACK = REGISTRO.agregar(Histograma(
+    'dash_callback_duracion_segundos', 'Duración total de cada callback.',
+    ('callback', 'pagina')))
+DURACION_FASE = REGISTRO.agregar(Histograma(
+    'dash_callback_fase_segundos', 'Duración de cada fase (resolver, figura, serializacion, otros).',
+    ('callback', 'pagina', 'fase')))
+CONSULTAS_CACHE = REGISTRO.agregar(Contador(
+    'dash_callback_cache_total', 'Consultas a caches de simulación (resultado = acierto | fallo).',
+    ('callback', 'pagina', 'cache', 'resultado')))
+
+
+# ==========================================
+# 2. MEDICIÓN DE FASES
+# ==========================================
+class Medicion:
+    def __init__(self, callback, pagina):
+        self.callback = callback
+        self.pagina = pagina
+        self.fases = {}
+        self.total = 0.0
+
+
+_medicion_actual = contextvars.ContextVar('medicion_actual', default=None)
+
+
+@contextmanager
+def fase(nombre):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.fases[nombre] = medicion.fases.get(nombre, 0.0) + time.perf_counter() - inicio
+
+
+def contar_cache(cache, acierto):
+    # Se llama desde las caches de simulación; fuera de un callback se
+    # atribuye a 'sin_callback' para no perder la cuenta
+    medicion = _medicion_actual.get()
+    CONSULTAS_CACHE.incrementar(
+        callback=medicion.callback if medicion else 'sin_callback',
+        pagina=medicion.pagina if medicion else '',
+        cache=cache, resultado='acierto' if acierto else 'fallo')
+
+
+def _registrar(medicion):
+    etiquetas = dict(callback=medicion.callback, pagina=medicion.pagina)
+    medidas = sum(medicion.fases.values())
+    medicion.fases['otros'] = max(medicion.total - medidas, 0.0)
+    DURACION_CALLBACK.observar(medicion.total, **etiquetas)
+    for nombre, duracion in medicion.fases.items():
+        DURACION_FASE.observar(duracion, fase=nombre, **etiquetas)
+
+
+def _envolver(funcion):
+    callback = nombre_callback(funcion)
+    pagina = pagina_callback(funcion)
+
+    @wraps(funcion)
+    def medir_callback(*args, **kwargs):
+        medicion = Medicion(callback, pagina)
+        token = _medicion_actual.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            medicion.total = time.perf_counter() - inicio
+            _medicion_actual.reset(token)
+            _registrar(medicion)
+            g.setdefault('mediciones_callback', []).append(medicion)
+
+    return medir_callback
+
+
+def _medir_serializacion():
+    # Dash convierte la respuesta de cada callback con _callback.to_json
+    # después de llamar a la función de la página; se envuelve esa función
+    # para atribuir su tiempo a la fase "serializacion".
+    original = getattr(_callback, 'to_json', None)
+    if original is None or getattr(original, 'medido', False):
+        return
+
+    @wraps(original)
+    def to_json(objeto):
+        with fase('serializacion'):
+            return original(objeto)
+
+    to_json.medido = True
+    _callback.to_json = to_json
+
+
+# ==========================================
+# 3. RUTAS Y ENCABEZADOS
+# ==========================================
+def _server_timing(mediciones):
+    duraciones = {}
+    for medicion in mediciones:
+        for nombre, duracion in (*medicion.fases.items(), ('total', medicion.total)):
+            duraciones[nombre] = duraciones.get(nombre, 0.0) + duracion
+    return ', '.join(f'{nombre};dur={duracion * 1e3:.2f}' for nombre, duracion in duraciones.items())
+
+
+def _agregar_server_timing(respuesta):
+    mediciones = g.get('mediciones_callback')
+    if mediciones:
+        respuesta.headers['Server-Timing'] = _server_timing(mediciones)
+    return respuesta
+
+
+def _vista_metricas():
+    return Response(REGISTRO.exportar(), mimetype=TIPO_CONTENIDO)
+
+
+def instrumentar(app):
+    _medir_serializacion()
+    envolver_callbacks(app, _envolver)
+    app.server.add_url_rule('/metrics', 'metricas', _vista_metricas)
+    app.server.after_request(_agregar_server_timing)
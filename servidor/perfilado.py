@@ -0,0 +1,122 @@
+# ==========================================
+# PERFILADO BAJO DEMANDA DE CALLBACKS
+# ==========================================
+# Permite perfilar con cProfile una sola solicitud lenta (por ejemplo un k2
+# rígido en Comparacion Escenarios o una malla densa en Campo Vectorial).
+#
+# Se activa en dos pasos:
+#   1. Arrancar la app con la variable de entorno PERFILAR_CALLBACKS=1.
+#      Sin ella no se instala ningún envoltorio: el costo es nulo.
+#   2. Enviar la solicitud del callback con el encabezado "X-Perfilar: 1"
+#      (p. ej. "Copy as cURL" en las devtools y añadir -H "X-Perfilar: 1").
+#
+# Cada solicitud perfilada escribe perfiles/<callback>_<fecha>.pstats, añade
+# a la respuesta los encabezados X-Perfil-Archivo y X-Perfil-Resumen (funciones
+# con mayor tiempo acumulado) y registra el resumen completo en el log. El
+# resumen en texto también queda disponible en /_perfiles/<archivo>.
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from functools import wraps
+
+from flask import Response, abort, g, request
+
+from servidor.callbacks import envolver_callbacks, nombre_callback
+
+VARIABLE_ENTORNO = 'PERFILAR_CALLBACKS'
+ENCABEZADO = 'X-Perfilar'
+DIRECTORIO = os.environ.get('PERFILAR_DIRECTORIO', 'perfiles')
+FUNCIONES_RESUMEN = int(os.environ.get('PERFILAR_TOP', '20'))
+FUNCIONES_ENCABEZADO = 5
+
+logger = logging.getLogger(__name__)
+
+# cProfile solo admite un perfilador activo por proceso en versiones
+# recientes de Python; las solicitudes perfiladas se atienden de a una
+_candado = threading.Lock()
+
+
+def activo():
+    return os.environ.get(VARIABLE_ENTORNO, '').lower() not in ('', '0', 'false', 'no')
+
+
+# ==========================================
+# 1. RESÚMENES
+# ==========================================
+def resumen_texto(estadisticas, cantidad=FUNCIONES_RESUMEN):
+    salida = io.StringIO()
+    estadisticas.stream = salida
+    estadisticas.sort_stats('cumulative').print_stats(cantidad)
+    return salida.getvalue()
+
+
+def funciones_principales(estadisticas, cantidad=FUNCIONES_ENCABEZADO):
+    # [(función, tiempo acumulado en s), ...] ordenado de mayor a menor
+    filas = sorted(estadisticas.stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [(f"{os.path.basename(archivo)}:{linea}({funcion})", datos[3])
+            for (archivo, linea, funcion), datos in filas[:cantidad]]
+
+
+def _guardar(perfil, callback):
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    marca = time.strftime('%Y%m%d-%H%M%S') + f"-{time.time_ns() // 1000 % 1_000_000:06d}"
+    archivo = f"{callback}_{marca}.pstats"
+    perfil.dump_stats(os.path.join(DIRECTORIO, archivo))
+
+    estadisticas = pstats.Stats(perfil)
+    logger.info("Perfil de %s guardado en %s\n%s", callback, archivo, resumen_texto(estadisticas))
+    return archivo, funciones_principales(estadisticas)
+
+
+# ==========================================
+# 2. ENVOLTORIO DE CALLBACKS
+# ==========================================
+def _solicitado():
+    return request.headers.get(ENCABEZADO, '').lower() in ('1', 'true', 'si', 'sí')
+
+
+def _envolver(funcion):
+    callback = nombre_callback(funcion)
+
+    @wraps(funcion)
+    def perfilar_callback(*args, **kwargs):
+        if not _solicitado():
+            return funcion(*args, **kwargs)
+        with _candado:
+            perfil = cProfile.Profile()
+            try:
+                return perfil.runcall(funcion, *args, **kwargs)
+            finally:
+                g.perfil_callback = _guardar(perfil, callback)
+
+    return perfilar_callback
+
+
+def _agregar_encabezados(respuesta):
+    perfil = g.get('perfil_callback')
+    if perfil:
+        archivo, principales = perfil
+        resumen = '; '.join(f"{nombre} {segundos * 1e3:.1f}ms" for nombre, segundos in principales)
+        respuesta.headers['X-Perfil-Archivo'] = archivo
+        respuesta.headers['X-Perfil-Resumen'] = resumen.encode('ascii', 'replace').decode('ascii')
+    return respuesta
+
+
+def _vista_perfil(archivo):
+    ruta = os.path.join(DIRECTORIO, os.path.basename(archivo))
+    if not archivo.endswith('.pstats') or not os.path.exists(ruta):
+        abort(404)
+    return Response(resumen_texto(pstats.Stats(ruta)), mimetype='text/plain; charset=utf-8')
+
+
+def instalar(app):
+    if not activo():
+        return
+    envolver_callbacks(app, _envolver)
+    app.server.after_request(_agregar_encabezados)
+    app.server.add_url_rule('/_perfiles/<archivo>', 'perfiles', _vista_perfil)
+    logger.warning("Perfilado de callbacks activo: use el encabezado %s: 1", ENCABEZADO)
@@ -0,0 +1,352 @@
+# ==========================================
+# COLA DE TRABAJOS LARGOS (ASYNCIO + PROCESOS)
+# ==========================================
+# Barridos de parámetros del rumor o campos vectoriales enormes pueden
+# tardar minutos. En lugar de correr dentro de un callback, se envían como
+# trabajos:
+#
+#     POST   /trabajos/<tipo>            -> 202 {"id": ...}  (429 si la cola está llena)
+#     GET    /trabajos/<id>              -> estado y progreso
+#     GET    /trabajos/<id>/resultado    -> JSON, npz o Arrow (?formato=...)
+#     DELETE /trabajos/<id>              -> cancela
+#
+# Un bucle de asyncio en un hilo propio saca los trabajos de una cola
+# acotada (COLA_MAXIMA en espera; más allá se rechaza para que el cliente
+# reintente, en vez de acumular trabajo sin límite). Cada trabajo se parte
+# en bloques que se ejecutan en un pool de procesos aparte, con prioridad
+# baja (nice), para que no compita con los callbacks interactivos; el
+# progreso es la fracción de bloques terminados y cancelar descarta los
+# bloques que no empezaron. Si un proceso del pool muere (p. ej. por falta
+# de memoria) el trabajo termina con error y el pool se reemplaza, para que
+# la cola siga funcionando. Los resultados se guardan RETENCION_SEGUNDOS
+# después de terminar y luego se borran; en JSON se entregan solo hasta
+# VALORES_MAXIMOS valores (más grandes, con ?formato=npz o arrow).
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import numpy as np
+from flask import jsonify, request
+
+from modelos import RUMOR
+from modelos.expresiones import compilar
+from modelos.sensibilidad import salidas_sir
+from servidor.api import (
+    FORMATOS, RESPUESTAS, VALORES_MAXIMOS, ErrorPeticion, leer_comunes, verificar_iniciales, verificar_rigidez,
+    verificar_tamano,
+)
+from servidor.metricas import REGISTRO, Medidor
+
+COLA_MAXIMA = int(os.environ.get('TRABAJOS_COLA', '8'))
+TRABAJOS_SIMULTANEOS = 1
+PROCESOS = int(os.environ.get('TRABAJOS_PROCESOS', str(max((os.cpu_count() or 2) - 1, 1))))
+RETENCION_SEGUNDOS = int(os.environ.get('TRABAJOS_RETENCION', '900'))
+PRIORIDAD_PROCESOS = 10
+
+COMBINACIONES_MAXIMAS = 1_000_000
+BLOQUE_BARRIDO = 4096
+PUNTOS_CAMPO_MAXIMOS = 2000
+FILAS_CAMPO = 100
+
+
+# ==========================================
+# 1. TIPOS DE TRABAJO
+# ==========================================
+# Cada tipo valida el cuerpo de la petición y devuelve (tareas, combinar):
+# tareas son funciones sin argumentos (serializables) que corren en el
+# pool, y combinar arma con sus resultados la tripleta (parametros,
+# comunes, resultados) de servidor.api.
+def _valores(cuerpo, clave, defecto):
+    valores = np.atleast_1d(np.asarray(cuerpo.get(clave, defecto), dtype=float))
+    if valores.ndim != 1 or not len(valores) or not np.isfinite(valores).all():
+        raise ErrorPeticion(f"{clave} debe ser un número o una lista de números finitos")
+    return valores
+
+
+def barrido_rumor(cuerpo):
+    # Malla b x k con N, I0, R0 fijos; por combinación: pico, día del pico
+    # y personas alcanzadas
+    comunes = leer_comunes(cuerpo, dict(N=275, I0=1, R0=8, t_max=15, puntos=401))
+    try:
+        b, k = _valores(cuerpo, 'b', 0.004), _valores(cuerpo, 'k', 0.01)
+    except (TypeError, ValueError):
+        raise ErrorPeticion("b y k deben ser números o listas de números") from None
+    if len(b) * len(k) > COMBINACIONES_MAXIMAS:
+        raise ErrorPeticion(f"Máximo {COMBINACIONES_MAXIMAS} combinaciones por trabajo")
+    verificar_iniciales(comunes['N'], ('I0', comunes['I0']), ('R0', comunes['R0']))
+    # Cada bloque integra sus escenarios juntos: la misma cota que la API
+    verificar_tamano((3, min(len(b) * len(k), BLOQUE_BARRIDO), comunes['puntos']))
+    B, K = (v.ravel() for v in np.meshgrid(b, k, indexing='ij'))
+    # Los bloques en curso no se pueden cancelar: se rechaza antes de encolar
+    # lo que ocuparía un proceso sin fin
+    verificar_rigidez(B, K, comunes['N'], comunes['t_max'])
+    fijos = {clave: comunes[clave] for clave in ('N', 'I0', 'R0')}
+    tareas = [partial(salidas_sir, {'b': B[i:i + BLOQUE_BARRIDO], 'k': K[i:i + BLOQUE_BARRIDO]},
+                      comunes['t_max'], fijos, RUMOR, comunes['puntos'])
+              for i in range(0, len(B), BLOQUE_BARRIDO)]
+
+    def combinar(partes):
+        return (dict(b=B, k=K), {},
+                {salida: np.concatenate([p[salida] for p in partes]) for salida in partes[0]})
+
+    return tareas, combinar
+
+
+def filas_campo(fx, fy, x, y):
+    X, Y = np.meshgrid(x, y)
+    return compilar(fx)(X, Y), compilar(fy)(X, Y)
+
+
+def campo_grande(cuerpo):
+    # Campo (fx, fy) sin normalizar en una malla de hasta 2000 x 2000,
+    # evaluado por franjas de FILAS_CAMPO filas
+    comunes = leer_comunes(cuerpo, dict(xmin=-5, xmax=5, ymin=-5, ymax=5, n=500))
+    n = comunes['n']
+    if not 2 <= n <= PUNTOS_CAMPO_MAXIMOS:
+        raise ErrorPeticion(f"n debe estar entre 2 y {PUNTOS_CAMPO_MAXIMOS}")
+    fx, fy = str(cuerpo.get('fx', 'y')), str(cuerpo.get('fy', '-x - 0.1*y'))
+    compilar(fx), compilar(fy)
+    x = np.linspace(comunes['xmin'], comunes['xmax'], n)
+    y = np.linspace(comunes['ymin'], comunes['ymax'], n)
+    tareas = [partial(filas_campo, fx, fy, x, y[i:i + FILAS_CAMPO]) for i in range(0, n, FILAS_CAMPO)]
+
+    def combinar(partes):
+        X, Y = np.meshgrid(x, y)
+        return (dict(fx=np.array([fx]), fy=np.array([fy])), dict(x=X, y=Y),
+                dict(u=np.concatenate([p[0] for p in partes])[None], v=np.concatenate([p[1] for p in partes])[None]))
+
+    return tareas, combinar
+
+
+TIPOS = {'barrido_rumor': barrido_rumor, 'campo': campo_grande}
+
+
+# ==========================================
+# 2. TRABAJOS Y BUCLE DE EVENTOS
+# ==========================================
+class ColaLlena(Exception):
+    pass
+
+
+class Trabajo:
+    def __init__(self, tipo, tareas, combinar):
+        self.id = uuid.uuid4().hex
+        self.tipo = tipo
+        self.tareas = tareas
+        self.combinar = combinar
+        self.estado = 'en_cola'
+        self.hechas = 0
+        self.resultado = None
+        self.error = None
+        self.creado = time.time()
+        self.iniciado = self.terminado = None
+        self.tarea_asyncio = None
+
+    def resumen(self):
+        return {
+            'id': self.id, 'tipo': self.tipo, 'estado': self.estado,
+            'progreso': self.hechas / len(self.tareas), 'bloques': len(self.tareas),
+            'creado': self.creado, 'iniciado': self.iniciado, 'terminado': self.terminado,
+            'expira': self.terminado + RETENCION_SEGUNDOS if self.terminado else None,
+            'error': self.error,
+        }
+
+
+_trabajos = {}
+_candado = threading.Lock()
+_bucle = None
+_cola = None
+_pool = None
+
+
+def _bajar_prioridad():
+    os.nice(PRIORIDAD_PROCESOS)
+
+
+def _nuevo_pool():
+    return ProcessPoolExecutor(max_workers=PROCESOS, initializer=_bajar_prioridad)
+
+
+def _reemplazar_pool(roto):
+    # Un pool con un proceso muerto rechaza todo lo que se le envíe
+    global _pool
+    with _candado:
+        if _pool is roto:
+            _pool = _nuevo_pool()
+    roto.shutdown(wait=False, cancel_futures=True)
+
+
+def _iniciar():
+    # El bucle, la cola y el pool se crean con el primer trabajo
+    global _bucle, _pool
+    with _candado:
+        if _bucle is not None:
+            return
+        _pool = _nuevo_pool()
+        _bucle = asyncio.new_event_loop()
+        threading.Thread(target=_bucle.run_forever, name='trabajos', daemon=True).start()
+        asyncio.run_coroutine_threadsafe(_arrancar(), _bucle).result()
+
+
+async def _arrancar():
+    global _cola
+    _cola = asyncio.Queue(maxsize=COLA_MAXIMA)
+    for _ in range(TRABAJOS_SIMULTANEOS):
+        asyncio.create_task(_consumir())
+    asyncio.create_task(_purgar_periodicamente())
+
+
+async def _encolar(trabajo):
+    try:
+        _cola.put_nowait(trabajo)
+    except asyncio.QueueFull:
+        raise ColaLlena() from None
+
+
+async def _consumir():
+    while True:
+        trabajo = await _cola.get()
+        if trabajo.estado == 'cancelado':
+            continue
+        trabajo.tarea_asyncio = asyncio.create_task(_ejecutar(trabajo))
+        try:
+            await trabajo.tarea_asyncio
+        except asyncio.CancelledError:
+            pass
+
+
+async def _ejecutar(trabajo):
+    bucle = asyncio.get_running_loop()
+    trabajo.estado = 'ejecutando'
+    trabajo.iniciado = time.time()
+    pool = _pool
+    futuros = []
+    try:
+        futuros = [bucle.run_in_executor(pool, tarea) for tarea in trabajo.tareas]
+        pendientes = set(futuros)
+        while pendientes:
+            hechos, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+            trabajo.hechas += len(hechos)
+        trabajo.resultado = trabajo.combinar([futuro.result() for futuro in futuros])
+        trabajo.estado = 'terminado'
+    except asyncio.CancelledError:
+        trabajo.estado = 'cancelado'
+        raise
+    except BrokenProcessPool:
+        trabajo.estado = 'error'
+        trabajo.error = "Un proceso de cálculo terminó inesperadamente (¿memoria insuficiente?)"
+        _reemplazar_pool(pool)
+    except Exception as error:
+        trabajo.estado = 'error'
+        trabajo.error = str(error)
+    finally:
+        # Los bloques que no empezaron se descartan
+        for futuro in futuros:
+            futuro.cancel()
+        trabajo.terminado = time.time()
+
+
+def _purgar():
+    limite = time.time() - RETENCION_SEGUNDOS
+    with _candado:
+        for clave in [c for c, t in _trabajos.items() if t.terminado and t.terminado < limite]:
+            del _trabajos[clave]
+
+
+async def _purgar_periodicamente():
+    while True:
+        await asyncio.sleep(min(RETENCION_SEGUNDOS, 60))
+        _purgar()
+
+
+# ==========================================
+# 3. OPERACIONES
+# ==========================================
+def enviar(tipo, cuerpo):
+    # Valida en el hilo de la petición y encola; ErrorPeticion o ColaLlena
+    tareas, combinar = TIPOS[tipo](cuerpo)
+    trabajo = Trabajo(tipo, tareas, combinar)
+    _iniciar()
+    _purgar()
+    with _candado:
+        _trabajos[trabajo.id] = trabajo
+    try:
+        asyncio.run_coroutine_threadsafe(_encolar(trabajo), _bucle).result()
+    except ColaLlena:
+        with _candado:
+            del _trabajos[trabajo.id]
+        raise
+    return trabajo
+
+
+def consultar(identificador):
+    _purgar()
+    return _trabajos.get(identificador)
+
+
+def cancelar(trabajo):
+    if trabajo.estado == 'en_cola':
+        trabajo.estado = 'cancelado'
+        trabajo.terminado = time.time()
+    elif trabajo.estado == 'ejecutando' and trabajo.tarea_asyncio is not None:
+        _bucle.call_soon_threadsafe(trabajo.tarea_asyncio.cancel)
+
+
+REGISTRO.agregar(Medidor('trabajos_en_cola', 'Trabajos largos esperando en la cola.',
+                         lambda: _cola.qsize() if _cola is not None else 0))
+
+
+# ==========================================
+# 4. RUTAS
+# ==========================================
+def _vista_enviar(tipo):
+    if tipo not in TIPOS:
+        return jsonify(error=f"Tipo desconocido: {tipo} (use {', '.join(TIPOS)})"), 404
+    cuerpo = request.get_json(silent=True)
+    if not isinstance(cuerpo, dict):
+        return jsonify(error="El cuerpo debe ser un objeto JSON"), 400
+    try:
+        trabajo = enviar(tipo, cuerpo)
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    except ColaLlena:
+        respuesta = jsonify(error=f"La cola está llena ({COLA_MAXIMA} trabajos en espera)")
+        respuesta.headers['Retry-After'] = '30'
+        return respuesta, 429
+    return jsonify(trabajo.resumen()), 202
+
+
+def _vista_trabajo(identificador):
+    trabajo = consultar(identificador)
+    if trabajo is None:
+        return jsonify(error="Trabajo desconocido o expirado"), 404
+    if request.method == 'DELETE':
+        cancelar(trabajo)
+    return jsonify(trabajo.resumen())
+
+
+def _vista_resultado(identificador):
+    trabajo = consultar(identificador)
+    if trabajo is None:
+        return jsonify(error="Trabajo desconocido o expirado"), 404
+    if trabajo.estado != 'terminado':
+        return jsonify(trabajo.resumen()), 409
+    formato = request.args.get('formato', 'json')
+    if formato not in FORMATOS:
+        return jsonify(error=f"Formato no disponible: {formato} (use {', '.join(FORMATOS)})"), 400
+    _, comunes, resultados = trabajo.resultado
+    if formato == 'json' and sum(np.size(v) for v in (*comunes.values(), *resultados.values())) > VALORES_MAXIMOS:
+        binarios = ' o '.join(f for f in FORMATOS if f != 'json')
+        return jsonify(error=f"El resultado supera {VALORES_MAXIMOS} valores para JSON; pida formato {binarios}"), 400
+    return RESPUESTAS[formato](*trabajo.resultado)
+
+
+def instalar(app):
+    app.server.add_url_rule('/trabajos/<tipo>', 'trabajos_enviar', _vista_enviar, methods=['POST'])
+    app.server.add_url_rule('/trabajos/<identificador>', 'trabajos_estado', _vista_trabajo, methods=['GET', 'DELETE'])
+    app.server.add_url_rule('/trabajos/<identificador>/resultado', 'trabajos_resultado', _vista_resultado)
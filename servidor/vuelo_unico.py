@@ -0,0 +1,70 @@
+# ==========================================
+# VUELO ÚNICO: SOLICITUDES IDÉNTICAS EN CURSO
+# ==========================================
+# Cuando muchos usuarios piden a la vez la misma simulación (p. ej. toda
+# una clase pulsando "Generar Simulación" con los valores por defecto),
+# solo el primero la calcula; los demás que llegan mientras está en curso
+# esperan ese mismo cálculo y reciben su resultado (o su excepción). No es
+# una cache: al terminar, la clave se libera y la siguiente solicitud
+# vuelve a calcular.
+#
+# El resultado se comparte entre las solicitudes que esperaron, así que
+# quien lo reciba no debe modificarlo en el lugar.
+import threading
+from functools import wraps
+
+import numpy as np
+
+from servidor.metricas import contar_cache
+
+
+class _Vuelo:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+def _clave(valor):
+    # Versión inmutable (hashable) de los argumentos
+    if isinstance(valor, np.ndarray):
+        return ('ndarray', valor.shape, valor.dtype.str, valor.tobytes())
+    if isinstance(valor, (list, tuple)):
+        return tuple(_clave(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _clave(v)) for k, v in valor.items()))
+    return valor
+
+
+def vuelo_unico(funcion):
+    en_vuelo = {}
+    candado = threading.Lock()
+
+    @wraps(funcion)
+    def coalescer(*args, **kwargs):
+        clave = (_clave(args), _clave(kwargs))
+        with candado:
+            vuelo = en_vuelo.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = en_vuelo[clave] = _Vuelo()
+        contar_cache(f'vuelo_unico:{funcion.__name__}', not lider)
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            vuelo.resultado = funcion(*args, **kwargs)
+            return vuelo.resultado
+        except BaseException as error:
+            vuelo.error = error
+            raise
+        finally:
+            with candado:
+                del en_vuelo[clave]
+            vuelo.listo.set()
+
+    return coalescer
@@ -0,0 +1,78 @@
+# ==========================================
+# PRUEBAS DE LA COMPILACIÓN DE ACTIVOS
+# ==========================================
+#   python -m pytest tests/
+import json
+import os
+
+import pytest
+
+from servidor import activos
+
+
+# ==========================================
+# 1. DIVISIÓN O EXPRESIÓN REGULAR
+# ==========================================
+@pytest.mark.parametrize('codigo, esperado', [
+    ('const h = margin / 2;\n', 'const h=margin / 2;\n'),
+    ('const x = a in b / 2 / 3;\n', 'const x=a in b / 2 / 3;\n'),
+    ('let y = caseof / 4 / z;\n', 'let y=caseof / 4 / z;\n'),
+    ('const w = obj.return / 2 / 3;\n', 'const w=obj.return / 2 / 3;\n'),
+    ('const v = $do / 2 / 3;\n', 'const v=$do / 2 / 3;\n'),
+])
+def test_division_tras_identificador_que_termina_en_palabra_clave(codigo, esperado):
+    assert activos.minificar_js(codigo) == esperado
+
+
+@pytest.mark.parametrize('codigo, regex', [
+    ('return /a b/.test(x);\n', '/a b/'),
+    ('if (k in /x y/) f();\n', '/x y/'),
+    ('const r = typeof /p q/;\n', '/p q/'),
+    ('x = y ? /m n/ : z;\n', '/m n/'),
+])
+def test_regex_tras_palabra_clave(codigo, regex):
+    assert regex in activos.minificar_js(codigo)
+
+
+def test_cadenas_y_comentarios():
+    codigo = "// comentario\nconst s = 'a // b';  /* otro */ const t = `x  y`;\n"
+    assert activos.minificar_js(codigo) == "const s='a // b';const t=`x  y`;\n"
+
+
+def test_css():
+    assert activos.minificar_css('.a  :hover { color: red ; }\n/* x */\n') == '.a :hover{color:red}\n'
+
+
+# ==========================================
+# 2. MANIFIESTO Y CARPETA SERVIDA
+# ==========================================
+def _escribir(ruta, texto):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(texto)
+
+
+def _manifiesto(destino):
+    with open(os.path.join(destino, activos.MANIFIESTO), encoding='utf-8') as archivo:
+        return json.load(archivo)['archivos']
+
+
+def test_sin_compilar_sirve_el_origen(tmp_path):
+    origen, destino = str(tmp_path / 'assets'), str(tmp_path / 'compilados')
+    _escribir(os.path.join(origen, 'js', 'a.js'), 'var a = 1;\n')
+    assert activos.carpeta(destino, origen) == origen
+
+
+def test_recompila_si_el_origen_cambio(tmp_path):
+    origen, destino = str(tmp_path / 'assets'), str(tmp_path / 'compilados')
+    _escribir(os.path.join(origen, 'js', 'a.js'), 'var a = 1;\n')
+    activos.compilar(origen, destino)
+    viejo = _manifiesto(destino)['js/a.js']
+    assert activos.carpeta(destino, origen) == destino
+
+    _escribir(os.path.join(origen, 'js', 'a.js'), 'var a = 2;\n')
+    assert activos.carpeta(destino, origen) == destino
+    nuevo = _manifiesto(destino)['js/a.js']
+    assert nuevo != viejo
+    assert os.path.exists(os.path.join(destino, nuevo))
+    assert not os.path.exists(os.path.join(destino, viejo))
@@ -0,0 +1,38 @@
+# ==========================================
+# PRUEBAS DEL MODO EN VIVO
+# ==========================================
+import pytest
+from dash.exceptions import PreventUpdate
+
+from servidor import en_vivo
+
+
+def _datos(cliente, secuencia, valores=()):
+    return {'cliente': cliente, 'secuencia': secuencia, 'valores': list(valores)}
+
+
+def _atender(datos, nombre):
+    with en_vivo.turno(datos, nombre) as valores:
+        return valores
+
+
+def test_descarta_la_solicitud_superada():
+    _atender(_datos('pestana-1', 5, [1]), 'simular_sir_en_vivo')
+    with pytest.raises(PreventUpdate):
+        _atender(_datos('pestana-1', 4, [2]), 'simular_sir_en_vivo')
+    assert _atender(_datos('pestana-1', 6, [3]), 'simular_sir_en_vivo') == [3]
+
+
+def test_secuencias_independientes_por_callback():
+    # Cada store del navegador numera sus envíos desde 1: los deslizadores de
+    # otra página de la misma pestaña no quedan detrás de los del SIR
+    for secuencia in range(1, 51):
+        _atender(_datos('pestana-2', secuencia), 'simular_sir_en_vivo')
+    assert _atender(_datos('pestana-2', 1, [0.3]), 'simular_rumor_en_vivo') == [0.3]
+    with pytest.raises(PreventUpdate):
+        _atender(_datos('pestana-2', 49), 'simular_sir_en_vivo')
+
+
+def test_sin_datos():
+    with pytest.raises(PreventUpdate):
+        _atender(None, 'simular_sir_en_vivo')
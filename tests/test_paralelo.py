@@ -0,0 +1,36 @@
+# ==========================================
+# PRUEBAS DEL POOL DE PROCESOS COMPARTIDO
+# ==========================================
+#   python -m pytest tests/
+import threading
+import time
+
+from modelos import paralelo
+
+
+def _lento(x):
+    time.sleep(0.3)
+    return x * x
+
+
+# ==========================================
+# 1. CRECIMIENTO CON LLAMADAS EN CURSO
+# ==========================================
+def test_crecer_no_interrumpe_llamadas_en_curso():
+    resultados = {}
+
+    def pequeno():
+        resultados['pequeno'] = paralelo.mapear(_lento, [(x,) for x in range(4)], trabajadores=2)
+
+    hilo = threading.Thread(target=pequeno)
+    hilo.start()
+    time.sleep(0.1)
+    # Pide más trabajadores mientras el pool de 2 sigue ocupado
+    grande = paralelo.mapear(_lento, [(x,) for x in range(6)], trabajadores=3)
+    hilo.join()
+
+    assert resultados['pequeno'] == [0, 1, 4, 9]
+    assert grande == [x * x for x in range(6)]
+    # El pool reemplazado se cerró al terminar; solo queda el vigente
+    assert paralelo._en_uso == {}
+    assert paralelo._trabajadores_pool == 3
@@ -0,0 +1,36 @@
+# ==========================================
+# PRUEBAS DE LA TABLA SUSTITUTA DEL SIR
+# ==========================================
+#   python -m pytest tests/
+import time
+
+from modelos import sustituto
+
+
+# ==========================================
+# 1. CONSTRUCCIÓN AUTOMÁTICA
+# ==========================================
+def test_construye_la_tabla_si_falta(tmp_path, monkeypatch):
+    # Tabla pequeña para que la prueba tarde poco
+    construir, validar = sustituto.construir, sustituto.validar
+    monkeypatch.setattr(sustituto, 'construir', lambda: construir(8, 4, 32))
+    monkeypatch.setattr(sustituto, 'validar', lambda tabla: validar(tabla, muestras=5))
+    ruta = str(tmp_path / 'sustituto.npz')
+
+    assert sustituto.cargar(ruta, automatico=True) is None
+    limite = time.monotonic() + 60
+    while sustituto.cargar(ruta, automatico=True) is None and time.monotonic() < limite:
+        time.sleep(0.05)
+
+    tabla = sustituto.cargar(ruta, automatico=True)
+    assert tabla is not None and tabla['curvas'].shape == (8, 4, 32, 2)
+    assert sustituto.error_tabla(tabla) >= 0
+    assert list(tmp_path.iterdir()) == [tmp_path / 'sustituto.npz']
+
+
+def test_sin_construccion_automatica(tmp_path):
+    ruta = str(tmp_path / 'sustituto.npz')
+    assert sustituto.cargar(ruta, automatico=False) is None
+    time.sleep(0.1)
+    assert not (tmp_path / 'sustituto.npz').exists()
+